@@ -10,7 +10,8 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # pandas yalnızca eğitim betikleri ve eski DataFrame API'si için; widget NumPy yolunu kullanır
+    excludes=['pandas'],
     noarchive=False,
     optimize=0,
 )
@@ -10,7 +10,11 @@ from PySide6.QtGui import QAction, QIcon
 from PySide6.QtWidgets import QApplication, QMenu, QSystemTrayIcon
 from qasync import QEventLoop
 
+from backend import metrics
+from backend.daemon_client import connect_daemon
+from backend.weather_service import close_service
 from frontend.views.main_widget import MainWidget
+from frontend.views.weather_predictor import shutdown_inference_executors
 
 
 # -----------------------
@@ -49,12 +53,17 @@ def make_style(theme_key: str) -> str:
 
 
 async def main_async(app: QApplication):
-    ui = MainWidget()
+    # WEATHER_DAEMON ile istenmişse ve servis (src/daemon.py) belirteci
+    # kanıtlıyorsa ince istemci olarak bağlan; yoksa çekme/önbellek/model bu süreçte
+    client = await connect_daemon()
+    if client is not None:
+        print(f"[app] tahmin servisi kullanılıyor: {client.address}")
+    ui = MainWidget(client=client)
     ui.show()
 
-    # ilk veri çekimi ve periyodik döngü
+    # ilk veri çekimi ve uyarlanır yenileme döngüsü
     await ui.update_weather_once()
-    asyncio.create_task(ui.start_weather_loop(interval_minutes=5))
+    asyncio.create_task(ui.start_weather_loop())
     return ui
 
 
@@ -135,3 +144,11 @@ if __name__ == "__main__":
         ui = loop.run_until_complete(main_async(app))
         tray = build_tray(app, ui)
         loop.run_forever()
+        # paylaşılan HTTP bağlantı havuzunu temiz kapat
+        loop.run_until_complete(close_service())
+        loop.run_until_complete(ui.aclose())
+        # bekleyen tahmin işlerini bırak (çıkışı bloklamasın)
+        shutdown_inference_executors(wait=False)
+        # WEATHER_METRICS=1 ve WEATHER_METRICS_FILE verilmişse ölçümleri yaz
+        if metrics.enabled():
+            metrics.dump()
@@ -1,419 +1,125 @@
+"""
+Karabük saatlik verisiyle model eğitimi, değerlendirme ve örnek tahminler.
+
+Eski Colab defterinin başsız (headless) sürümü: eğitim mantığı
+backend/training.py içinde; grafikler yalnızca --plot ile ve matplotlib
+kuruluysa çizilir.
+
+Kullanım:
+    python src/backend/PredictionModel.py karabuk_hourly_2020_2025.csv [--plot] [--interactive]
+"""
+
+import argparse
+import sys
 import warnings
 from datetime import datetime, timedelta
+from pathlib import Path
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import seaborn as sns
-from google.colab import files
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from sklearn.model_selection import train_test_split
-from sklearn.multioutput import MultiOutputRegressor
-
-warnings.filterwarnings("ignore")
-
-
-plt.style.use("seaborn-v0_8-darkgrid")
-sns.set_palette("husl")
-
-print("✅ Kütüphaneler başarıyla yüklendi!")
-
-
-print("📁 Lütfen CSV dosyanızı seçin...")
-uploaded = files.upload()
-
-# Yüklenen dosyanın adını al
-filename = list(uploaded.keys())[0]
-print(f"✅ '{"karabuk_hourly_2020_2025.csv"}' dosyası başarıyla yüklendi!")
 
+# src/ kökünü ekle: script doğrudan çalıştırıldığında paket importları için
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-df = pd.read_csv("karabuk_hourly_2020_2025.csv")
-
-
-print("📊 Verinin ilk 5 satırı:")
-print(df.head())
-print("\n📈 Veri boyutu:", df.shape)
-print("\n📋 Sütun bilgileri:")
-print(df.info())
-print("\n📊 İstatistiksel özet:")
-print(df.describe())
-
-
-df.rename(columns={"date": "datetime"}, inplace=True)
-df["datetime"] = pd.to_datetime(df["datetime"])
-df = df.set_index("datetime")
+from backend.climatology import Climatology, ClimatologyAccumulator  # noqa: E402
+from backend.features import FEATURE_COLUMNS, TARGET_COLUMNS, date_features  # noqa: E402
+from backend.training import (  # noqa: E402
+    evaluate,
+    fit_model,
+    load_training_frame,
+    save_model,
+)
 
+warnings.filterwarnings("ignore")
 
-df["year"] = df.index.year
-df["month"] = df.index.month
-df["day"] = df.index.day
-df["hour"] = df.index.hour
-df["day_of_week"] = df.index.dayofweek  # 0=Pazartesi, 6=Pazar
-df["day_of_year"] = df.index.dayofyear
-df["quarter"] = df.index.quarter
-df["is_weekend"] = (df.index.dayofweek >= 5).astype(int)
 
+def print_metrics(metrics):
+    print("📊 Model Performansı:")
+    labels = {"temperature_2m": ("🌡️ Sıcaklık", "°C"), "precipitation": ("💧 Yağış", "mm")}
+    for target, m in metrics.items():
+        title, _unit = labels.get(target, (target, ""))
+        print(f"\n{title} Tahmin Metrikleri:")
+        print(f"   MSE: {m['mse']:.4f}")
+        print(f"   RMSE: {m['rmse']:.4f}")
+        print(f"   MAE: {m['mae']:.4f}")
+        print(f"   R² Skoru: {m['r2']:.4f}")
 
-# Eğer datetime sütunu yoksa index’ten alıp sütun yap
-df = df.reset_index()  # index’i sütun yapar, adı 'date' olacak
-df.rename(columns={"date": "datetime"}, inplace=True)
 
-# Şimdi tarih özelliklerini çıkarabilirsin
-df["year"] = df["datetime"].dt.year
-df["month"] = df["datetime"].dt.month
-df["day"] = df["datetime"].dt.day
-df["hour"] = df["datetime"].dt.hour
-df["day_of_week"] = df["datetime"].dt.dayofweek
-df["day_of_year"] = df["datetime"].dt.dayofyear
-df["quarter"] = df["datetime"].dt.quarter
-df["is_weekend"] = (df["day_of_week"] >= 5).astype(int)
+def plot_diagnostics(y_test, y_pred, metrics):
+    """Gerçek vs tahmin ve hata dağılımı grafikleri (matplotlib gerekir)."""
+    try:
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("⚠️ matplotlib kurulu değil, grafikler atlandı.")
+        return
 
-# Mevsim ve trigonometrik özellikler
-df["season"] = df["month"].apply(get_season)
-df["month_sin"] = np.sin(2 * np.pi * df["month"] / 12)
-df["month_cos"] = np.cos(2 * np.pi * df["month"] / 12)
-df["hour_sin"] = np.sin(2 * np.pi * df["hour"] / 24)
-df["hour_cos"] = np.cos(2 * np.pi * df["hour"] / 24)
+    temp_rmse = metrics["temperature_2m"]["rmse"]
+    precip_rmse = metrics["precipitation"]["rmse"]
 
-# Artık 'datetime' sütunu var
-print(
-    df[
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    for col, (target, color, unit, r) in enumerate(
         [
-            "datetime",
-            "year",
-            "month",
-            "day",
-            "hour",
-            "day_of_week",
-            "day_of_year",
-            "season",
-            "is_weekend",
+            ("temperature_2m", "blue", "°C", temp_rmse),
+            ("precipitation", "green", "mm", precip_rmse),
         ]
-    ].head()
-)
-
-
-print("🔍 Eksik veri kontrolü:")
-print(df.isnull().sum())
-
-
-if df.isnull().sum().sum() > 0:
-    print("\n⚠️ Eksik veriler bulundu. Temizleniyor...")
-    # Sayısal değerler için interpolasyon kullan
-    df["temperature_2m"] = df["temperature_2m"].interpolate(method="linear")
-    df["precipitation"] = df["precipitation"].interpolate(method="linear")
-    # Kalan eksikleri sil
-    df = df.dropna()
-    print("✅ Eksik veriler temizlendi!")
-else:
-    print("✅ Eksik veri yok!")
-
-print(f"\n📊 Temizlenmiş veri boyutu: {df.shape}")
-
-
-feature_columns = [
-    "month",
-    "day",
-    "hour",
-    "day_of_week",
-    "day_of_year",
-    "quarter",
-    "is_weekend",
-    "season",
-    "month_sin",
-    "month_cos",
-    "hour_sin",
-    "hour_cos",
-]
-
-
-target_columns = ["temperature_2m", "precipitation"]
-
-
-X = df[feature_columns]
-y = df[target_columns]
-
-print("📊 Özellik matrisi (X) boyutu:", X.shape)
-print("🎯 Hedef matrisi (y) boyutu:", y.shape)
-print("\n📋 Özellikler:", feature_columns)
-print("🎯 Hedefler:", target_columns)
-
-
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, shuffle=True
-)
-
-print("📊 Eğitim seti boyutu:")
-print(f"   X_train: {X_train.shape}")
-print(f"   y_train: {y_train.shape}")
-print("\n📊 Test seti boyutu:")
-print(f"   X_test: {X_test.shape}")
-print(f"   y_test: {y_test.shape}")
-
-
-print("🤖 Model oluşturuluyor ve eğitiliyor...")
-
-# RandomForestRegressor'ı MultiOutputRegressor ile sar
-base_model = RandomForestRegressor(
-    n_estimators=100,
-    max_depth=20,
-    min_samples_split=5,
-    min_samples_leaf=2,
-    random_state=42,
-    n_jobs=-1,  # Tüm CPU çekirdeklerini kullan
-)
-
-# Çoklu çıktı için model
-model = MultiOutputRegressor(base_model)
-
-# Modeli eğit
-model.fit(X_train, y_train)
-
-print("✅ Model başarıyla eğitildi!")
-
-
-feature_importance_temp = model.estimators_[0].feature_importances_
-feature_importance_precip = model.estimators_[1].feature_importances_
-
-print("\n📊 Özellik Önemlilikleri (Sıcaklık için):")
-for feat, imp in sorted(
-    zip(feature_columns, feature_importance_temp), key=lambda x: x[1], reverse=True
-):
-    print(f"   {feat}: {imp:.4f}")
-
-
-y_pred = model.predict(X_test)
-
-# Her hedef için ayrı metrikler hesapla
-mse_temp = mean_squared_error(y_test["temperature_2m"], y_pred[:, 0])
-mse_precip = mean_squared_error(y_test["precipitation"], y_pred[:, 1])
-mae_temp = mean_absolute_error(y_test["temperature_2m"], y_pred[:, 0])
-mae_precip = mean_absolute_error(y_test["precipitation"], y_pred[:, 1])
-r2_temp = r2_score(y_test["temperature_2m"], y_pred[:, 0])
-r2_precip = r2_score(y_test["precipitation"], y_pred[:, 1])
-
-print("📊 Model Performansı:")
-print("\n🌡️ Sıcaklık Tahmin Metrikleri:")
-print(f"   MSE: {mse_temp:.4f}")
-print(f"   RMSE: {np.sqrt(mse_temp):.4f}")
-print(f"   MAE: {mae_temp:.4f}")
-print(f"   R² Skoru: {r2_temp:.4f}")
-
-print("\n💧 Yağış Tahmin Metrikleri:")
-print(f"   MSE: {mse_precip:.4f}")
-print(f"   RMSE: {np.sqrt(mse_precip):.4f}")
-print(f"   MAE: {mae_precip:.4f}")
-print(f"   R² Skoru: {r2_precip:.4f}")
-
-
-fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-
-# 1. Sıcaklık: Gerçek vs Tahmin (Scatter)
-axes[0, 0].scatter(y_test["temperature_2m"], y_pred[:, 0], alpha=0.5, s=10, c="blue")
-axes[0, 0].plot(
-    [y_test["temperature_2m"].min(), y_test["temperature_2m"].max()],
-    [y_test["temperature_2m"].min(), y_test["temperature_2m"].max()],
-    "r--",
-    lw=2,
-)
-axes[0, 0].set_xlabel("Gerçek Sıcaklık (°C)", fontsize=12)
-axes[0, 0].set_ylabel("Tahmin Edilen Sıcaklık (°C)", fontsize=12)
-axes[0, 0].set_title("Sıcaklık: Gerçek vs Tahmin", fontsize=14, fontweight="bold")
-axes[0, 0].grid(True, alpha=0.3)
-axes[0, 0].text(
-    0.05,
-    0.95,
-    f"R² = {r2_temp:.3f}\nRMSE = {np.sqrt(mse_temp):.2f}°C",
-    transform=axes[0, 0].transAxes,
-    fontsize=11,
-    verticalalignment="top",
-    bbox=dict(boxstyle="round", facecolor="wheat", alpha=0.5),
-)
-
-# 2. Yağış: Gerçek vs Tahmin (Scatter)
-axes[0, 1].scatter(y_test["precipitation"], y_pred[:, 1], alpha=0.5, s=10, c="green")
-axes[0, 1].plot(
-    [y_test["precipitation"].min(), y_test["precipitation"].max()],
-    [y_test["precipitation"].min(), y_test["precipitation"].max()],
-    "r--",
-    lw=2,
-)
-axes[0, 1].set_xlabel("Gerçek Yağış (mm)", fontsize=12)
-axes[0, 1].set_ylabel("Tahmin Edilen Yağış (mm)", fontsize=12)
-axes[0, 1].set_title("Yağış: Gerçek vs Tahmin", fontsize=14, fontweight="bold")
-axes[0, 1].grid(True, alpha=0.3)
-axes[0, 1].text(
-    0.05,
-    0.95,
-    f"R² = {r2_precip:.3f}\nRMSE = {np.sqrt(mse_precip):.2f}mm",
-    transform=axes[0, 1].transAxes,
-    fontsize=11,
-    verticalalignment="top",
-    bbox=dict(boxstyle="round", facecolor="lightblue", alpha=0.5),
-)
-
-# 3. Sıcaklık: Zaman serisi karşılaştırması (ilk 200 örnek)
-sample_size = min(200, len(y_test))
-indices = range(sample_size)
-axes[1, 0].plot(
-    indices,
-    y_test["temperature_2m"].iloc[:sample_size].values,
-    label="Gerçek",
-    alpha=0.7,
-    linewidth=1.5,
-)
-axes[1, 0].plot(
-    indices, y_pred[:sample_size, 0], label="Tahmin", alpha=0.7, linewidth=1.5
-)
-axes[1, 0].set_xlabel("Örnek İndeksi", fontsize=12)
-axes[1, 0].set_ylabel("Sıcaklık (°C)", fontsize=12)
-axes[1, 0].set_title(
-    "Sıcaklık Zaman Serisi Karşılaştırması", fontsize=14, fontweight="bold"
-)
-axes[1, 0].legend()
-axes[1, 0].grid(True, alpha=0.3)
-
-# 4. Yağış: Zaman serisi karşılaştırması (ilk 200 örnek)
-axes[1, 1].plot(
-    indices,
-    y_test["precipitation"].iloc[:sample_size].values,
-    label="Gerçek",
-    alpha=0.7,
-    linewidth=1.5,
-)
-axes[1, 1].plot(
-    indices, y_pred[:sample_size, 1], label="Tahmin", alpha=0.7, linewidth=1.5
-)
-axes[1, 1].set_xlabel("Örnek İndeksi", fontsize=12)
-axes[1, 1].set_ylabel("Yağış (mm)", fontsize=12)
-axes[1, 1].set_title(
-    "Yağış Zaman Serisi Karşılaştırması", fontsize=14, fontweight="bold"
-)
-axes[1, 1].legend()
-axes[1, 1].grid(True, alpha=0.3)
-
-plt.suptitle(
-    "Hava Durumu Tahmin Modeli Performansı", fontsize=16, fontweight="bold", y=1.02
-)
-plt.tight_layout()
-plt.show()
-
-# ============================================
-# Hücre 12: Hata dağılımı analizi
-# ============================================
-# Hata hesaplama
-temp_errors = y_test["temperature_2m"].values - y_pred[:, 0]
-precip_errors = y_test["precipitation"].values - y_pred[:, 1]
-
-# Grafik
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-# Sıcaklık hata dağılımı
-axes[0].hist(temp_errors, bins=50, edgecolor="black", alpha=0.7, color="coral")
-axes[0].axvline(x=0, color="red", linestyle="--", linewidth=2)
-axes[0].set_xlabel("Hata (°C)", fontsize=12)
-axes[0].set_ylabel("Frekans", fontsize=12)
-axes[0].set_title("Sıcaklık Tahmin Hatası Dağılımı", fontsize=14, fontweight="bold")
-axes[0].grid(True, alpha=0.3)
-axes[0].text(
-    0.05,
-    0.95,
-    f"Ortalama Hata: {np.mean(temp_errors):.3f}°C\n"
-    f"Std Sapma: {np.std(temp_errors):.3f}°C",
-    transform=axes[0].transAxes,
-    fontsize=11,
-    verticalalignment="top",
-    bbox=dict(boxstyle="round", facecolor="white", alpha=0.8),
-)
-
-# Yağış hata dağılımı
-axes[1].hist(precip_errors, bins=50, edgecolor="black", alpha=0.7, color="skyblue")
-axes[1].axvline(x=0, color="red", linestyle="--", linewidth=2)
-axes[1].set_xlabel("Hata (mm)", fontsize=12)
-axes[1].set_ylabel("Frekans", fontsize=12)
-axes[1].set_title("Yağış Tahmin Hatası Dağılımı", fontsize=14, fontweight="bold")
-axes[1].grid(True, alpha=0.3)
-axes[1].text(
-    0.05,
-    0.95,
-    f"Ortalama Hata: {np.mean(precip_errors):.3f}mm\n"
-    f"Std Sapma: {np.std(precip_errors):.3f}mm",
-    transform=axes[1].transAxes,
-    fontsize=11,
-    verticalalignment="top",
-    bbox=dict(boxstyle="round", facecolor="white", alpha=0.8),
-)
-
-plt.tight_layout()
-plt.show()
-
-
-def predict_weather(target_date, target_hour, model, df):
+    ):
+        truth = y_test[target].to_numpy()
+        ax = axes[0, col]
+        ax.scatter(truth, y_pred[:, col], alpha=0.5, s=10, c=color)
+        ax.plot([truth.min(), truth.max()], [truth.min(), truth.max()], "r--", lw=2)
+        ax.set_xlabel(f"Gerçek ({unit})")
+        ax.set_ylabel(f"Tahmin ({unit})")
+        ax.set_title(
+            f"{target}: R² = {metrics[target]['r2']:.3f}, RMSE = {r:.2f}{unit}",
+            fontweight="bold",
+        )
+        ax.grid(True, alpha=0.3)
+
+        # hata dağılımı
+        errors = truth - y_pred[:, col]
+        ax = axes[1, col]
+        ax.hist(errors, bins=50, edgecolor="black", alpha=0.7)
+        ax.axvline(x=0, color="red", linestyle="--", linewidth=2)
+        ax.set_xlabel(f"Hata ({unit})")
+        ax.set_ylabel("Frekans")
+        ax.set_title(
+            f"Ortalama Hata: {np.mean(errors):.3f} · Std: {np.std(errors):.3f}",
+            fontweight="bold",
+        )
+        ax.grid(True, alpha=0.3)
+
+    plt.suptitle("Hava Durumu Tahmin Modeli Performansı", fontsize=16, fontweight="bold")
+    plt.tight_layout()
+    plt.show()
+
+
+def predict_weather(target_date, target_hour, model, clim: Climatology):
     """
     Belirtilen tarih ve saat için hava durumu tahmini yapar.
-    Geçmiş yılların aynı tarih ve saatlerindeki verilerden yararlanır.
+    Geçmiş yılların aynı tarih ve saatlerindeki istatistikleri önceden
+    hesaplanmış iklim tablosundan okur (tablo taraması yok).
 
     Parametreler:
     - target_date: 'YYYY-MM-DD' formatında tarih string'i
     - target_hour: Saat (0-23 arası)
     - model: Eğitilmiş model
-    - df: Orijinal DataFrame
+    - clim: İklim tablosu (backend/climatology.py)
 
     Döndürür:
     - Tahmin edilen sıcaklık ve yağış değerleri
     """
 
     # Tarih parse et
-    target_dt = pd.to_datetime(target_date)
+    target_dt = pd.to_datetime(target_date).replace(hour=target_hour)
 
     # Özellikler oluştur
-    features = {
-        "month": target_dt.month,
-        "day": target_dt.day,
-        "hour": target_hour,
-        "day_of_week": target_dt.dayofweek,
-        "day_of_year": target_dt.dayofyear,
-        "quarter": target_dt.quarter,
-        "is_weekend": 1 if target_dt.dayofweek >= 5 else 0,
-        "season": get_season(target_dt.month),
-        "month_sin": np.sin(2 * np.pi * target_dt.month / 12),
-        "month_cos": np.cos(2 * np.pi * target_dt.month / 12),
-        "hour_sin": np.sin(2 * np.pi * target_hour / 24),
-        "hour_cos": np.cos(2 * np.pi * target_hour / 24),
-    }
-
-    # DataFrame'e çevir
-    X_pred = pd.DataFrame([features], columns=feature_columns)
+    X_pred = pd.DataFrame(date_features([target_dt]), columns=FEATURE_COLUMNS)
 
     # Tahmin yap
     prediction = model.predict(X_pred)
 
-    # Geçmiş verileri analiz et (aynı ay-gün-saat kombinasyonu)
-    historical = df[
-        (df["month"] == target_dt.month)
-        & (df["day"] == target_dt.day)
-        & (df["hour"] == target_hour)
-    ]
-
-    if len(historical) > 0:
-        hist_temp_mean = historical["temperature_2m"].mean()
-        hist_temp_std = historical["temperature_2m"].std()
-        hist_precip_mean = historical["precipitation"].mean()
-        hist_precip_std = historical["precipitation"].std()
-    else:
-        # Eğer tam eşleşme yoksa, aynı ay ve saati kullan
-        historical = df[(df["month"] == target_dt.month) & (df["hour"] == target_hour)]
-        if len(historical) > 0:
-            hist_temp_mean = historical["temperature_2m"].mean()
-            hist_temp_std = historical["temperature_2m"].std()
-            hist_precip_mean = historical["precipitation"].mean()
-            hist_precip_std = historical["precipitation"].std()
-        else:
-            hist_temp_mean = None
-            hist_temp_std = None
-            hist_precip_mean = None
-            hist_precip_std = None
+    # Geçmiş istatistikler (aynı ay-gün-saat; yoksa aynı ay ve saat)
+    historical = clim.lookup(target_dt.month, target_dt.day, target_hour)
 
     # Sonuçları yazdır
     print(f"\n🌤️ HAVA DURUMU TAHMİNİ")
@@ -425,11 +131,18 @@ def predict_weather(target_date, target_hour, model, df):
     print(f"🌡️ Sıcaklık: {prediction[0, 0]:.1f}°C")
     print(f"💧 Yağış: {prediction[0, 1]:.2f} mm")
 
-    if hist_temp_mean is not None:
-        print(f"\n📊 GEÇMİŞ VERİ ANALİZİ (aynı tarih/saat):")
-        print(f"🌡️ Ortalama Sıcaklık: {hist_temp_mean:.1f}°C (±{hist_temp_std:.1f})")
-        print(f"💧 Ortalama Yağış: {hist_precip_mean:.2f} mm (±{hist_precip_std:.2f})")
-        print(f"📈 Geçmiş veri sayısı: {len(historical)} kayıt")
+    if historical is not None:
+        scope = "aynı tarih/saat" if historical["exact"] else "aynı ay/saat"
+        print(f"\n📊 GEÇMİŞ VERİ ANALİZİ ({scope}):")
+        print(
+            f"🌡️ Ortalama Sıcaklık: {historical['temperature_2m_mean']:.1f}°C "
+            f"(±{historical['temperature_2m_std']:.1f})"
+        )
+        print(
+            f"💧 Ortalama Yağış: {historical['precipitation_mean']:.2f} mm "
+            f"(±{historical['precipitation_std']:.2f})"
+        )
+        print(f"📈 Geçmiş veri sayısı: {historical['count']} kayıt")
 
     # Hava durumu yorumu
     print(f"\n💬 YORUM:")
@@ -458,36 +171,7 @@ def predict_weather(target_date, target_hour, model, df):
     return prediction[0, 0], prediction[0, 1]
 
 
-# Test fonksiyonu
-print("✅ Tahmin fonksiyonu hazır!")
-print("\n📌 Kullanım örneği:")
-print("   temp, rain = predict_weather('2025-09-25', 12, model, df)")
-
-
-print("=" * 60)
-print("🔮 ÖRNEK TAHMİNLER")
-print("=" * 60)
-
-# Yarın için tahmin
-tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-predict_weather(tomorrow, 12, model, df)
-
-print("\n" + "=" * 60)
-
-
-three_days = (datetime.now() + timedelta(days=3)).strftime("%Y-%m-%d")
-predict_weather(three_days, 8, model, df)
-
-print("\n" + "=" * 60)
-
-
-one_week = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
-predict_weather(one_week, 18, model, df)
-
-
-# Hücre 15: Kullanıcı girdisi ile tahmin
-# ============================================
-def interactive_prediction():
+def interactive_prediction(model, clim):
     """
     Kullanıcıdan tarih ve saat alarak tahmin yapar.
     """
@@ -507,7 +191,7 @@ def interactive_prediction():
             # Tarih formatını kontrol et
             try:
                 pd.to_datetime(date_input)
-            except:
+            except Exception:
                 print("❌ Hatalı tarih formatı! YYYY-MM-DD şeklinde girin.")
                 continue
 
@@ -520,7 +204,7 @@ def interactive_prediction():
                 continue
 
             # Tahmin yap
-            predict_weather(date_input, hour, model, df)
+            predict_weather(date_input, hour, model, clim)
 
         except ValueError:
             print("❌ Geçersiz giriş! Lütfen sayı girin.")
@@ -528,19 +212,53 @@ def interactive_prediction():
             print(f"❌ Hata oluştu: {str(e)}")
 
 
-z  # Fonksiyonu çalıştır
-interactive_prediction()
-
-
-# Hücre 16: Model kaydetme
-# ============================================
-import joblib
-
-# Modeli kaydet
-model_filename = "weather_prediction_model.pkl"
-joblib.dump(model, model_filename)
-print(f"✅ Model '{model_filename}' olarak kaydedildi!")
-
-# İndirme linki oluştur
-files.download(model_filename)
-print("📥 Model dosyası indirildi!")
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Karabük hava tahmin modeli")
+    ap.add_argument("data", nargs="?", default="karabuk_hourly_2020_2025.csv")
+    ap.add_argument("--out", default="weather_prediction_model.joblib")
+    ap.add_argument("--plot", action="store_true", help="teşhis grafiklerini çiz")
+    ap.add_argument("--interactive", action="store_true")
+    args = ap.parse_args(argv)
+
+    print(f"📁 Veri okunuyor: {args.data}")
+    acc = ClimatologyAccumulator()
+    df = load_training_frame(args.data, climatology=acc)
+    clim = acc.finish()
+    print("📈 Veri boyutu:", df.shape)
+    print("🎯 Hedefler:", TARGET_COLUMNS)
+
+    print("🤖 Model oluşturuluyor ve eğitiliyor...")
+    model, X_test, y_test = fit_model(df)
+    print("✅ Model başarıyla eğitildi!")
+
+    print("\n📊 Özellik Önemlilikleri (Sıcaklık için):")
+    for feat, imp in sorted(
+        zip(FEATURE_COLUMNS, model.estimators_[0].feature_importances_),
+        key=lambda x: x[1],
+        reverse=True,
+    ):
+        print(f"   {feat}: {imp:.4f}")
+
+    metrics, y_pred = evaluate(model, X_test, y_test)
+    print_metrics(metrics)
+    if args.plot:
+        plot_diagnostics(y_test, y_pred, metrics)
+
+    print("=" * 60)
+    print("🔮 ÖRNEK TAHMİNLER")
+    print("=" * 60)
+    for days, hour in [(1, 12), (3, 8), (7, 18)]:
+        target = (datetime.now() + timedelta(days=days)).strftime("%Y-%m-%d")
+        predict_weather(target, hour, model, clim)
+        print("\n" + "=" * 60)
+
+    if args.interactive:
+        interactive_prediction(model, clim)
+
+    # Modeli kaydet
+    save_model(model, args.out, climatology=clim)
+    print(f"✅ Model '{args.out}' olarak kaydedildi!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Çok istasyonlu toplu eğitim: bir klasördeki istasyon başına saatlik
+CSV/Parquet dosyalarından, bir süreç havuzunda istasyon başına bir model.
+
+Her işçi aynı anda tek istasyon eğitir (RandomForest n_jobs=1), her
+görevden sonra yeniden başlatılır (bellek birikmez) ve `--max-rows` ile
+istasyon başına bellek üst sınırı konabilir. Sonuçlar `registry.json`
+dosyasına (istasyon -> model dosyası, metrikler, özellik şeması, konum)
+yazılır; WeatherPredictor.for_location bu kayıttan en yakın istasyonu seçer.
+
+Kullanım:
+    python -m backend.batch_training data/hourly/ --out models/ --workers 4
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from backend.cities import CityDB, iter_cities, load_city_db, slugify
+from backend.features import FEATURE_COLUMNS, TARGET_COLUMNS
+
+REGISTRY_NAME = "registry.json"
+REGISTRY_VERSION = 1
+DATA_SUFFIXES = (".csv", ".parquet")
+
+
+def station_id_from_path(path: Path) -> str:
+    """'karabuk_hourly_2020_2025.csv' -> 'karabuk'."""
+    stem = slugify(path.stem)
+    return re.split(r"_hourly(?:_|$)", stem, maxsplit=1)[0] or stem
+
+
+def _match_city(station_id: str, db: CityDB) -> Optional[Dict[str, Any]]:
+    for country, city, lat, lon in iter_cities(db):
+        if slugify(city) == station_id:
+            return {"country": country, "city": city, "lat": lat, "lon": lon}
+    return None
+
+
+def _train_station(job: Dict[str, Any]) -> Dict[str, Any]:
+    """İşçi süreçte tek istasyon eğitimi; kayıt girdisini döndürür."""
+    from backend.climatology import ClimatologyAccumulator, climatology_path
+    from backend.training import evaluate, fit_model, load_training_frame, save_model
+
+    t0 = time.perf_counter()
+    clim = ClimatologyAccumulator()
+    df = load_training_frame(
+        job["path"],
+        chunksize=job["chunksize"],
+        max_rows=job["max_rows"],
+        climatology=clim,
+    )
+    model, X_test, y_test = fit_model(
+        df, n_jobs=job["n_jobs"], n_estimators=job["n_estimators"]
+    )
+    metrics, _ = evaluate(model, X_test, y_test)
+    out = save_model(
+        model, job["out"], forest=job["forest"], climatology=clim.finish()
+    )
+    return {
+        "station": job["station"],
+        "artifact": out.with_suffix(".forest").name if job["forest"] else out.name,
+        "joblib": out.name,
+        "climatology": climatology_path(out).name,
+        "rows": int(len(df)),
+        "metrics": metrics,
+        "feature_schema": {"features": FEATURE_COLUMNS, "targets": TARGET_COLUMNS},
+        "train_seconds": round(time.perf_counter() - t0, 2),
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def load_registry(out_dir: Path) -> Dict[str, Any]:
+    path = out_dir / REGISTRY_NAME
+    try:
+        reg = json.loads(path.read_text(encoding="utf-8"))
+        if reg.get("version") == REGISTRY_VERSION:
+            return reg
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"[batch_training] {path} okunamadı, yeniden oluşturuluyor: {e}")
+    return {"version": REGISTRY_VERSION, "stations": {}}
+
+
+def write_registry(out_dir: Path, registry: Dict[str, Any]):
+    path = out_dir / REGISTRY_NAME
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(registry, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def train_stations(
+    data_dir: str,
+    out_dir: str,
+    workers: Optional[int] = None,
+    max_rows: Optional[int] = None,
+    chunksize: int = 500_000,
+    n_estimators: int = 100,
+    forest: bool = True,
+    only: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    data_path = Path(data_dir)
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+    db = load_city_db()
+
+    files = sorted(p for p in data_path.iterdir() if p.suffix.lower() in DATA_SUFFIXES)
+    jobs: List[Dict[str, Any]] = []
+    for f in files:
+        station = station_id_from_path(f)
+        if only and station not in only:
+            continue
+        jobs.append(
+            {
+                "station": station,
+                "path": str(f),
+                "out": str(out_path / f"{station}.joblib"),
+                "max_rows": max_rows,
+                "chunksize": chunksize,
+                "n_estimators": n_estimators,
+                # paralellik süreç düzeyinde; ağaç düzeyinde değil
+                "n_jobs": 1,
+                "forest": forest,
+            }
+        )
+
+    registry = load_registry(out_path)
+    if not jobs:
+        print(f"[batch_training] {data_path} içinde veri dosyası yok")
+        return registry
+
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    print(f"[batch_training] {len(jobs)} istasyon, {workers} işçi")
+    # max_tasks_per_child=1: her istasyondan sonra işçi yeniden başlar
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        futures = {pool.submit(_train_station, job): job for job in jobs}
+        for fut in as_completed(futures):
+            job = futures[fut]
+            try:
+                entry = fut.result()
+            except Exception as e:
+                print(f"[batch_training] {job['station']} başarısız: {e}")
+                continue
+            location = _match_city(entry["station"], db)
+            if location:
+                entry.update(location)
+            else:
+                print(f"[batch_training] {entry['station']} için konum bulunamadı")
+            registry["stations"][entry["station"]] = entry
+            # ara kayıt: uzun koşular yarıda kalsa da biten istasyonlar kaybolmaz
+            write_registry(out_path, registry)
+            temp = entry["metrics"]["temperature_2m"]
+            print(
+                f"[batch_training] {entry['station']}: {entry['rows']} satır, "
+                f"RMSE={temp['rmse']:.3f}, {entry['train_seconds']} sn"
+            )
+    return registry
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="İstasyon başına paralel model eğitimi")
+    ap.add_argument("data_dir", help="istasyon başına saatlik CSV/Parquet klasörü")
+    ap.add_argument("--out", default="models", help="model ve registry.json klasörü")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--max-rows", type=int, default=None)
+    ap.add_argument("--chunksize", type=int, default=500_000)
+    ap.add_argument("--n-estimators", type=int, default=100)
+    ap.add_argument("--no-forest", action="store_true", help=".forest dosyası yazma")
+    ap.add_argument("--only", nargs="*", help="yalnızca bu istasyon kimlikleri")
+    args = ap.parse_args(argv)
+
+    train_stations(
+        args.data_dir,
+        args.out,
+        workers=args.workers,
+        max_rows=args.max_rows,
+        chunksize=args.chunksize,
+        n_estimators=args.n_estimators,
+        forest=not args.no_forest,
+        only=args.only,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
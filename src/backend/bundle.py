@@ -0,0 +1,351 @@
+"""
+Open-Meteo bundle'ı ({"current", "hourly", "daily"}) için sütunlu bellek
+gösterimi ve yardımcılar.
+
+WeatherBundle her seriyi tek bir NumPy dizisi olarak tutar: zaman ekseni
+datetime64, tamsayı seriler int16 (eksik -> INT_NULL), diğerleri float32
+(eksik -> NaN). Liste-sözlük gösterimine göre konum başına bellek birkaç
+kat düşer; render_content geçiş sürecinde sözlük gibi okumaya devam eder
+(bundle["hourly"]["temperature_2m"]).
+"""
+
+import json
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Bundle'a eklenen, bir kez ayrıştırılmış zaman eksenleri
+TIME_INDEX_KEY = "time_index"
+TIME_UNITS = {"hourly": "datetime64[m]", "daily": "datetime64[D]"}
+
+INT_NULL = -32768
+
+# İkili biçim: [MAGIC][u16 sürüm][u32 başlık uzunluğu][JSON başlık][sütunlar]
+# Sütunlar başlıktaki sırayla, her biri 8 bayta hizalı ham küçük-endian dizi.
+_MAGIC = b"WWFC"
+_VERSION = 2
+_PREFIX = struct.Struct("<4sHI")
+_ALIGN = 8
+
+
+def _parse_times(values: Sequence[Any], unit: str) -> np.ndarray:
+    try:
+        return np.array(values, dtype=unit)
+    except (ValueError, TypeError):
+        # bozuk öğe: tek tek çevir, okunamayanlar NaT (sıralamada sona düşer)
+        out = np.empty(len(values), dtype=unit)
+        for i, v in enumerate(values):
+            try:
+                out[i] = np.datetime64(v)
+            except (ValueError, TypeError):
+                out[i] = np.datetime64("NaT")
+        return out
+
+
+def _to_column(values: Sequence[Any]) -> Union[np.ndarray, list]:
+    """Liste -> int16 / float32 dizi; sayısal değilse liste olarak kalır."""
+    values = list(values)
+    if all(v is None or (isinstance(v, int) and not isinstance(v, bool)) for v in values):
+        if all(v is None or INT_NULL < v < 32768 for v in values):
+            return np.array([INT_NULL if v is None else v for v in values], dtype="<i2")
+    if all(v is None or isinstance(v, (int, float)) for v in values):
+        return np.array(values, dtype=np.float64).astype("<f4")
+    return values
+
+
+def value_at(values: Any, i: int) -> Any:
+    """
+    Serinin i. değeri düz Python sayısı olarak; eksik/NaN/INT_NULL ya da
+    aralık dışı ise None. Liste ve dizi serilerle aynı şekilde çalışır.
+    """
+    if values is None or i >= len(values):
+        return None
+    v = values[i]
+    if v is None:
+        return None
+    if isinstance(v, np.generic):
+        if np.issubdtype(v.dtype, np.floating):
+            return None if np.isnan(v) else float(v)
+        if np.issubdtype(v.dtype, np.integer):
+            return None if v == INT_NULL else int(v)
+        return v.item()
+    return v
+
+
+class BundleBlock:
+    """
+    Tek blok (hourly / daily): zaman ekseni + değişken başına dizi.
+    Sözlük gibi okunur; "time" anahtarı datetime64 ekseni döndürür.
+    """
+
+    __slots__ = ("time", "columns")
+
+    def __init__(self, time: np.ndarray, columns: Dict[str, Union[np.ndarray, list]]):
+        self.time = time
+        self.columns = columns
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]], unit: str) -> "BundleBlock":
+        data = data or {}
+        time = _parse_times(data.get("time") or [], unit)
+        columns = {k: _to_column(v or []) for k, v in data.items() if k != "time"}
+        return cls(time, columns)
+
+    # --- sözlük arayüzü (geçiş dönemi) ---
+    def __getitem__(self, name: str) -> Any:
+        if name == "time":
+            return self.time
+        return self.columns[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        if name == "time":
+            return self.time
+        return self.columns.get(name, default)
+
+    def __contains__(self, name: object) -> bool:
+        return name == "time" or name in self.columns
+
+    def keys(self) -> List[str]:
+        return ["time", *self.columns]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        # boş blok ({} gibi) yanlış-değerli olsun
+        return len(self.columns) + 1 if len(self.time) or self.columns else 0
+
+    @property
+    def size(self) -> int:
+        """Zaman adımı sayısı."""
+        return len(self.time)
+
+    @property
+    def nbytes(self) -> int:
+        return self.time.nbytes + sum(
+            c.nbytes for c in self.columns.values() if isinstance(c, np.ndarray)
+        )
+
+    def slice(self, start: int, stop: int, step: int = 1) -> "BundleBlock":
+        """Kopyasız görünüm (NumPy dilimleri aynı belleği paylaşır)."""
+        sl = slice(start, stop, step)
+        return BundleBlock(self.time[sl], {k: v[sl] for k, v in self.columns.items()})
+
+    def bounds(self, start: Any = None, end: Any = None) -> Tuple[int, int]:
+        """[start, end) zaman aralığının indeks sınırları (ikili arama)."""
+        i0 = 0 if start is None else int(np.searchsorted(self.time, np.datetime64(start)))
+        i1 = (
+            len(self.time)
+            if end is None
+            else int(np.searchsorted(self.time, np.datetime64(end)))
+        )
+        return i0, i1
+
+    def window(self, start: Any = None, end: Any = None) -> "BundleBlock":
+        """[start, end) zaman aralığının kopyasız görünümü (ikili arama)."""
+        return self.slice(*self.bounds(start, end))
+
+    def to_dict(self) -> Dict[str, list]:
+        """JSON uyumlu liste-sözlük (eksikler None)."""
+        unit = np.datetime_data(self.time.dtype)[0]
+        out: Dict[str, list] = {
+            "time": np.datetime_as_string(self.time, unit=unit).tolist()
+        }
+        for name, col in self.columns.items():
+            if not isinstance(col, np.ndarray):
+                out[name] = list(col)
+            elif col.dtype.kind == "i":
+                out[name] = [None if v == INT_NULL else v for v in col.tolist()]
+            else:
+                # float32 -> orijinal (tek/iki ondalıklı) değerlere geri yuvarla
+                vals = col.astype(np.float64).round(4)
+                out[name] = [None if np.isnan(v) else v for v in vals.tolist()]
+        return out
+
+
+class WeatherBundle:
+    """
+    Bir konumun tahmin paketi: current (küçük sözlük), hourly ve daily
+    (BundleBlock) ve isteğe bağlı model katmanı (overlay).
+    """
+
+    __slots__ = ("current", "hourly", "daily", "overlay")
+
+    _KEYS = ("current", "hourly", "daily", "overlay")
+
+    def __init__(
+        self,
+        current: Optional[Dict[str, Any]] = None,
+        hourly: Optional[BundleBlock] = None,
+        daily: Optional[BundleBlock] = None,
+        overlay: Optional[Dict[str, Any]] = None,
+    ):
+        self.current = current or {}
+        self.hourly = hourly or BundleBlock.from_dict(None, TIME_UNITS["hourly"])
+        self.daily = daily or BundleBlock.from_dict(None, TIME_UNITS["daily"])
+        self.overlay = overlay
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WeatherBundle":
+        """{"current", "hourly", "daily"} liste-sözlüğünden."""
+        if isinstance(data, WeatherBundle):
+            return data
+        return cls(
+            dict(data.get("current") or {}),
+            BundleBlock.from_dict(data.get("hourly"), TIME_UNITS["hourly"]),
+            BundleBlock.from_dict(data.get("daily"), TIME_UNITS["daily"]),
+            data.get("overlay"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "current": dict(self.current),
+            "hourly": self.hourly.to_dict(),
+            "daily": self.daily.to_dict(),
+        }
+        if self.overlay is not None:
+            out["overlay"] = self.overlay
+        return out
+
+    # --- sözlük arayüzü (geçiş dönemi) ---
+    def __getitem__(self, key: str) -> Any:
+        if key == TIME_INDEX_KEY:
+            return {"hourly": self.hourly.time, "daily": self.daily.time}
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        if key in ("hourly", "daily") and not isinstance(value, BundleBlock):
+            value = BundleBlock.from_dict(value, TIME_UNITS[key])
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._KEYS or key == TIME_INDEX_KEY
+
+    @property
+    def nbytes(self) -> int:
+        return self.hourly.nbytes + self.daily.nbytes
+
+    def window(self, start: Any = None, end: Any = None) -> "WeatherBundle":
+        """
+        Saatlik ve günlük serilerin [start, end) kopyasız görünümü. Model
+        katmanı (overlay) da aynı sınırlarla dilimlenir, indeksler hizalı kalır.
+        """
+        day = lambda t: None if t is None else np.datetime64(t, "D")  # noqa: E731
+        bounds = {
+            "hourly": self.hourly.bounds(start, end),
+            "daily": self.daily.bounds(day(start), day(end)),
+        }
+        return WeatherBundle(
+            self.current,
+            self.hourly.slice(*bounds["hourly"]),
+            self.daily.slice(*bounds["daily"]),
+            _slice_overlay(self.overlay, bounds),
+        )
+
+    # --- kararlı ikili biçim (önbellek) ---
+    def to_bytes(self, meta: Optional[Dict[str, Any]] = None) -> bytes:
+        columns: List[dict] = []
+        chunks: List[bytes] = []
+        offset = 0
+        for block_name in ("hourly", "daily"):
+            block: BundleBlock = getattr(self, block_name)
+            for name in block.keys():
+                values = block[name]
+                col: Dict[str, Any] = {"block": block_name, "name": name}
+                if not isinstance(values, np.ndarray):
+                    # sayısal olmayan beklenmedik sütun: başlıkta JSON olarak kalsın
+                    col["json"] = list(values)
+                    columns.append(col)
+                    continue
+                arr = np.ascontiguousarray(values).astype(
+                    values.dtype.newbyteorder("<"), copy=False
+                )
+                raw = arr.tobytes()
+                pad = -len(raw) % _ALIGN
+                col.update(dtype=arr.dtype.str, len=len(arr), offset=offset)
+                columns.append(col)
+                chunks.append(raw + b"\0" * pad)
+                offset += len(raw) + pad
+        header = dict(meta or {})
+        header["current"] = self.current
+        header["columns"] = columns
+        raw_header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        # sütun bölümü de hizalı başlasın
+        raw_header += b" " * (-(_PREFIX.size + len(raw_header)) % _ALIGN)
+        return (
+            _PREFIX.pack(_MAGIC, _VERSION, len(raw_header))
+            + raw_header
+            + b"".join(chunks)
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Tuple["WeatherBundle", Dict[str, Any]]:
+        """(bundle, meta). Diziler `data` üzerinde salt-okunur görünümdür."""
+        magic, version, n = _PREFIX.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("tanınmayan bundle verisi")
+        start = _PREFIX.size
+        header = json.loads(bytes(data[start : start + n]).decode("utf-8"))
+        base = start + n
+        blocks: Dict[str, Dict[str, Any]] = {"hourly": {}, "daily": {}}
+        for col in header.pop("columns"):
+            if "json" in col:
+                values: Any = col["json"]
+            else:
+                values = np.frombuffer(
+                    data,
+                    dtype=np.dtype(col["dtype"]),
+                    count=col["len"],
+                    offset=base + col["offset"],
+                )
+            blocks[col["block"]][col["name"]] = values
+        current = header.pop("current")
+        built = {}
+        for name, cols in blocks.items():
+            time = cols.pop("time", None)
+            if time is None:
+                time = np.array([], dtype=TIME_UNITS[name])
+            built[name] = BundleBlock(time, cols)
+        return cls(current, built["hourly"], built["daily"]), header
+
+
+def _slice_overlay(
+    overlay: Optional[Dict[str, Any]], bounds: Dict[str, Tuple[int, int]]
+) -> Optional[Dict[str, Any]]:
+    """Overlay'in hourly/daily listelerini blok sınırlarıyla dilimler."""
+    if not overlay:
+        return overlay
+    out = dict(overlay)
+    for block, (i0, i1) in bounds.items():
+        series = overlay.get(block)
+        if series:
+            out[block] = {name: values[i0:i1] for name, values in series.items()}
+    return out
+
+
+def time_axes(bundle: Any) -> Dict[str, np.ndarray]:
+    """
+    hourly.time / daily.time dizilerini bir kez datetime64'e çevirip
+    bundle[TIME_INDEX_KEY] altında saklar; sonraki çağrılar ayrıştırmaz.
+    WeatherBundle eksenleri zaten datetime64 tuttuğundan doğrudan döner.
+    """
+    axes = bundle.get(TIME_INDEX_KEY)
+    if axes is None:
+        axes = {
+            block: _parse_times((bundle.get(block) or {}).get("time") or [], unit)
+            for block, unit in TIME_UNITS.items()
+        }
+        bundle[TIME_INDEX_KEY] = axes
+    return axes
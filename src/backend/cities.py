@@ -0,0 +1,50 @@
+import json
+import math
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+CityDB = Dict[str, Dict[str, Tuple[float, float]]]
+
+# Kaynak ağaçta: src/frontend/assets/cities.json
+DEFAULT_CITIES_PATH = (
+    Path(__file__).resolve().parent.parent / "frontend" / "assets" / "cities.json"
+)
+
+# Türkçe karakterleri ASCII'ye indir (istasyon kimliği eşleştirmesi için)
+_ASCII_FOLD = str.maketrans("çğıİöşüÇĞÖŞÜâîû", "cgiiosucgosuaiu")
+
+
+def load_city_db(path: Optional[Path] = None) -> CityDB:
+    path = Path(path) if path else DEFAULT_CITIES_PATH
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        fixed = {
+            country: {
+                city: (float(lat), float(lon)) for city, (lat, lon) in cities.items()
+            }
+            for country, cities in data.items()
+        }
+        return fixed
+    except Exception as e:
+        print("[WARN] cities.json okunamadı:", e)
+        return {"Türkiye": {"Karabük": (41.2040, 32.6260)}}
+
+
+def slugify(name: str) -> str:
+    """'Karabük' -> 'karabuk', 'Afyon Karahisar' -> 'afyon_karahisar'."""
+    folded = name.translate(_ASCII_FOLD).lower()
+    return "_".join("".join(c if c.isalnum() else " " for c in folded).split())
+
+
+def iter_cities(db: CityDB) -> Iterator[Tuple[str, str, float, float]]:
+    for country, cities in db.items():
+        for city, (lat, lon) in cities.items():
+            yield country, city, lat, lon
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(a))
@@ -0,0 +1,116 @@
+"""
+(ay, gün, saat) -> (kayıt sayısı, ortalama, std) iklim tablosu.
+
+Eğitim verisi parça parça okunurken biriktirilir ve modelin yanına
+`<model>.clim.npz` olarak yazılır (12x31x24 yoğun diziler). Tahmin tarafı
+ham CSV'ye ihtiyaç duymadan O(1) indeksleme ile geçmiş bağlamı okur.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from backend.features import TARGET_COLUMNS
+
+SHAPE = (12, 31, 24)
+_CELLS = SHAPE[0] * SHAPE[1] * SHAPE[2]
+
+
+def climatology_path(model_path: Union[str, Path]) -> Path:
+    """'model.joblib' / 'model.forest' -> 'model.clim.npz'."""
+    return Path(model_path).with_suffix(".clim.npz")
+
+
+def _std(n: np.ndarray, s: np.ndarray, ss: np.ndarray) -> np.ndarray:
+    # örneklem std (ddof=1), pandas .std() ile aynı; n < 2 -> NaN
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (ss - s * s / n) / (n - 1)
+    return np.sqrt(np.clip(var, 0.0, None))
+
+
+class ClimatologyAccumulator:
+    """Parça parça gelen (ay, gün, saat, hedefler) tablosundan toplamlar."""
+
+    def __init__(self):
+        self.count = np.zeros(_CELLS, dtype=np.int64)
+        self.sums = {t: np.zeros(_CELLS) for t in TARGET_COLUMNS}
+        self.sumsq = {t: np.zeros(_CELLS) for t in TARGET_COLUMNS}
+
+    def add(self, frame: Any):
+        """`frame`: month/day/hour ve hedef sütunlarını içeren tablo."""
+        month = np.asarray(frame["month"], dtype=np.int64)
+        day = np.asarray(frame["day"], dtype=np.int64)
+        hour = np.asarray(frame["hour"], dtype=np.int64)
+        idx = ((month - 1) * SHAPE[1] + (day - 1)) * SHAPE[2] + hour
+        self.count += np.bincount(idx, minlength=_CELLS)
+        for t in TARGET_COLUMNS:
+            v = np.asarray(frame[t], dtype=np.float64)
+            self.sums[t] += np.bincount(idx, weights=v, minlength=_CELLS)
+            self.sumsq[t] += np.bincount(idx, weights=v * v, minlength=_CELLS)
+
+    def finish(self) -> "Climatology":
+        n = self.count.reshape(SHAPE)
+        # (ay, saat) yedeği: tam gün eşleşmesi olmayan sorgular için
+        n_mh = n.sum(axis=1)
+        arrays: Dict[str, np.ndarray] = {
+            "count": n.astype(np.int32),
+            "count_mh": n_mh.astype(np.int32),
+        }
+        for t in TARGET_COLUMNS:
+            s = self.sums[t].reshape(SHAPE)
+            ss = self.sumsq[t].reshape(SHAPE)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                arrays[f"{t}_mean"] = (s / n).astype(np.float32)
+                arrays[f"{t}_mean_mh"] = (s.sum(axis=1) / n_mh).astype(np.float32)
+            arrays[f"{t}_std"] = _std(n, s, ss).astype(np.float32)
+            arrays[f"{t}_std_mh"] = _std(n_mh, s.sum(axis=1), ss.sum(axis=1)).astype(
+                np.float32
+            )
+        return Climatology(arrays)
+
+
+class Climatology:
+    """12x31x24 iklim dizileri; `lookup` sabit zamanlı indekslemedir."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.arrays = arrays
+
+    @classmethod
+    def from_frame(cls, frame: Any) -> "Climatology":
+        acc = ClimatologyAccumulator()
+        acc.add(frame)
+        return acc.finish()
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "Climatology":
+        with np.load(path) as data:
+            return cls({k: data[k] for k in data.files})
+
+    def save(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        # np.savez uzantı eklemesin diye açık dosya nesnesiyle yaz
+        with open(path, "wb") as f:
+            np.savez(f, **self.arrays)
+        return path
+
+    def lookup(self, month: int, day: int, hour: int) -> Optional[Dict[str, Any]]:
+        """
+        Aynı ay-gün-saatin geçmiş istatistikleri; o hücre boşsa aynı ay ve
+        saatin tüm günleri. Hiç kayıt yoksa None.
+        """
+        a = self.arrays
+        m, d, h = month - 1, day - 1, hour
+        n = int(a["count"][m, d, h])
+        if n > 0:
+            cell, suffix = (m, d, h), ""
+        else:
+            n = int(a["count_mh"][m, h])
+            if n == 0:
+                return None
+            cell, suffix = (m, h), "_mh"
+        out: Dict[str, Any] = {"count": n, "exact": suffix == ""}
+        for t in TARGET_COLUMNS:
+            out[f"{t}_mean"] = float(a[f"{t}_mean{suffix}"][cell])
+            out[f"{t}_std"] = float(a[f"{t}_std{suffix}"][cell])
+        return out
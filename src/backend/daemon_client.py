@@ -0,0 +1,245 @@
+"""
+Yerel tahmin servisine (src/daemon.py) istemci.
+
+Servis kullanımı isteğe bağlıdır; adres WEATHER_DAEMON ortam
+değişkeninden okunur:
+    (boş) / off                  servisi hiç deneme (varsayılan)
+    on                           http://127.0.0.1:8787
+    http://127.0.0.1:8787        yerel HTTP
+    unix:/tmp/weatherwidget.sock Unix soketi
+
+Kimlik doğrulama: servis ve istemci kullanıcıya özel bir belirteç paylaşır
+(WEATHER_DAEMON_TOKEN ya da servisin yazdığı `daemon.token`, izin 0600).
+İstemci önce /v1/health'e rastgele bir nonce gönderir ve servisin
+HMAC(belirteç, nonce) kanıtını doğrular; belirteci yalnızca kanıtı veren
+servise `Authorization: Bearer` başlığıyla yollar. Aynı portu dinleyen
+başka bir süreç ne veri alır ne de belirteci öğrenir.
+
+Bundle'lar WeatherBundle.to_bytes biçiminde taşınır (JSON yok; istemci
+diziler üzerinde kopyasız görünüm alır). Model katmanı ve önbellek
+bilgisi (durum, expires_at) başlıktaki meta içindedir.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+from backend.bundle import WeatherBundle
+
+DEFAULT_DAEMON_URL = "http://127.0.0.1:8787"
+BUNDLE_CONTENT_TYPE = "application/x-weatherwidget-bundle"
+UNIX_PREFIX = "unix:"
+NONCE_HEADER = "X-WeatherWidget-Nonce"
+PROOF_HEADER = "X-WeatherWidget-Proof"
+_OFF = ("", "off", "0", "none", "no", "false")
+_ON = ("on", "1", "yes", "true")
+
+
+def daemon_address() -> Optional[str]:
+    """WEATHER_DAEMON'dan servis adresi; ayarlı değilse / kapalıysa None."""
+    value = os.environ.get("WEATHER_DAEMON", "").strip()
+    if value.lower() in _OFF:
+        return None
+    if value.lower() in _ON:
+        return DEFAULT_DAEMON_URL
+    return value
+
+
+def runtime_dir() -> Path:
+    """Belirteç dosyasının klasörü (kullanıcıya özel)."""
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+        return Path(base) / "WeatherWidget"
+    base = os.environ.get("XDG_RUNTIME_DIR") or str(Path.home() / ".cache")
+    return Path(base) / "weatherwidget"
+
+
+def token_path() -> Path:
+    return runtime_dir() / "daemon.token"
+
+
+def read_token() -> Optional[str]:
+    """WEATHER_DAEMON_TOKEN ya da servisin yazdığı belirteç dosyası."""
+    env = os.environ.get("WEATHER_DAEMON_TOKEN", "").strip()
+    if env:
+        return env
+    try:
+        return token_path().read_text(encoding="utf-8").strip() or None
+    except OSError:
+        return None
+
+
+def ensure_token() -> str:
+    """Servis tarafı: belirteci okur, yoksa 0600 izinli dosyaya yenisini yazar."""
+    token = read_token()
+    if token:
+        return token
+    path = token_path()
+    path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    token = secrets.token_urlsafe(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    return token
+
+
+def proof(token: str, nonce: str) -> str:
+    """Servisin belirteci bildiğinin kanıtı (belirteci açık etmeden)."""
+    return hmac.new(token.encode(), nonce.encode(), hashlib.sha256).hexdigest()
+
+
+class DaemonClient:
+    """Tek aiohttp oturumu üzerinden servis uçlarını çağıran ince istemci."""
+
+    def __init__(
+        self,
+        address: Optional[str] = None,
+        timeout: float = 15.0,
+        token: Optional[str] = None,
+    ):
+        self.address = address or daemon_address() or DEFAULT_DAEMON_URL
+        self._timeout = timeout
+        self._token = token or read_token()
+        # belirteç yalnızca kanıtı doğrulanmış servise gönderilir
+        self._verified = False
+        self._session: Optional[aiohttp.ClientSession] = None
+        if self.address.startswith(UNIX_PREFIX):
+            self._socket_path: Optional[str] = self.address[len(UNIX_PREFIX) :]
+            self._base = "http://localhost"
+        else:
+            self._socket_path = None
+            self._base = self.address.rstrip("/")
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = (
+                aiohttp.UnixConnector(path=self._socket_path)
+                if self._socket_path
+                else aiohttp.TCPConnector(limit=4)
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self._timeout),
+            )
+        return self._session
+
+    async def close(self):
+        sess, self._session = self._session, None
+        if sess is not None and not sess.closed:
+            await sess.close()
+
+    async def _get(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        timeout: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Optional[Tuple[str, bytes, Any]]:
+        """(content-type, gövde, yanıt başlıkları); bağlantı/HTTP hatasında None."""
+        if headers is None:
+            if not self._verified:
+                print(f"[daemon_client] {path}: servis doğrulanmadı")
+                return None
+            headers = {"Authorization": f"Bearer {self._token}"}
+        try:
+            sess = self._get_session()
+            kwargs = {}
+            if timeout is not None:
+                kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+            async with sess.get(
+                f"{self._base}{path}",
+                params={k: str(v) for k, v in params.items()},
+                headers=headers,
+                **kwargs,
+            ) as resp:
+                if resp.status != 200:
+                    print(f"[daemon_client] {path}: HTTP {resp.status}")
+                    return None
+                return resp.content_type, await resp.read(), resp.headers
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            print(f"[daemon_client] {path}: {type(e).__name__}")
+            return None
+
+    async def _get_json(self, path: str, params: Dict[str, Any], **kw) -> Optional[Any]:
+        got = await self._get(path, params, **kw)
+        return json.loads(got[1]) if got else None
+
+    async def health(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Servis durumu. Yanıttaki kanıt belirteçle eşleşmezse None; eşleşirse
+        istemci doğrulanmış sayılır ve diğer uçlar belirteçle çağrılır.
+        """
+        if not self._token:
+            print("[daemon_client] belirteç yok (WEATHER_DAEMON_TOKEN / daemon.token)")
+            return None
+        nonce = secrets.token_hex(16)
+        headers = {NONCE_HEADER: nonce}
+        if self._verified:
+            # ayrıntılı istatistikler yalnızca belirteçle
+            headers["Authorization"] = f"Bearer {self._token}"
+        got = await self._get("/v1/health", {}, timeout=timeout, headers=headers)
+        if got is None:
+            return None
+        if not hmac.compare_digest(
+            got[2].get(PROOF_HEADER, ""), proof(self._token, nonce)
+        ):
+            print(f"[daemon_client] {self.address} kimliğini kanıtlayamadı")
+            self._verified = False
+            return None
+        self._verified = True
+        return json.loads(got[1])
+
+    async def fetch_bundle(
+        self, lat: float, lon: float, forecast_days: int = 4
+    ) -> Optional[Tuple[WeatherBundle, Dict[str, Any]]]:
+        """
+        (bundle, meta). meta: status ("fresh" | "stale" | "current"),
+        expires_at, model; bundle.overlay servisteki modelin katmanıdır.
+        """
+        got = await self._get(
+            "/v1/bundle", {"lat": lat, "lon": lon, "days": forecast_days}
+        )
+        if got is None:
+            return None
+        content_type, body, _ = got
+        if content_type != BUNDLE_CONTENT_TYPE:
+            print(f"[daemon_client] beklenmeyen içerik türü: {content_type}")
+            return None
+        bundle, meta = WeatherBundle.from_bytes(body)
+        bundle.overlay = meta.pop("overlay", None)
+        return bundle, meta
+
+    async def consistency(
+        self, lat: float, lon: float, when: datetime
+    ) -> Optional[Dict[str, Any]]:
+        """Servis modelinin `when` saati tahmini + iklim bağlamı."""
+        return await self._get_json(
+            "/v1/consistency",
+            {"lat": lat, "lon": lon, "time": when.strftime("%Y-%m-%dT%H:%M")},
+        )
+
+
+async def connect_daemon(
+    address: Optional[str] = None, timeout: float = 1.0
+) -> Optional[DaemonClient]:
+    """
+    WEATHER_DAEMON ayarlı, servis çalışıyor ve belirteci kanıtlıyorsa bağlı
+    istemci; aksi halde None (widget kendi başına çalışır).
+    """
+    address = address or daemon_address()
+    if address is None:
+        return None
+    client = DaemonClient(address)
+    if await client.health(timeout=timeout) is None:
+        await client.close()
+        return None
+    return client
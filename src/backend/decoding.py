@@ -0,0 +1,209 @@
+"""
+Open-Meteo yanıtlarını WeatherBundle'a çözen takılabilir katman.
+
+JSON: kurulu ise orjson / msgspec, değilse stdlib json. Seriler ara
+liste-sözlük kopyası olmadan bilinen şemaya göre doğrudan tipli dizilere
+(float32 / int16) çevrilir; zaman eksenleri `timeformat=unixtime` ile tamsayı
+gelir ve metin ayrıştırması gerekmez.
+
+FlatBuffers (`format=flatbuffers`): openmeteo_sdk kuruluysa, büyük çoklu
+konum isteklerinde değerler doğrudan float32 dizi olarak okunur. Paket
+yoksa çağıran taraf JSON'a döner.
+
+Seçim: WEATHER_JSON_DECODER=orjson|msgspec|json (varsayılan: ilk kurulu olan).
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.bundle import INT_NULL, TIME_UNITS, BundleBlock, WeatherBundle, _to_column
+
+JSON_DECODERS = ("orjson", "msgspec", "json")
+
+# Tamsayı tutulan seriler (geri kalan sayısal seriler float32)
+INT_COLUMNS = frozenset({"weathercode", "weather_code", "is_day"})
+
+_decoder: Optional[Tuple[str, Callable[[bytes], Any]]] = None
+_fb_response: Any = None
+
+
+def _load_json_decoder(name: str) -> Optional[Callable[[bytes], Any]]:
+    try:
+        if name == "orjson":
+            import orjson
+
+            return orjson.loads
+        if name == "msgspec":
+            import msgspec
+
+            return msgspec.json.Decoder().decode
+    except ImportError:
+        return None
+    if name == "json":
+        return json.loads
+    return None
+
+
+def get_json_decoder() -> Tuple[str, Callable[[bytes], Any]]:
+    """(ad, bytes -> nesne) çifti; ilk çağrıda seçilip saklanır."""
+    global _decoder
+    if _decoder is None:
+        wanted = os.getenv("WEATHER_JSON_DECODER", "").strip().lower()
+        order = ((wanted,) if wanted else ()) + JSON_DECODERS
+        for name in order:
+            fn = _load_json_decoder(name)
+            if fn is not None:
+                _decoder = (name, fn)
+                break
+        if wanted and _decoder[0] != wanted:
+            print(f"[decoding] {wanted} kullanılamıyor, {_decoder[0]} seçildi")
+    return _decoder
+
+
+def decode_json(raw: bytes) -> Any:
+    return get_json_decoder()[1](raw)
+
+
+def flatbuffers_available() -> bool:
+    """openmeteo_sdk kurulu mu (FlatBuffers yanıtı çözülebilir mi)?"""
+    global _fb_response
+    if _fb_response is None:
+        try:
+            from openmeteo_sdk.WeatherApiResponse import WeatherApiResponse
+
+            _fb_response = WeatherApiResponse
+        except ImportError:
+            _fb_response = False
+    return _fb_response is not False
+
+
+# --- tipli sütunlar ---
+def _typed_column(name: str, values: Any) -> Any:
+    """Liste ya da dizi -> şemaya göre int16 / float32 (eksik -> INT_NULL / NaN)."""
+    try:
+        arr = np.asarray(values if values is not None else [], dtype=np.float32)
+    except (ValueError, TypeError):
+        # sayısal olmayan beklenmedik seri: genel çıkarıma bırak
+        return _to_column(values)
+    if name not in INT_COLUMNS:
+        return arr
+    out = np.full(arr.shape, INT_NULL, dtype="<i2")
+    ok = ~np.isnan(arr)
+    out[ok] = arr[ok]
+    return out
+
+
+def _unix_axis(seconds: np.ndarray, offset: int, unit: str) -> np.ndarray:
+    # timezone=auto: yerel duvar saati = UTC + utc_offset_seconds
+    return (seconds.astype(np.int64) + offset).astype("datetime64[s]").astype(unit)
+
+
+def _json_time(values: Sequence[Any], offset: int, unit: str) -> np.ndarray:
+    if len(values) and isinstance(values[0], int):
+        return _unix_axis(np.asarray(values, dtype=np.int64), offset, unit)
+    # timeformat=iso8601 yanıtları (eski önbellek / sahte sunucular)
+    return BundleBlock.from_dict({"time": values}, unit).time
+
+
+def _json_block(data: Optional[Dict[str, Any]], offset: int, unit: str) -> BundleBlock:
+    data = data or {}
+    time = _json_time(data.get("time") or [], offset, unit)
+    columns = {k: _typed_column(k, v) for k, v in data.items() if k != "time"}
+    return BundleBlock(time, columns)
+
+
+def bundle_from_json(data: Any) -> Optional[WeatherBundle]:
+    """Tek konumun çözülmüş JSON nesnesi -> WeatherBundle (geçersizse None)."""
+    if not isinstance(data, dict) or not data.get("current_weather"):
+        return None
+    offset = int(data.get("utc_offset_seconds") or 0)
+    current = dict(data["current_weather"])
+    if isinstance(current.get("time"), int):
+        current["time"] = str(_unix_axis(np.array([current["time"]]), offset, "datetime64[m]")[0])
+    return WeatherBundle(
+        current,
+        _json_block(data.get("hourly"), offset, TIME_UNITS["hourly"]),
+        _json_block(data.get("daily"), offset, TIME_UNITS["daily"]),
+    )
+
+
+def decode_json_bundles(raw: bytes) -> Optional[List[Optional[WeatherBundle]]]:
+    """
+    JSON yanıtı -> konum başına WeatherBundle listesi (tek konumda bile liste).
+    Her konum diziye çevrildikçe çözülmüş nesnesi bırakılır; tüm konumların
+    kutulu listeleri ile dizileri aynı anda bellekte durmaz.
+    """
+    data = decode_json(raw)
+    if isinstance(data, dict):
+        data = [data]
+    if not isinstance(data, list):
+        return None
+    out: List[Optional[WeatherBundle]] = []
+    for i in range(len(data)):
+        out.append(bundle_from_json(data[i]))
+        data[i] = None
+    return out
+
+
+# --- FlatBuffers ---
+def _fb_block(
+    block: Any, names: Sequence[str], offset: int, unit: str
+) -> BundleBlock:
+    if block is None:
+        return BundleBlock(np.array([], dtype=unit), {})
+    seconds = np.arange(block.Time(), block.TimeEnd(), block.Interval(), dtype=np.int64)
+    columns: Dict[str, Any] = {}
+    # değişkenler istekteki sırayla gelir
+    for i, name in enumerate(names[: block.VariablesLength()]):
+        values = block.Variables(i).ValuesAsNumpy()
+        # ham tampon tüm konumları tutar; küçük kopya ile serbest bırakılabilsin
+        columns[name] = np.array(_typed_column(name, values), copy=True)
+    return BundleBlock(_unix_axis(seconds, offset, unit), columns)
+
+
+def _fb_current(block: Any, keys: Sequence[str], offset: int) -> Dict[str, Any]:
+    if block is None:
+        return {}
+    current: Dict[str, Any] = {
+        "time": str(_unix_axis(np.array([block.Time()]), offset, "datetime64[m]")[0])
+    }
+    for i, key in enumerate(keys[: block.VariablesLength()]):
+        value = float(block.Variables(i).Value())
+        current[key] = int(value) if key in INT_COLUMNS else value
+    return current
+
+
+def decode_flatbuffers_bundles(
+    raw: bytes,
+    hourly: Sequence[str],
+    daily: Sequence[str],
+    current: Sequence[str],
+) -> List[Optional[WeatherBundle]]:
+    """
+    `format=flatbuffers` yanıtı: konum başına boyut önekli (u32 LE)
+    WeatherApiResponse mesajları. `hourly` / `daily` / `current` istekteki
+    değişken sırasıyla bundle'daki sütun adları.
+    """
+    if not flatbuffers_available():
+        raise RuntimeError("openmeteo_sdk kurulu değil")
+    out: List[Optional[WeatherBundle]] = []
+    pos, total = 0, len(raw)
+    while pos + 4 <= total:
+        length = int.from_bytes(raw[pos : pos + 4], "little")
+        msg = _fb_response.GetRootAs(raw, pos + 4)
+        offset = int(msg.UtcOffsetSeconds())
+        cur = _fb_current(msg.Current(), current, offset)
+        out.append(
+            WeatherBundle(
+                cur,
+                _fb_block(msg.Hourly(), hourly, offset, TIME_UNITS["hourly"]),
+                _fb_block(msg.Daily(), daily, offset, TIME_UNITS["daily"]),
+            )
+            if cur
+            else None
+        )
+        pos += 4 + length
+    return out
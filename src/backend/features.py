@@ -0,0 +1,97 @@
+from typing import Any, Dict
+
+import numpy as np
+
+# Modelin beklediği özellik sırası (eğitim ve tahmin aynı listeyi kullanır)
+FEATURE_COLUMNS = [
+    "month",
+    "day",
+    "hour",
+    "day_of_week",
+    "day_of_year",
+    "quarter",
+    "is_weekend",
+    "season",
+    "month_sin",
+    "month_cos",
+    "hour_sin",
+    "hour_cos",
+]
+
+TARGET_COLUMNS = ["temperature_2m", "precipitation"]
+
+# ay -> mevsim: 12,1,2 kış (1) · 3,4,5 ilkbahar (2) · 6,7,8 yaz (3) · 9,10,11 sonbahar (4)
+# (indeks 0 kullanılmaz; ay numarasıyla doğrudan indekslenir)
+SEASON_BY_MONTH = np.array([0, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4, 1], dtype=np.int8)
+
+
+def get_season(month: int) -> int:
+    return int(SEASON_BY_MONTH[month])
+
+
+def _naive(t: Any) -> Any:
+    return t.replace(tzinfo=None) if getattr(t, "tzinfo", None) is not None else t
+
+
+def wall_clock_hours(times: Any) -> np.ndarray:
+    """
+    Zaman damgalarını saate yuvarlanmış datetime64[h] dizisine çevirir.
+    Saat dilimli girdide duvar saati korunur (eğitimdeki `tz_localize(None)`
+    gibi); np.asarray bunları UTC'ye çevirirdi.
+    """
+    if getattr(times, "tz", None) is not None:  # pd.DatetimeIndex
+        times = times.tz_localize(None)
+    elif getattr(getattr(times, "dt", None), "tz", None) is not None:  # pd.Series
+        times = times.dt.tz_localize(None)
+    elif isinstance(times, (list, tuple)) or (
+        isinstance(times, np.ndarray) and times.dtype == object
+    ):
+        times = [_naive(t) for t in times]
+    else:
+        times = _naive(times)
+    return np.asarray(times, dtype="datetime64[h]")
+
+
+def date_features(times: Any, compact: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Saatlik zaman damgalarından tüm tarih özelliklerini tek geçişte,
+    sütun bazında üretir (pandas gerektirmez).
+
+    `times`: datetime/Timestamp listesi, pd.DatetimeIndex veya np.datetime64 dizisi.
+    `compact=True`: eğitim için dar tipler (int8/int16/float32); aksi halde
+    tahmin tarafının kullandığı int64/float64.
+    """
+    t = wall_clock_hours(times)
+    days = t.astype("datetime64[D]")
+    months = days.astype("datetime64[M]")
+
+    hour = (t - days).astype(np.int64)
+    month = months.astype(np.int64) % 12 + 1
+    day = (days - months).astype(np.int64) + 1
+    day_of_year = (days - days.astype("datetime64[Y]")).astype(np.int64) + 1
+    # 1970-01-01 Perşembe (Pazartesi=0 -> 3)
+    day_of_week = (days.astype(np.int64) + 3) % 7
+
+    out = {
+        "month": month,
+        "day": day,
+        "hour": hour,
+        "day_of_week": day_of_week,
+        "day_of_year": day_of_year,
+        "quarter": (month - 1) // 3 + 1,
+        "is_weekend": (day_of_week >= 5).astype(np.int64),
+        "season": SEASON_BY_MONTH[month].astype(np.int64),
+        "month_sin": np.sin(2 * np.pi * month / 12),
+        "month_cos": np.cos(2 * np.pi * month / 12),
+        "hour_sin": np.sin(2 * np.pi * hour / 24),
+        "hour_cos": np.cos(2 * np.pi * hour / 24),
+    }
+    if compact:
+        for name, arr in out.items():
+            if arr.dtype.kind == "f":
+                out[name] = arr.astype(np.float32)
+            elif name == "day_of_year":
+                out[name] = arr.astype(np.int16)
+            else:
+                out[name] = arr.astype(np.int8)
+    return out
@@ -0,0 +1,184 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from backend import metrics
+from backend.bundle import WeatherBundle
+
+# Open-Meteo modelleri saatlik güncellenir; yeni çıktı API'ye birkaç dakika
+# gecikmeyle yansır. Önbellek girdileri bir sonraki "saat başı + gecikme"
+# anına kadar tazedir, bu sürede ağa hiç gidilmez.
+#
+# Koşullu yeniden doğrulama (If-None-Match / If-Modified-Since) yapılmaz:
+# Open-Meteo her yanıtı istekte üretir ve ETag / Last-Modified döndürmez;
+# çoklu konum isteğinde de tek yanıt birden çok girdiyi kapsar. Onun yerine
+# girdinin ömrü bir sonraki model güncellemesine hizalanır (o ana dek yeni
+# veri yoktur) ve süresi dolan girdi, başka bir sürecin diske yazdığı daha
+# yeni kopyayla karşılaştırılır (`ForecastCache._load`); ikisi de bayatsa
+# tam istek atılır.
+UPDATE_CADENCE_S = 3600
+UPDATE_LAG_S = 10 * 60
+
+# Dosya biçimi: WeatherBundle.to_bytes (backend/bundle.py) — sütun bazında
+# ham diziler + JSON başlık; meta (fetched_at/expires_at) başlıkta durur.
+# Eski sürüm dosyalar okunamaz ve ıskalama sayılır (yeniden indirilir).
+
+
+def next_update_time(now: float) -> float:
+    """`now` sonrasındaki ilk muhtemel model güncellemesi (epoch saniye)."""
+    t = (now // UPDATE_CADENCE_S) * UPDATE_CADENCE_S + UPDATE_LAG_S
+    if t <= now:
+        t += UPDATE_CADENCE_S
+    return t
+
+
+def _default_cache_dir() -> Path:
+    env = os.environ.get("WEATHER_CACHE_DIR")
+    if env:
+        return Path(env)
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+        return Path(base) / "WeatherWidget" / "cache"
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "weatherwidget"
+
+
+def encode_bundle(bundle: Any, meta: Dict[str, Any]) -> bytes:
+    return WeatherBundle.from_dict(bundle).to_bytes(meta)
+
+
+def decode_bundle(data: bytes) -> Tuple[WeatherBundle, Dict[str, Any]]:
+    return WeatherBundle.from_bytes(data)
+
+
+class ForecastCache:
+    """
+    (lat, lon, forecast_days) başına bir dosya tutan kalıcı tahmin önbelleği.
+    Taze girdiler ağa gitmeden döner; bayat girdiler yalnızca çevrimdışı
+    yedek olarak (allow_stale=True) kullanılır.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(directory) if directory else _default_cache_dir()
+        # aynı süreçte diski tekrar okumamak için bellek katmanı:
+        # yol -> (bundle, meta, dosyanın mtime_ns'i)
+        self._mem: Dict[Path, Tuple[WeatherBundle, Dict[str, Any], int]] = {}
+
+    def _path(self, lat: float, lon: float, forecast_days: int) -> Path:
+        return self.directory / f"{lat:.4f}_{lon:.4f}_{forecast_days}d.wwc"
+
+    def get(
+        self,
+        lat: float,
+        lon: float,
+        forecast_days: int,
+        allow_stale: bool = False,
+        now: Optional[float] = None,
+    ) -> Optional[WeatherBundle]:
+        path = self._path(lat, lon, forecast_days)
+        now = time.time() if now is None else now
+        entry = self._mem.get(path)
+        if entry is None or now >= entry[1].get("expires_at", 0):
+            # bellekte yok ya da bayat: başka bir süreç (servis, ikinci
+            # widget) dosyayı daha yenisiyle değiştirmiş olabilir
+            entry = self._load(path, entry)
+            if entry is None:
+                return None
+        bundle, meta, _ = entry
+        if not allow_stale and now >= meta.get("expires_at", 0):
+            metrics.incr("cache.expired")
+            return None
+        metrics.incr("cache.stale_hits" if now >= meta.get("expires_at", 0) else "cache.hits")
+        return bundle
+
+    def _load(
+        self, path: Path, cached: Optional[Tuple[WeatherBundle, Dict[str, Any], int]]
+    ) -> Optional[Tuple[WeatherBundle, Dict[str, Any], int]]:
+        """Dosya değiştiyse yeniden okur; değişmediyse / okunamazsa `cached`."""
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            if cached is None:
+                metrics.incr("cache.misses")
+            return cached
+        except OSError as e:
+            print(f"[forecast_cache] {path.name} okunamadı: {e}")
+            metrics.incr("cache.errors")
+            return cached
+        if cached is not None and cached[2] == mtime:
+            return cached
+        try:
+            data = path.read_bytes()
+            with metrics.span("cache.decode"):
+                bundle, meta = decode_bundle(data)
+        except FileNotFoundError:
+            # stat ile okuma arasında silindi
+            if cached is None:
+                metrics.incr("cache.misses")
+            return cached
+        except Exception as e:
+            print(f"[forecast_cache] {path.name} okunamadı: {e}")
+            metrics.incr("cache.errors")
+            return cached
+        entry = self._mem[path] = (bundle, meta, mtime)
+        return entry
+
+    def expires_at(self, lat: float, lon: float, forecast_days: int) -> Optional[float]:
+        entry = self._mem.get(self._path(lat, lon, forecast_days))
+        return entry[1].get("expires_at") if entry else None
+
+    def put(
+        self,
+        lat: float,
+        lon: float,
+        forecast_days: int,
+        bundle: Any,
+        now: Optional[float] = None,
+    ):
+        now = time.time() if now is None else now
+        meta = {
+            "lat": lat,
+            "lon": lon,
+            "forecast_days": forecast_days,
+            "fetched_at": now,
+            "expires_at": next_update_time(now),
+        }
+        path = self._path(lat, lon, forecast_days)
+        bundle = WeatherBundle.from_dict(bundle)
+        mtime = 0
+        tmp: Optional[str] = None
+        try:
+            data = bundle.to_bytes(meta)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # yazar başına ayrı geçici dosya: aynı konumu yazan iki süreç
+            # birbirinin yarım dosyasını yayımlamaz
+            with tempfile.NamedTemporaryFile(
+                dir=self.directory, prefix=f".{path.name}.", suffix=".tmp", delete=False
+            ) as f:
+                tmp = f.name
+                f.write(data)
+            os.replace(tmp, path)  # atomik: yarım yazılmış dosya okunmaz
+            tmp = None
+            mtime = path.stat().st_mtime_ns
+        except Exception as e:
+            print(f"[forecast_cache] yazılamadı: {e}")
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+        self._mem[path] = (bundle, meta, mtime)
+
+
+_cache: Optional[ForecastCache] = None
+
+
+def get_forecast_cache() -> ForecastCache:
+    """Süreç genelinde paylaşılan önbellek örneği."""
+    global _cache
+    if _cache is None:
+        _cache = ForecastCache()
+    return _cache
@@ -0,0 +1,246 @@
+"""
+Hafif ölçüm katmanı: zaman aralıkları (span) ve sayaçlar.
+
+Varsayılan kapalıdır; WEATHER_METRICS=1 ya da `enable()` ile açılır.
+Kapalıyken `span()` paylaşılan boş bir bağlam, `incr()` tek bir bayrak
+kontrolüdür — sıcak yollarda ölçülebilir maliyet yok.
+
+Dışa aktarım (istek üzerine):
+    snapshot()       -> JSON uyumlu sözlük
+    to_prometheus()  -> Prometheus metin biçimi
+    dump(path)       -> .json ya da .prom dosyası
+Servis (src/daemon.py) bunları /metrics ve /v1/metrics uçlarında sunar;
+widget süreci WEATHER_METRICS_FILE verilmişse çıkışta dosyaya yazar.
+"""
+
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+# Prometheus histogram kovaları (saniye)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIX = "weatherwidget"
+
+_enabled = os.environ.get("WEATHER_METRICS", "").lower() in ("1", "true", "yes", "on")
+_lock = threading.Lock()
+_spans: Dict[str, "_Histogram"] = {}
+_counters: Dict[str, float] = {}
+
+
+class _Histogram:
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # son kova: +Inf
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = on
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+def observe(name: str, seconds: float):
+    """Ölçülmüş bir süreyi `name` aralığına ekler."""
+    if not _enabled:
+        return
+    with _lock:
+        hist = _spans.get(name)
+        if hist is None:
+            hist = _spans[name] = _Histogram()
+        hist.add(seconds)
+
+
+def incr(name: str, n: float = 1):
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+class _Span:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.name, time.perf_counter() - self.t0)
+        if exc_type is not None:
+            incr(f"{self.name}.errors")
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str) -> Union[_Span, _NoopSpan]:
+    """`with span("fetch.decode"): ...` — kapalıyken boş bağlam."""
+    return _Span(name) if _enabled else _NOOP
+
+
+def timed(name: str) -> Callable:
+    """Fonksiyon / coroutine için `span` dekoratörü."""
+
+    def deco(fn: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def awrapper(*args, **kwargs):
+                if not _enabled:
+                    return await fn(*args, **kwargs)
+                with _Span(name):
+                    return await fn(*args, **kwargs)
+
+            return awrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return deco
+
+
+# ----- dışa aktarım -----
+def snapshot() -> Dict[str, Any]:
+    with _lock:
+        spans = {
+            name: {
+                "count": h.count,
+                "sum_s": h.total,
+                "mean_ms": h.total / h.count * 1e3 if h.count else 0.0,
+                "max_ms": h.max * 1e3,
+                "buckets": dict(zip([*map(str, BUCKETS), "+Inf"], h.buckets)),
+            }
+            for name, h in sorted(_spans.items())
+        }
+        counters = dict(sorted(_counters.items()))
+    return {"enabled": _enabled, "spans": spans, "counters": counters}
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def to_prometheus() -> str:
+    snap = snapshot()
+    lines = [
+        f"# HELP {PREFIX}_span_seconds Sıcak yol süreleri",
+        f"# TYPE {PREFIX}_span_seconds histogram",
+    ]
+    for name, s in snap["spans"].items():
+        lbl = _label(name)
+        cumulative = 0
+        for le, n in s["buckets"].items():
+            cumulative += n
+            lines.append(
+                f'{PREFIX}_span_seconds_bucket{{span="{lbl}",le="{le}"}} {cumulative}'
+            )
+        lines.append(f'{PREFIX}_span_seconds_sum{{span="{lbl}"}} {s["sum_s"]:.6f}')
+        lines.append(f'{PREFIX}_span_seconds_count{{span="{lbl}"}} {s["count"]}')
+    lines += [
+        f"# HELP {PREFIX}_events_total Olay sayaçları (yeniden deneme, önbellek, hata)",
+        f"# TYPE {PREFIX}_events_total counter",
+    ]
+    for name, v in snap["counters"].items():
+        lines.append(f'{PREFIX}_events_total{{name="{_label(name)}"}} {v:g}')
+    return "\n".join(lines) + "\n"
+
+
+def dump(path: Optional[Union[str, Path]] = None) -> Optional[Path]:
+    """`.prom` uzantısında Prometheus, aksi halde JSON yazar."""
+    path = path or os.environ.get("WEATHER_METRICS_FILE")
+    if not path:
+        return None
+    path = Path(path)
+    text = (
+        to_prometheus()
+        if path.suffix == ".prom"
+        else json.dumps(snapshot(), ensure_ascii=False, indent=2)
+    )
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+# ----- aiohttp izleme (bağlantı, ilk bayt) -----
+def trace_config() -> Optional[Any]:
+    """
+    Açıkken aiohttp TraceConfig: yeni bağlantı kurma süresi (connect) ve
+    isteğin gönderilmesinden yanıt başlıklarına kadar geçen süre (ttfb).
+    Kapalıyken None (oturuma hiç iz eklenmez).
+    """
+    if not _enabled:
+        return None
+    import aiohttp
+
+    async def on_request_start(session, ctx, params):
+        ctx.t_request = time.perf_counter()
+
+    async def on_connection_create_start(session, ctx, params):
+        ctx.t_connect = time.perf_counter()
+
+    async def on_connection_create_end(session, ctx, params):
+        observe("fetch.connect", time.perf_counter() - ctx.t_connect)
+        incr("fetch.connections_new")
+
+    async def on_connection_reuseconn(session, ctx, params):
+        incr("fetch.connections_reused")
+
+    async def on_request_end(session, ctx, params):
+        observe("fetch.ttfb", time.perf_counter() - ctx.t_request)
+
+    async def on_request_exception(session, ctx, params):
+        incr("fetch.request_exceptions")
+
+    tc = aiohttp.TraceConfig()
+    tc.on_request_start.append(on_request_start)
+    tc.on_connection_create_start.append(on_connection_create_start)
+    tc.on_connection_create_end.append(on_connection_create_end)
+    tc.on_connection_reuseconn.append(on_connection_reuseconn)
+    tc.on_request_end.append(on_request_end)
+    tc.on_request_exception.append(on_request_exception)
+    return tc
@@ -0,0 +1,142 @@
+"""
+Uyarlanır yenileme zamanlayıcısı.
+
+Sabit aralıklı yoklama yerine bir sonraki *anlamlı* yenileme anını hesaplar:
+- veri tazeyse: önbellek girdisinin bitişi (Open-Meteo saatlik model
+  güncellemesi + yayın gecikmesi) + rastgele sapma (istemciler aynı saniyede
+  yüklenmesin),
+- çevrimdışıysa: üstel geri çekilme (1, 2, 4 ... dk, üst sınırlı),
+- pencere gizliyken ya da sistem boştayken: gecikme uzatılır,
+- konum değişimi / pencerenin yeniden görünmesi: `wake()` ile hemen.
+
+Uzun beklemeler kısa parçalara bölünür ve duvar saatine göre kontrol edilir;
+bilgisayar uykudan uyandığında kaçırılan yenileme gecikmeden yapılır.
+"""
+
+import asyncio
+import random
+import sys
+import time
+from typing import Optional
+
+from backend.forecast_cache import next_update_time
+
+JITTER_S = 90.0
+MIN_DELAY_S = 30.0
+RETRY_BASE_S = 60.0
+RETRY_MAX_S = 30 * 60.0
+# gizli pencere / boştaki sistemde gecikme çarpanı ve üst sınırı
+HIDDEN_FACTOR = 3.0
+IDLE_FACTOR = 3.0
+SLOW_MAX_S = 4 * 3600.0
+IDLE_AFTER_S = 15 * 60.0
+# tek uykunun en uzun parçası (uyku/uyanma sonrası saat kayması için)
+MAX_NAP_S = 300.0
+
+
+def system_idle_seconds() -> Optional[float]:
+    """Son kullanıcı girdisinden bu yana geçen süre; bilinmiyorsa None."""
+    if not sys.platform.startswith("win"):
+        return None
+    try:
+        import ctypes
+
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+        info = LASTINPUTINFO()
+        info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+        if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+            return None
+        tick = ctypes.windll.kernel32.GetTickCount() & 0xFFFFFFFF
+        return ((tick - info.dwTime) & 0xFFFFFFFF) / 1000.0
+    except Exception:
+        return None
+
+
+class RefreshScheduler:
+    """
+    `record(ok)` ile son yenilemenin sonucu, `next_delay(expires_at)` ile
+    sonraki beklemenin süresi; `sleep(delay)` bu süre kadar ya da `wake()`
+    çağrılana kadar bekler.
+    """
+
+    def __init__(
+        self,
+        jitter_s: float = JITTER_S,
+        min_delay_s: float = MIN_DELAY_S,
+        retry_base_s: float = RETRY_BASE_S,
+        retry_max_s: float = RETRY_MAX_S,
+        rng: Optional[random.Random] = None,
+    ):
+        self.jitter_s = jitter_s
+        self.min_delay_s = min_delay_s
+        self.retry_base_s = retry_base_s
+        self.retry_max_s = retry_max_s
+        self._rng = rng or random.Random()
+        self.failures = 0
+        self.hidden = False
+        # döngü meşgulken gelen wake kaybolmaz: sonraki sleep hemen döner
+        self._wake = asyncio.Event()
+
+    # ----- durum -----
+    def record(self, ok: bool):
+        self.failures = 0 if ok else self.failures + 1
+
+    def set_hidden(self, hidden: bool):
+        was_hidden, self.hidden = self.hidden, hidden
+        # yeniden görününce bekleyen uzatılmış uykuyu kes
+        if was_hidden and not hidden:
+            self.wake()
+
+    def is_idle(self) -> bool:
+        idle = system_idle_seconds()
+        return idle is not None and idle >= IDLE_AFTER_S
+
+    # ----- hesap -----
+    def next_delay(
+        self, expires_at: Optional[float] = None, now: Optional[float] = None
+    ) -> float:
+        """Sonraki yenilemeye kadar beklenecek saniye."""
+        now = time.time() if now is None else now
+        if self.failures:
+            # tam sapmalı üstel geri çekilme: [yarı, tam] aralığından
+            backoff = min(
+                self.retry_max_s, self.retry_base_s * 2 ** (self.failures - 1)
+            )
+            return max(self.min_delay_s, backoff * self._rng.uniform(0.5, 1.0))
+        if expires_at is None:
+            expires_at = next_update_time(now)
+        # yalnızca ileri sapma: yeni model çıktısından önce gitmek boşa istek olur
+        delay = max(self.min_delay_s, expires_at - now)
+        delay += self._rng.uniform(0.0, self.jitter_s)
+        factor = 1.0
+        if self.hidden:
+            factor = max(factor, HIDDEN_FACTOR)
+        if self.is_idle():
+            factor = max(factor, IDLE_FACTOR)
+        if factor > 1.0:
+            delay = max(delay, min(SLOW_MAX_S, delay * factor))
+        return delay
+
+    # ----- bekleme -----
+    def wake(self):
+        self._wake.set()
+
+    async def sleep(self, delay: float) -> bool:
+        """`delay` sn ya da `wake()`e kadar bekler; uyandırıldıysa True."""
+        deadline = time.time() + delay
+        try:
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(), timeout=min(remaining, MAX_NAP_S)
+                    )
+                    return True
+                except asyncio.TimeoutError:
+                    continue
+        finally:
+            self._wake.clear()
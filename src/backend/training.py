@@ -0,0 +1,289 @@
+"""
+Saatlik istasyon verisinden hava tahmin modeli eğitimi.
+
+Colab/matplotlib gerektirmez; büyük veri için CSV/Parquet dosyasını parça
+parça okur, sütunları dar tiplerle (int8/int16/float32) tutar ve tarih
+özelliklerini tek geçişte türetir.
+
+Kullanım:
+    python -m backend.training karabuk_hourly_2020_2025.csv \\
+        --out weather_prediction_model.joblib [--forest] [--sample-frac 0.5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.climatology import Climatology, ClimatologyAccumulator, climatology_path
+from backend.features import FEATURE_COLUMNS, TARGET_COLUMNS, date_features
+
+DEFAULT_CHUNKSIZE = 500_000
+# Ham veride zaman sütunu bu adlardan biriyle gelir
+TIME_COLUMNS = ("date", "datetime", "time")
+
+
+def _time_column(columns: Sequence[str]) -> str:
+    for name in TIME_COLUMNS:
+        if name in columns:
+            return name
+    raise ValueError(f"zaman sütunu bulunamadı (beklenen: {', '.join(TIME_COLUMNS)})")
+
+
+def iter_hourly_chunks(
+    path: str, chunksize: int = DEFAULT_CHUNKSIZE
+) -> Iterator[pd.DataFrame]:
+    """Ham saatlik veriyi (zaman + hedefler) parça parça okur."""
+    if Path(path).suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        pf = pq.ParquetFile(path)
+        time_col = _time_column(pf.schema_arrow.names)
+        for batch in pf.iter_batches(
+            batch_size=chunksize, columns=[time_col, *TARGET_COLUMNS]
+        ):
+            yield batch.to_pandas().rename(columns={time_col: "datetime"})
+        return
+
+    time_col = _time_column(pd.read_csv(path, nrows=0).columns)
+    reader = pd.read_csv(
+        path,
+        usecols=[time_col, *TARGET_COLUMNS],
+        dtype={c: np.float32 for c in TARGET_COLUMNS},
+        chunksize=chunksize,
+    )
+    for chunk in reader:
+        yield chunk.rename(columns={time_col: "datetime"})
+
+
+def interpolate_chunks(chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """
+    Hedeflerdeki eksikleri tüm seri boyunca doğrusal doldurur
+    (limit_area="inside"), ama parça parça: her parçanın, hedef sütunlarından
+    birinin son geçerli değerinden itibaren kalan satırları (doldurulmuş
+    halleriyle) sonraki parçaya taşınır. Böylece parça sınırına düşen
+    boşluklar da doldurulur ve sonuç `chunksize`dan bağımsız olur; seri
+    başı/sonu boşlukları tek parça okumadaki gibi eksik kalır.
+    """
+    carry: Optional[pd.DataFrame] = None
+    for chunk in chunks:
+        data = chunk if carry is None else pd.concat([carry, chunk])
+        data = data.reset_index(drop=True)
+        for col in TARGET_COLUMNS:
+            data[col] = (
+                data[col]
+                .astype(np.float32)
+                .interpolate(method="linear", limit_area="inside")
+                .astype(np.float32)
+            )
+        last = [data[col].last_valid_index() for col in TARGET_COLUMNS]
+        if any(i is None for i in last):
+            # taşınan satır varken her sütunda en az bir değer olur; yoksa
+            # bu satırlar seri başı boşluğudur ve doldurulamaz
+            yield data
+            carry = None
+            continue
+        cut = min(last)
+        yield data.iloc[:cut]
+        carry = data.iloc[cut:]
+    if carry is not None:
+        yield carry
+
+
+def prepare_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tek parça için özellik + hedef tablosu (dar tipler). Eksik hedefli
+    satırlar atılır; boşluklar önceden `interpolate_chunks` ile doldurulur.
+    """
+    times = pd.to_datetime(chunk["datetime"])
+    if times.dt.tz is not None:
+        # duvar saatini koru (özellikler yerel saat/gün üzerinden)
+        times = times.dt.tz_localize(None)
+
+    out = pd.DataFrame(date_features(times.to_numpy(), compact=True))
+    for col in TARGET_COLUMNS:
+        out[col] = chunk[col].astype(np.float32).to_numpy()
+    return out.dropna()
+
+
+def load_training_frame(
+    path: str,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    sample_frac: float = 1.0,
+    random_state: int = 42,
+    max_rows: Optional[int] = None,
+    climatology: Optional[ClimatologyAccumulator] = None,
+) -> pd.DataFrame:
+    """
+    Tüm dosyayı parça parça okuyup eğitim tablosunu kurar.
+    `sample_frac` < 1 ise her parçadan o oranda örnek alınır (çok uzun
+    seriler için bellek sınırı). `max_rows` verilirse, tüm dosya boyunca
+    düzgün dağılımlı en fazla o kadar satır tutulur; bellek dosya boyundan
+    bağımsız kalır. `climatology` verilirse örneklemeden önce her parça
+    iklim tablosuna eklenir (tablo tüm veriyi görür).
+    """
+    rng = np.random.default_rng(random_state)
+    parts = []
+    keys = []
+    chunks = interpolate_chunks(iter_hourly_chunks(path, chunksize))
+    for i, chunk in enumerate(chunks):
+        if chunk.empty:
+            continue
+        part = prepare_chunk(chunk)
+        if climatology is not None:
+            climatology.add(part)
+        if sample_frac < 1.0:
+            part = part.sample(frac=sample_frac, random_state=random_state + i)
+        parts.append(part)
+        if max_rows is not None:
+            # rezervuar örnekleme: her satıra rastgele anahtar, en küçük
+            # max_rows anahtar kalır
+            keys.append(rng.random(len(part)))
+            if sum(len(p) for p in parts) > max_rows:
+                merged = pd.concat(parts, ignore_index=True)
+                merged_keys = np.concatenate(keys)
+                keep = np.sort(np.argpartition(merged_keys, max_rows)[:max_rows])
+                parts = [merged.iloc[keep].reset_index(drop=True)]
+                keys = [merged_keys[keep]]
+    if not parts:
+        raise ValueError(f"veri yok: {path}")
+    return pd.concat(parts, ignore_index=True)
+
+
+def build_model(n_estimators: int = 100, n_jobs: int = -1, random_state: int = 42):
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.multioutput import MultiOutputRegressor
+
+    # RandomForestRegressor'ı MultiOutputRegressor ile sar
+    base_model = RandomForestRegressor(
+        n_estimators=n_estimators,
+        max_depth=20,
+        min_samples_split=5,
+        min_samples_leaf=2,
+        random_state=random_state,
+        n_jobs=n_jobs,
+    )
+    return MultiOutputRegressor(base_model)
+
+
+def fit_model(
+    df: pd.DataFrame,
+    test_size: float = 0.2,
+    random_state: int = 42,
+    n_jobs: int = -1,
+    n_estimators: int = 100,
+) -> Tuple[Any, pd.DataFrame, pd.DataFrame]:
+    """Modeli eğitir; (model, X_test, y_test) döndürür."""
+    from sklearn.model_selection import train_test_split
+
+    X = df[FEATURE_COLUMNS]
+    y = df[TARGET_COLUMNS]
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state, shuffle=True
+    )
+    model = build_model(n_estimators=n_estimators, n_jobs=n_jobs, random_state=random_state)
+    model.fit(X_train, y_train)
+    return model, X_test, y_test
+
+
+def evaluate(
+    model: Any, X_test: pd.DataFrame, y_test: pd.DataFrame
+) -> Tuple[Dict[str, Dict[str, float]], np.ndarray]:
+    """Her hedef için MSE/RMSE/MAE/R² ve test tahminleri."""
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+    y_pred = model.predict(X_test)
+    metrics: Dict[str, Dict[str, float]] = {}
+    for i, col in enumerate(TARGET_COLUMNS):
+        mse = mean_squared_error(y_test[col], y_pred[:, i])
+        metrics[col] = {
+            "mse": float(mse),
+            "rmse": float(np.sqrt(mse)),
+            "mae": float(mean_absolute_error(y_test[col], y_pred[:, i])),
+            "r2": float(r2_score(y_test[col], y_pred[:, i])),
+        }
+    return metrics, y_pred
+
+
+def save_model(
+    model: Any,
+    out: str,
+    forest: bool = False,
+    climatology: Optional[Climatology] = None,
+) -> Path:
+    import joblib
+
+    out_path = Path(out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(model, out_path)
+    if climatology is not None:
+        climatology.save(climatology_path(out_path))
+    if forest:
+        # düz, mmap'lenebilir kopya (WeatherPredictor bunu tercih eder)
+        from frontend.views.weather_predictor import export_forest
+
+        export_forest(model, out_path.with_suffix(".forest"))
+    return out_path
+
+
+def train_from_file(
+    path: str,
+    out: str,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    sample_frac: float = 1.0,
+    n_jobs: int = -1,
+    n_estimators: int = 100,
+    forest: bool = False,
+    max_rows: Optional[int] = None,
+) -> Dict[str, Dict[str, float]]:
+    clim = ClimatologyAccumulator()
+    df = load_training_frame(
+        path,
+        chunksize=chunksize,
+        sample_frac=sample_frac,
+        max_rows=max_rows,
+        climatology=clim,
+    )
+    model, X_test, y_test = fit_model(df, n_jobs=n_jobs, n_estimators=n_estimators)
+    metrics, _ = evaluate(model, X_test, y_test)
+    save_model(model, out, forest=forest, climatology=clim.finish())
+    return metrics
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Saatlik veriden hava tahmin modeli eğit")
+    ap.add_argument("data", help="saatlik CSV veya Parquet dosyası")
+    ap.add_argument("--out", default="weather_prediction_model.joblib")
+    ap.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    ap.add_argument("--sample-frac", type=float, default=1.0)
+    ap.add_argument("--max-rows", type=int, default=None)
+    ap.add_argument("--n-estimators", type=int, default=100)
+    ap.add_argument("--n-jobs", type=int, default=-1)
+    ap.add_argument("--forest", action="store_true", help=".forest dosyası da yaz")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    metrics = train_from_file(
+        args.data,
+        args.out,
+        chunksize=args.chunksize,
+        sample_frac=args.sample_frac,
+        n_jobs=args.n_jobs,
+        n_estimators=args.n_estimators,
+        forest=args.forest,
+        max_rows=args.max_rows,
+    )
+    print(f"[training] {args.out} yazıldı ({time.perf_counter() - t0:.1f} sn)")
+    for target, m in metrics.items():
+        print(
+            f"[training] {target}: RMSE={m['rmse']:.4f} MAE={m['mae']:.4f} R²={m['r2']:.4f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,40 @@
 import asyncio
+import os
 import socket
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import aiohttp
 
+from backend import metrics
+from backend.bundle import WeatherBundle
+from backend.decoding import (
+    decode_flatbuffers_bundles,
+    decode_json_bundles,
+    flatbuffers_available,
+)
+
 BASE_URL = "https://api.open-meteo.com/v1/forecast"
 
+# Tek istekte gönderilecek en fazla koordinat (URL boyu ve yanıt boyutu için)
+MAX_COORDS_PER_REQUEST = 50
+
+# İstenen seriler; FlatBuffers yanıtında değişkenler bu sırayla gelir
+HOURLY_VARIABLES = ("temperature_2m", "weathercode", "is_day")
+DAILY_VARIABLES = ("temperature_2m_min", "temperature_2m_max", "weathercode")
+# FlatBuffers'ta current_weather yok: current=... ile istenip aynı anahtarlara eşlenir
+CURRENT_VARIABLES = ("temperature_2m", "weathercode", "is_day")
+CURRENT_KEYS = ("temperature", "weathercode", "is_day")
+
+# Aynı anahtar için tamamlanan sonuç bu süre boyunca yeniden kullanılır (sn)
+FRESH_WINDOW_S = 30.0
+
+# Tek uçuş anahtarı: (lat, lon, gün, saatlik değişkenler, günlük değişkenler)
+FlightKey = Tuple[float, float, int, Tuple[str, ...], Tuple[str, ...]]
+
+# Yanıt biçimi: "auto" (çoklu konumda FlatBuffers, SDK kuruluysa), "json", "flatbuffers"
+RESPONSE_FORMATS = ("auto", "json", "flatbuffers")
+
 # Açıklama sözlüğü (kısaltılmış ama yeterli)
 WEATHER_CODES: Dict[int, str] = {
     0: "Açık",
@@ -45,74 +74,353 @@ def describe_weather(code: Optional[int]) -> str:
     return WEATHER_CODES.get(code, f"Kod {code}")
 
 
-def _build_url(lat: float, lon: float, forecast_days: int = 4) -> str:
-    # timezone=auto ile yerel saatlere göre veri; hourly ve daily alanları eklendi.
+def _build_url(
+    lat: Union[float, Sequence[float]],
+    lon: Union[float, Sequence[float]],
+    forecast_days: int = 4,
+    fmt: str = "json",
+) -> str:
+    # Open-Meteo virgülle ayrılmış koordinat listelerini de kabul eder
+    if not isinstance(lat, (int, float)):
+        lat = ",".join(str(v) for v in lat)
+    if not isinstance(lon, (int, float)):
+        lon = ",".join(str(v) for v in lon)
+    # timezone=auto ile yerel saatlere göre veri; zaman eksenleri unix saniye
+    # (+ utc_offset_seconds) olarak gelir, metin ayrıştırması gerekmez.
+    if fmt == "flatbuffers":
+        current = f"&current={','.join(CURRENT_VARIABLES)}&format=flatbuffers"
+    else:
+        current = "&current_weather=true&timeformat=unixtime"
     params = (
         f"latitude={lat}&longitude={lon}"
-        f"&current_weather=true"
-        f"&hourly=temperature_2m,weathercode,is_day"
-        f"&daily=temperature_2m_min,temperature_2m_max,weathercode"
+        f"{current}"
+        f"&hourly={','.join(HOURLY_VARIABLES)}"
+        f"&daily={','.join(DAILY_VARIABLES)}"
         f"&forecast_days={forecast_days}"
-        f"&timeformat=iso8601&timezone=auto"
+        f"&timezone=auto"
     )
     return f"{BASE_URL}?{params}"
 
 
-async def _robust_session() -> aiohttp.ClientSession:
-    connector = aiohttp.TCPConnector(family=socket.AF_INET, ssl=True)
-    timeout = aiohttp.ClientTimeout(total=12)
-    # trust_env=True ile kurumsal proxy değişkenlerini otomatik kullanır
-    return aiohttp.ClientSession(timeout=timeout, connector=connector, trust_env=True)
+def _decode_flatbuffers(raw: bytes) -> List[Optional[WeatherBundle]]:
+    return decode_flatbuffers_bundles(
+        raw, HOURLY_VARIABLES, DAILY_VARIABLES, CURRENT_KEYS
+    )
 
 
-async def fetch_weather_bundle(
-    lat: float, lon: float, forecast_days: int = 4, retries: int = 2
-) -> Optional[Dict[str, Any]]:
+class WeatherService:
     """
-    Tek istekle: current_weather + hourly + daily döndürür.
-    Dönen yapı örneği:
-    {
-      "current_weather": {...},
-      "hourly": {"time": [...], "temperature_2m": [...], "weathercode": [...], "is_day": [...]},
-      "daily":  {"time": [...], "temperature_2m_min":[...], "temperature_2m_max":[...], "weathercode":[...] }
-    }
+    Uygulama ömrü boyunca tek bir aiohttp oturumunu (ve bağlantı havuzunu)
+    paylaşan servis. Keep-alive + DNS önbelleği sayesinde her yenilemede
+    DNS/TCP/TLS kurulumu tekrar ödenmez.
+
+    Tek uçuş: aynı (konum, gün, değişkenler) anahtarı için eşzamanlı
+    istekler tek bir uçuştaki future'ı paylaşır; `fresh_window` saniye
+    içinde biten sonuç yeniden kullanılır (tepsi "Şimdi güncelle", ayar
+    menüsü, konum değişimi ve döngü art arda tetiklense de tek istek gider).
     """
-    url = _build_url(lat, lon, forecast_days=forecast_days)
-    try:
-        async with await _robust_session() as sess:
-            for attempt in range(1, retries + 2):
-                try:
-                    async with sess.get(url) as resp:
-                        if resp.status != 200:
-                            print(f"[weather_service] HTTP {resp.status}")
-                            return None
-                        data = await resp.json()
-                        # Beklediğimiz alanlar var mı?
-                        if not data.get("current_weather"):
-                            return None
-                        return {
-                            "current": data["current_weather"],
-                            "hourly": data.get("hourly", {}),
-                            "daily": data.get("daily", {}),
-                        }
-                except (
-                    aiohttp.ClientConnectorError,
-                    aiohttp.ClientConnectorDNSError,
-                    asyncio.TimeoutError,
-                ) as e:
-                    print(
-                        f"[weather_service] try {attempt}/{retries+1} failed: {type(e).__name__}"
-                    )
-                    if attempt >= retries + 1:
+
+    def __init__(
+        self,
+        total_timeout: float = 12.0,
+        limit: int = 20,
+        limit_per_host: int = 4,
+        keepalive_timeout: float = 120.0,
+        dns_cache_ttl: int = 600,
+        response_format: Optional[str] = None,
+        fresh_window: float = FRESH_WINDOW_S,
+    ):
+        self._total_timeout = total_timeout
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._dns_cache_ttl = dns_cache_ttl
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        fmt = (response_format or os.getenv("WEATHER_RESPONSE_FORMAT", "auto")).lower()
+        if fmt not in RESPONSE_FORMATS:
+            print(f"[weather_service] bilinmeyen yanıt biçimi '{fmt}', auto kullanılıyor")
+            fmt = "auto"
+        if fmt == "flatbuffers" and not flatbuffers_available():
+            print("[weather_service] openmeteo_sdk kurulu değil, JSON kullanılacak")
+            fmt = "json"
+        self._format = fmt
+        self._fresh_window = fresh_window
+        self._inflight: Dict[FlightKey, asyncio.Future] = {}
+        self._recent: Dict[FlightKey, Tuple[float, WeatherBundle]] = {}
+        self._flights: set = set()  # çalışan uçuş görevleri (GC'ye karşı referans)
+        self.stats = {"requests": 0, "coalesced": 0, "fresh_hits": 0, "upstream": 0}
+
+    def _format_for(self, n_coords: int) -> str:
+        """İstek biçimi: FlatBuffers büyük çoklu konum yanıtlarında kazandırır."""
+        if self._format == "auto":
+            return "flatbuffers" if n_coords > 1 and flatbuffers_available() else "json"
+        return self._format
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if (
+            self._session is not None
+            and not self._session.closed
+            and self._session_loop is loop
+        ):
+            return self._session
+        if self._session is not None and not self._session.closed:
+            # Farklı bir event loop'a bağlı eski oturum (ör. asyncio.run tekrarı)
+            await self._close_session()
+        connector = aiohttp.TCPConnector(
+            family=socket.AF_INET,
+            ssl=True,
+            limit=self._limit,
+            limit_per_host=self._limit_per_host,
+            use_dns_cache=True,
+            ttl_dns_cache=self._dns_cache_ttl,
+            keepalive_timeout=self._keepalive_timeout,
+        )
+        timeout = aiohttp.ClientTimeout(total=self._total_timeout)
+        # ölçüm açıksa bağlantı kurma / ilk bayt süreleri için iz
+        trace = metrics.trace_config()
+        # trust_env=True ile kurumsal proxy değişkenlerini otomatik kullanır
+        self._session = aiohttp.ClientSession(
+            timeout=timeout,
+            connector=connector,
+            trust_env=True,
+            trace_configs=[trace] if trace is not None else None,
+        )
+        self._session_loop = loop
+        return self._session
+
+    async def _close_session(self):
+        sess, self._session, self._session_loop = self._session, None, None
+        if sess is not None and not sess.closed:
+            try:
+                await sess.close()
+            except Exception as e:
+                print(f"[weather_service] session close error: {e}")
+
+    async def close(self):
+        """Bağlantı havuzunu kapatır (uygulama çıkışında çağrılmalı)."""
+        for task in list(self._flights):
+            task.cancel()
+        self._recent.clear()
+        await self._close_session()
+
+    async def _get_payload(
+        self, url: str, retries: int, decode: Callable[[bytes], Any]
+    ) -> Optional[Any]:
+        """Ham yanıt gövdesini okuyup `decode` ile çözer; hata/başarısızlıkta None."""
+        try:
+            sess = await self._get_session()
+        except Exception as e:
+            print(f"[weather_service] session create error: {e}")
+            return None
+
+        for attempt in range(1, retries + 2):
+            try:
+                async with sess.get(url) as resp:
+                    if resp.status != 200:
+                        print(f"[weather_service] HTTP {resp.status}")
+                        metrics.incr("fetch.http_errors")
                         return None
-                    await asyncio.sleep(1.5 * attempt)
-                except RuntimeError as e:
-                    print(f"[weather_service] runtime error: {e}")
+                    with metrics.span("fetch.read"):
+                        raw = await resp.read()
+                metrics.incr("fetch.bytes", len(raw))
+                with metrics.span("fetch.decode"):
+                    return decode(raw)
+            except (
+                aiohttp.ClientConnectorError,
+                aiohttp.ClientConnectorDNSError,
+                aiohttp.ServerDisconnectedError,
+                asyncio.TimeoutError,
+            ) as e:
+                print(
+                    f"[weather_service] try {attempt}/{retries+1} failed: {type(e).__name__}"
+                )
+                if attempt >= retries + 1:
+                    metrics.incr("fetch.failures")
                     return None
-    except Exception as e:
-        print(f"[weather_service] session create error: {e}")
+                metrics.incr("fetch.retries")
+                await asyncio.sleep(1.5 * attempt)
+            except RuntimeError as e:
+                print(f"[weather_service] runtime error: {e}")
+                return None
+            except Exception as e:
+                print(f"[weather_service] request error: {e}")
+                return None
         return None
 
+    @metrics.timed("fetch.bundle")
+    async def fetch_bundle(
+        self, lat: float, lon: float, forecast_days: int = 4, retries: int = 2
+    ) -> Optional[WeatherBundle]:
+        bundles = await self.fetch_bundles([(lat, lon)], forecast_days, retries)
+        return bundles[0]
+
+    # ----- Tek uçuş -----
+    @staticmethod
+    def _flight_key(lat: float, lon: float, forecast_days: int) -> FlightKey:
+        # önbellek dosya adıyla aynı hassasiyet (4 ondalık ~ 11 m)
+        return (
+            round(float(lat), 4),
+            round(float(lon), 4),
+            int(forecast_days),
+            HOURLY_VARIABLES,
+            DAILY_VARIABLES,
+        )
+
+    def _fresh(self, key: FlightKey, now: float) -> Optional[WeatherBundle]:
+        hit = self._recent.get(key)
+        if hit is None:
+            return None
+        if now - hit[0] >= self._fresh_window:
+            del self._recent[key]
+            return None
+        return hit[1]
+
+    async def _fly(
+        self,
+        items: List[Tuple[FlightKey, Tuple[float, float], asyncio.Future]],
+        forecast_days: int,
+        retries: int,
+    ):
+        """Bir parçayı tek istekle çekip her anahtarın future'ını çözer."""
+        self.stats["upstream"] += 1
+        metrics.incr("fetch.upstream")
+        bundles: List[Optional[WeatherBundle]] = [None] * len(items)
+        try:
+            bundles = await self._fetch_chunk(
+                [coord for _, coord, _ in items], forecast_days, retries
+            )
+        finally:
+            now = time.monotonic()
+            for (key, _, fut), bundle in zip(items, bundles):
+                if self._inflight.get(key) is fut:
+                    del self._inflight[key]
+                # başarısızlık saklanmaz: sonraki istek yeniden dener
+                if bundle is not None and self._fresh_window > 0:
+                    self._recent[key] = (now, bundle)
+                if not fut.done():
+                    fut.set_result(bundle)
+
+    async def fetch_bundles(
+        self,
+        coords: Sequence[Tuple[float, float]],
+        forecast_days: int = 4,
+        retries: int = 2,
+        chunk_size: int = MAX_COORDS_PER_REQUEST,
+    ) -> List[Optional[WeatherBundle]]:
+        """
+        Birden çok konumu parça başına tek istekle çeker.
+        Sonuç listesi `coords` ile aynı sırada; başarısız olanlar None.
+        Taze sonucu olan ya da zaten uçuşta olan konumlar yeniden istenmez.
+        """
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        futures: List[asyncio.Future] = []
+        todo: List[Tuple[FlightKey, Tuple[float, float], asyncio.Future]] = []
+        for lat, lon in coords:
+            self.stats["requests"] += 1
+            key = self._flight_key(lat, lon, forecast_days)
+            bundle = self._fresh(key, now)
+            if bundle is not None:
+                self.stats["fresh_hits"] += 1
+                metrics.incr("fetch.fresh_hits")
+                fut = loop.create_future()
+                fut.set_result(bundle)
+            else:
+                fut = self._inflight.get(key)
+                # başka bir event loop'tan kalan uçuş paylaşılamaz
+                if fut is not None and fut.get_loop() is loop:
+                    self.stats["coalesced"] += 1
+                    metrics.incr("fetch.coalesced")
+                else:
+                    fut = loop.create_future()
+                    self._inflight[key] = fut
+                    todo.append((key, (lat, lon), fut))
+            futures.append(fut)
+
+        for i in range(0, len(todo), chunk_size):
+            task = loop.create_task(
+                self._fly(todo[i : i + chunk_size], forecast_days, retries)
+            )
+            self._flights.add(task)
+            task.add_done_callback(self._flight_done)
+
+        # shield: bir çağıranın iptali ortak uçuşu diğerleri için iptal etmez
+        return list(await asyncio.gather(*(asyncio.shield(f) for f in futures)))
+
+    def _flight_done(self, task: asyncio.Task):
+        self._flights.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[weather_service] flight error: {task.exception()}")
+
+    async def _fetch_chunk(
+        self, chunk: Sequence[Tuple[float, float]], forecast_days: int, retries: int
+    ) -> List[Optional[WeatherBundle]]:
+        fmt = self._format_for(len(chunk))
+        url = _build_url(
+            [c[0] for c in chunk],
+            [c[1] for c in chunk],
+            forecast_days=forecast_days,
+            fmt=fmt,
+        )
+        decode = _decode_flatbuffers if fmt == "flatbuffers" else decode_json_bundles
+        bundles = await self._get_payload(url, retries, decode)
+        # Tek koordinatta nesne, çoklu koordinatta liste döner (ikisi de listeye çevrilir)
+        if not isinstance(bundles, list) or len(bundles) != len(chunk):
+            if bundles is not None:
+                print("[weather_service] unexpected multi-location response")
+            return [None] * len(chunk)
+        return bundles
+
+
+_service: Optional[WeatherService] = None
+
+
+def get_service() -> WeatherService:
+    """Süreç genelinde paylaşılan WeatherService örneği."""
+    global _service
+    if _service is None:
+        _service = WeatherService()
+    return _service
+
+
+async def close_service():
+    """Paylaşılan servisin oturumunu kapatır (app.py çıkışında)."""
+    global _service
+    if _service is not None:
+        await _service.close()
+        _service = None
+
+
+async def fetch_weather_bundle(
+    lat: float, lon: float, forecast_days: int = 4, retries: int = 2
+) -> Optional[WeatherBundle]:
+    """
+    Tek istekle: current_weather + hourly + daily döndürür.
+    Paylaşılan WeatherService oturumunu kullanan ince sarmalayıcı.
+    Dönen WeatherBundle sözlük gibi de okunur:
+      bundle["current"]  -> {...}
+      bundle["hourly"]   -> time (datetime64[m]), temperature_2m (float32),
+                            weathercode / is_day (int16)
+      bundle["daily"]    -> time (datetime64[D]), temperature_2m_min/max, weathercode
+    """
+    return await get_service().fetch_bundle(
+        lat, lon, forecast_days=forecast_days, retries=retries
+    )
+
+
+async def fetch_weather_bundles(
+    coords: List[Tuple[float, float]], forecast_days: int = 4, retries: int = 2
+) -> List[Optional[WeatherBundle]]:
+    """
+    Çoklu konum: her (lat, lon) için bir bundle, girişle aynı sırada.
+    Büyük listeler MAX_COORDS_PER_REQUEST'lik parçalara bölünür.
+    """
+    return await get_service().fetch_bundles(
+        coords, forecast_days=forecast_days, retries=retries
+    )
+
 
 # Eski API ile geriye dönük uyumluluk isteyen kısımlar varsa:
 async def fetch_current_weather(lat: float, lon: float) -> Optional[dict]:
@@ -0,0 +1,292 @@
+# src/daemon.py
+"""
+Arayüzsüz tahmin servisi: çekme, önbellek ve model skorlama tek süreçte.
+
+Aynı makinedeki widget'lar (app.py) ve betikler bu servise bağlanır; on
+widget ve bir CLI tek bir HTTP isteği ve bellekte istasyon başına tek
+model demektir.
+
+Uçlar:
+    GET /v1/health
+    GET /v1/bundle?lat=..&lon=..&days=5[&format=json]
+        varsayılan: WeatherBundle ikili biçimi, meta'da overlay/durum
+    GET /v1/consistency?lat=..&lon=..&time=2025-01-01T13:00
+    GET /metrics      (Prometheus metin biçimi; --metrics ile)
+    GET /v1/metrics   (aynı ölçümler JSON)
+
+/v1/health dışındaki uçlar `Authorization: Bearer <belirteç>` ister.
+Belirteç WEATHER_DAEMON_TOKEN'dan okunur, yoksa kullanıcıya özel
+`daemon.token` dosyasına (0600) üretilir; widget'lar aynı dosyayı okur.
+/v1/health, X-WeatherWidget-Nonce başlığına HMAC kanıtıyla yanıt verir.
+
+Kullanım:
+    python src/daemon.py                       # http://127.0.0.1:8787
+    python src/daemon.py --port 9000
+    python src/daemon.py --unix /tmp/weatherwidget.sock
+    python src/daemon.py --metrics
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hmac
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from aiohttp import web
+
+from backend import metrics
+from backend.bundle import WeatherBundle
+from backend.daemon_client import (
+    BUNDLE_CONTENT_TYPE,
+    DEFAULT_DAEMON_URL,
+    NONCE_HEADER,
+    PROOF_HEADER,
+    ensure_token,
+    proof,
+)
+from backend.features import wall_clock_hours
+from backend.forecast_cache import ForecastCache, get_forecast_cache
+from backend.weather_service import WeatherService, close_service, get_service
+from frontend.views.weather_predictor import (
+    WeatherPredictor,
+    resolve_model_path,
+    shutdown_inference_executors,
+)
+
+
+class ForecastDaemon:
+    """
+    Paylaşılan WeatherService (tek uçuş), ForecastCache ve model başına tek
+    WeatherPredictor. Aynı konum için eşzamanlı istekler tek çekim ve tek
+    overlay hesabı paylaşır.
+    """
+
+    def __init__(
+        self,
+        service: Optional[WeatherService] = None,
+        cache: Optional[ForecastCache] = None,
+        token: Optional[str] = None,
+    ):
+        self.token = token or ensure_token()
+        self.service = service or get_service()
+        self.cache = cache or get_forecast_cache()
+        self._predictors: Dict[Optional[str], Optional[WeatherPredictor]] = {}
+        self._model_locks: Dict[Optional[str], asyncio.Lock] = {}
+        self._bundle_locks: Dict[Tuple[float, float, int], asyncio.Lock] = {}
+        self.started_at = time.time()
+        self.stats = {"bundle_requests": 0, "consistency_requests": 0}
+
+    # ----- model -----
+    async def predictor_for(self, lat: float, lon: float) -> Optional[WeatherPredictor]:
+        """Konumun istasyon modeli; aynı model dosyası bir kez yüklenir."""
+        key = resolve_model_path(lat, lon)
+        if key in self._predictors:
+            return self._predictors[key]
+        lock = self._model_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if key not in self._predictors:
+                loop = asyncio.get_running_loop()
+                self._predictors[key] = await loop.run_in_executor(
+                    None, self._load_predictor, lat, lon
+                )
+        return self._predictors[key]
+
+    @staticmethod
+    def _load_predictor(lat: float, lon: float) -> Optional[WeatherPredictor]:
+        try:
+            predictor = WeatherPredictor.for_location(lat, lon)
+            if getattr(predictor, "model", None) is not None:
+                return predictor
+            print("[daemon] model yüklenemedi (model=None)")
+        except Exception as e:
+            print(f"[daemon] model init failed: {e}")
+        return None
+
+    # ----- bundle -----
+    @metrics.timed("daemon.bundle")
+    async def bundle(
+        self, lat: float, lon: float, days: int
+    ) -> Tuple[Optional[WeatherBundle], Dict[str, Any]]:
+        """(bundle, meta); bundle.overlay servis modelinin katmanıdır."""
+        self.stats["bundle_requests"] += 1
+        lock = self._bundle_locks.setdefault(
+            (round(lat, 4), round(lon, 4), days), asyncio.Lock()
+        )
+        async with lock:
+            status = "fresh"
+            bundle = self.cache.get(lat, lon, days)
+            if bundle is None:
+                fetched = await self.service.fetch_bundle(lat, lon, forecast_days=days)
+                if fetched is not None:
+                    self.cache.put(lat, lon, days, fetched)
+                    bundle = self.cache.get(lat, lon, days)
+                else:
+                    status = "stale"
+                    bundle = self.cache.get(lat, lon, days, allow_stale=True)
+            if bundle is None:
+                # son çare: sadece current (widget'ın eski davranışı)
+                fetched = await self.service.fetch_bundle(lat, lon, forecast_days=2)
+                if fetched is None:
+                    return None, {"status": "offline"}
+                bundle, status = WeatherBundle(fetched.current), "current"
+
+            predictor = await self.predictor_for(lat, lon)
+            overlay = bundle.overlay
+            if predictor is not None and status != "current" and (
+                not overlay or overlay.get("model") != predictor.fingerprint
+            ):
+                # önbellekteki bundle nesnesine eklenir: sonraki istemciler yeniden hesaplamaz
+                overlay = await predictor.aoverlay(bundle)
+                if overlay is not None:
+                    bundle.overlay = overlay
+
+        meta = {
+            "status": status,
+            "expires_at": self.cache.expires_at(lat, lon, days),
+            "model": predictor.fingerprint if predictor is not None else None,
+        }
+        return bundle, meta
+
+    async def consistency(self, lat: float, lon: float, when: datetime) -> Dict[str, Any]:
+        self.stats["consistency_requests"] += 1
+        predictor = await self.predictor_for(lat, lon)
+        if predictor is None:
+            return {"model": None}
+        # saat dilimli `when` duvar saatine göre tahmin edilir
+        rec = await predictor.apredict_array(wall_clock_hours([when]))
+        out: Dict[str, Any] = {
+            "model": predictor.fingerprint,
+            "climatology": predictor.climatology_at(when),
+        }
+        if rec is not None and rec.size:
+            for name in rec.dtype.names:
+                value = float(rec[name][0])
+                if not np.isnan(value):
+                    out[name] = value
+        return out
+
+    # ----- HTTP -----
+    @staticmethod
+    def _coords(request: web.Request) -> Tuple[float, float]:
+        try:
+            return float(request.query["lat"]), float(request.query["lon"])
+        except (KeyError, ValueError):
+            raise web.HTTPBadRequest(text="lat ve lon gerekli")
+
+    def _authorized(self, request: web.Request) -> bool:
+        got = request.headers.get("Authorization", "")
+        return hmac.compare_digest(got, f"Bearer {self.token}")
+
+    @web.middleware
+    async def _auth(self, request: web.Request, handler) -> web.StreamResponse:
+        if request.path != "/v1/health" and not self._authorized(request):
+            raise web.HTTPUnauthorized(text="geçerli belirteç gerekli")
+        return await handler(request)
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        body: Dict[str, Any] = {"status": "ok"}
+        if self._authorized(request):
+            body.update(
+                uptime=round(time.time() - self.started_at, 1),
+                models=sorted(str(k) for k in self._predictors),
+                stats=self.stats,
+                service=self.service.stats,
+            )
+        headers = {}
+        nonce = request.headers.get(NONCE_HEADER)
+        if nonce:
+            headers[PROOF_HEADER] = proof(self.token, nonce)
+        return web.json_response(body, headers=headers)
+
+    async def handle_bundle(self, request: web.Request) -> web.Response:
+        lat, lon = self._coords(request)
+        try:
+            days = int(request.query.get("days", 5))
+        except ValueError:
+            raise web.HTTPBadRequest(text="days tamsayı olmalı")
+        bundle, meta = await self.bundle(lat, lon, days)
+        if bundle is None:
+            raise web.HTTPServiceUnavailable(text="veri alınamadı")
+        if request.query.get("format") == "json":
+            return web.json_response({"meta": meta, "bundle": bundle.to_dict()})
+        meta["overlay"] = bundle.overlay
+        return web.Response(body=bundle.to_bytes(meta), content_type=BUNDLE_CONTENT_TYPE)
+
+    async def handle_consistency(self, request: web.Request) -> web.Response:
+        lat, lon = self._coords(request)
+        try:
+            when = datetime.fromisoformat(request.query["time"])
+        except (KeyError, ValueError):
+            raise web.HTTPBadRequest(text="time (ISO 8601) gerekli")
+        return web.json_response(await self.consistency(lat, lon, when))
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            text=metrics.to_prometheus(), content_type="text/plain", charset="utf-8"
+        )
+
+    async def handle_metrics_json(self, request: web.Request) -> web.Response:
+        return web.json_response(metrics.snapshot())
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._auth])
+        app.router.add_get("/v1/health", self.handle_health)
+        app.router.add_get("/v1/bundle", self.handle_bundle)
+        app.router.add_get("/v1/consistency", self.handle_consistency)
+        app.router.add_get("/metrics", self.handle_metrics)
+        app.router.add_get("/v1/metrics", self.handle_metrics_json)
+        return app
+
+
+async def serve(
+    host: str = "127.0.0.1", port: int = 8787, unix_path: Optional[str] = None
+) -> web.AppRunner:
+    daemon = ForecastDaemon()
+    runner = web.AppRunner(daemon.make_app())
+    await runner.setup()
+    if unix_path:
+        site: web.BaseSite = web.UnixSite(runner, unix_path)
+    else:
+        site = web.TCPSite(runner, host, port)
+    await site.start()
+    if unix_path:
+        # yalnızca aynı kullanıcı bağlanabilsin
+        os.chmod(unix_path, 0o600)
+    print(f"[daemon] dinleniyor: {unix_path or f'http://{host}:{port}'}")
+    return runner
+
+
+async def run_forever(host: str, port: int, unix_path: Optional[str]):
+    runner = await serve(host, port, unix_path)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        await close_service()
+        shutdown_inference_executors(wait=False)
+
+
+def main(argv=None) -> int:
+    default_port = int(DEFAULT_DAEMON_URL.rsplit(":", 1)[1])
+    ap = argparse.ArgumentParser(description="WeatherWidget yerel tahmin servisi")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=default_port)
+    ap.add_argument("--unix", default=None, help="TCP yerine bu Unix soketini dinle")
+    ap.add_argument("--metrics", action="store_true", help="ölçümleri aç (/metrics)")
+    args = ap.parse_args(argv)
+    if args.metrics:
+        metrics.enable()
+    try:
+        asyncio.run(run_forever(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import sys
 from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -25,6 +25,12 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from backend.cities import load_city_db
+from backend.daemon_client import DaemonClient
+from backend.forecast_cache import get_forecast_cache
+from backend.scheduler import RefreshScheduler
+from backend import metrics
+from backend.bundle import WeatherBundle, time_axes, value_at
 from backend.weather_service import (
     describe_weather,
     fetch_current_weather,
@@ -50,32 +56,18 @@ FIGMA_DIR = resource_path("assets", "figma")  # figma assets klasörü assets al
 
 
 # ✅ Doğru import: dosya adı weather_predictor.py olmalı
-from .weather_predictor import WeatherPredictor
+from .weather_predictor import WeatherPredictor, resolve_model_path
 
 # -------- Assets & city DB --------
 ASSETS_DIR = (Path(__file__).resolve().parent.parent / "assets").resolve()
 FIGMA_DIR = ASSETS_DIR / "figma"
 
-
-def load_city_db() -> Dict[str, Dict[str, Tuple[float, float]]]:
-    path = ASSETS_DIR / "cities.json"
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-        fixed = {
-            country: {
-                city: (float(lat), float(lon)) for city, (lat, lon) in cities.items()
-            }
-            for country, cities in data.items()
-        }
-        return fixed
-    except Exception as e:
-        print("[WARN] cities.json okunamadı:", e)
-        return {"Türkiye": {"Karabük": (41.2040, 32.6260)}}
-
-
-CITY_DB: Dict[str, Dict[str, Tuple[float, float]]] = load_city_db()
+CITY_DB: Dict[str, Dict[str, Tuple[float, float]]] = load_city_db(
+    ASSETS_DIR / "cities.json"
+)
 
 
+@lru_cache(maxsize=None)
 def pick_icon_path(code: Optional[int], is_day: int) -> Path:
     if code is None:
         return FIGMA_DIR / "cloudy.png"
@@ -94,6 +86,33 @@ def pick_icon_path(code: Optional[int], is_day: int) -> Path:
     return FIGMA_DIR / "cloudy.png"
 
 
+# (ikon dosyası, piksel boyu, device pixel ratio, tema) -> ölçeklenmiş QPixmap.
+# Her asset süreç boyunca bir kez çözülüp ölçeklenir; boyut/tema değişince temizlenir.
+_ICON_CACHE: Dict[Tuple[str, int, float, str], QPixmap] = {}
+
+
+def icon_pixmap(
+    path: Path, size: int, dpr: float = 1.0, theme: str = ""
+) -> Optional[QPixmap]:
+    key = (str(path), size, dpr, theme)
+    pix = _ICON_CACHE.get(key)
+    if pix is None:
+        if path.exists():
+            px = max(1, int(round(size * dpr)))
+            pix = QPixmap(str(path)).scaled(
+                px, px, Qt.KeepAspectRatio, Qt.SmoothTransformation
+            )
+            pix.setDevicePixelRatio(dpr)
+        else:
+            pix = QPixmap()  # eksik dosya da önbelleğe alınır (tekrar stat yok)
+        _ICON_CACHE[key] = pix
+    return None if pix.isNull() else pix
+
+
+def clear_icon_cache():
+    _ICON_CACHE.clear()
+
+
 # Türkçe kısa gün adları (Mon=0)
 TR_WD = ["Pzt", "Sal", "Çar", "Per", "Cum", "Cmt", "Paz"]
 
@@ -160,28 +179,40 @@ class LocationDialog(QDialog):
 
 # -------- MainWidget --------
 class MainWidget(QWidget):
-    def __init__(self):
+    # Büyük (saatlik) görünümdeki sütun sayısı
+    HOUR_SLOTS = 8
+    # Boyuta göre satır aralığı alan dikey sayfalar; saatlik sayfa yatay
+    # sütun dizisidir ve kendi sabit sütun aralığını (6) korur
+    STACKED_PAGES = ("small", "medium", "message")
+    # Open-Meteo'dan istenen gün sayısı (önbellek anahtarının parçası)
+    FORECAST_DAYS = 5
+
+    def __init__(self, client: Optional[DaemonClient] = None):
         super().__init__()
+        # Yerel servis (src/daemon.py) varsa ince istemci: çekme, önbellek
+        # ve model serviste; widget yalnızca çizer.
+        self._client = client
+        self._remote_expires_at: Optional[float] = None
         self._drag_pos = QPoint()
         self._drag_active = False
         self._fetch_lock = asyncio.Lock()
-        self._last_bundle: Optional[Dict[str, Any]] = None
+        # yenileme zamanı: model güncelleme saatine göre, çevrimdışıyken geri çekilmeli
+        self._scheduler = RefreshScheduler()
+        self._loop_running = False
+        self._last_bundle: Optional[WeatherBundle] = None
+        self._pages: Dict[str, QFrame] = {}
 
         self.settings = QSettings("YourOrg", "WeatherWidget")
-        self._cache_key = "last_bundle_json"
+        self._forecast_cache = get_forecast_cache()
+        # eski sürümün QSettings içindeki tek-anahtarlı JSON önbelleği
+        self.settings.remove("last_bundle_json")
 
-        # ✨ MODEL: yükle (model dosyası bu dosyayla aynı klasörde veya otomatik bulunur)
+        # ✨ MODEL: ilk tutarlılık hesabında arka planda yüklenir; pencere
+        # pandas/sklearn/joblib yüklenmeden açılır
         self.predictor: Optional[WeatherPredictor] = None
-        try:
-            # WeatherPredictor içi otomatik yol buluyor; None geçilebilir
-            tmp = WeatherPredictor(None)
-            if getattr(tmp, "model", None) is not None:
-                self.predictor = tmp
-            else:
-                print("[consistency] Model yüklenemedi (model=None).")
-        except Exception as e:
-            print("[consistency] model init failed:", e)
-            self.predictor = None
+        self._model_loading = False
+        self._model_requested = False
+        self._model_key: Optional[str] = None
 
         self.setWindowFlags(
             Qt.FramelessWindowHint | Qt.Tool | Qt.WindowStaysOnBottomHint
@@ -245,10 +276,8 @@ class MainWidget(QWidget):
         tip = "Modelimizin hava durumu tahminine yönelik hesapladığı tutarlılık puanı"
         self.consistency_icon.setToolTip(tip)
 
-        if ai_png.exists():
-            pix = QPixmap(str(ai_png)).scaled(
-                14, 14, Qt.KeepAspectRatio, Qt.SmoothTransformation
-            )
+        pix = icon_pixmap(ai_png, 14, self.devicePixelRatioF())
+        if pix is not None:
             self.consistency_icon.setPixmap(pix)
         else:
             self.consistency_icon.setText("🤖")
@@ -272,6 +301,54 @@ class MainWidget(QWidget):
 
         self._lat, self._lon = self.resolve_coords(country, city)
 
+    # ----- Model (arka plan yükleme) -----
+    @staticmethod
+    def _load_predictor(lat: float, lon: float) -> Optional[WeatherPredictor]:
+        try:
+            # konuma en yakın istasyon modeli; kayıt yoksa varsayılan model
+            tmp = WeatherPredictor.for_location(lat, lon)
+            if getattr(tmp, "model", None) is not None:
+                return tmp
+            print("[consistency] Model yüklenemedi (model=None).")
+        except Exception as e:
+            print("[consistency] model init failed:", e)
+        return None
+
+    def _start_model_load(self):
+        if self._client is not None:
+            # model serviste; bu süreçte yüklenmez
+            self._model_key = None
+            return
+        self._model_requested = True
+        self._model_key = resolve_model_path(self._lat, self._lon)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # event loop yoksa (ör. testler) eski davranış: senkron yükle
+            self.predictor = self._load_predictor(self._lat, self._lon)
+            return
+        task = getattr(self, "_model_task", None)
+        if task is not None and not task.done():
+            # konum yükleme bitmeden değişti: eski sonucu bekleme
+            task.cancel()
+        self._model_loading = True
+        if self.predictor is None:
+            self.consistency_label.setText("Model yükleniyor…")
+            self.consistency_label.setToolTip("Tahmin modeli arka planda yükleniyor.")
+        self._model_task = loop.create_task(self._load_model_async(self._lat, self._lon))
+
+    async def _load_model_async(self, lat: float, lon: float):
+        loop = asyncio.get_running_loop()
+        try:
+            self.predictor = await loop.run_in_executor(
+                None, self._load_predictor, lat, lon
+            )
+        finally:
+            if self._model_task is asyncio.current_task():
+                self._model_loading = False
+        # model hazır: tutarlılığı ve model katmanını elimizdeki veriyle hemen hesapla
+        await self._update_consistency_from_bundle()
+
     # ----- Drag -----
     def eventFilter(self, obj, event):
         if obj.objectName() == "header":
@@ -298,6 +375,16 @@ class MainWidget(QWidget):
                 return True
         return super().eventFilter(obj, event)
 
+    # ----- Görünürlük -----
+    # Gizliyken yenileme seyrekleşir; yeniden görününce hemen tazelenir.
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._scheduler.set_hidden(False)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._scheduler.set_hidden(True)
+
     # ----- Menu -----
     def open_settings_menu(self):
         menu = QMenu(self)
@@ -367,14 +454,19 @@ class MainWidget(QWidget):
         self.setFixedSize(w, h)
         self.card.setProperty("sizeVariant", variant)
         self.content_layout.setSpacing(spacing)
+        for variant, page in self._pages.items():
+            if variant in self.STACKED_PAGES:
+                page.layout().setSpacing(spacing)
         for wgt in [self.card, self]:
             wgt.style().unpolish(wgt)
             wgt.style().polish(wgt)
         self.settings.setValue("size", key)
-        self.render_content()  # tam temiz çiz
+        clear_icon_cache()
+        self.render_content()  # yalnızca değişen ikon/metin güncellenir
 
     def apply_theme(self, key: str):
         self.settings.setValue("theme", key)
+        clear_icon_cache()
         app = QApplication.instance()
         if hasattr(app, "load_styles"):
             app.load_styles(key)
@@ -420,215 +512,401 @@ class MainWidget(QWidget):
     def resolve_coords(self, country: str, city: str) -> Tuple[float, float]:
         return CITY_DB.get(country, {}).get(city, (41.0082, 28.9784))
 
+    async def aclose(self):
+        """Servis istemcisinin bağlantısını kapatır (uygulama çıkışında)."""
+        if self._client is not None:
+            await self._client.close()
+
     # ----- Loop & update -----
-    async def start_weather_loop(self, interval_minutes: int = 5):
-        while True:
-            try:
-                await self.update_weather_once()
-            except Exception as e:
-                print("[weather loop] error:", e)
-            await asyncio.sleep(interval_minutes * 60)
+    async def start_weather_loop(self):
+        """
+        Sabit aralık yerine RefreshScheduler'ın hesapladığı anda yeniler:
+        önbellek bitişi (model güncellemesi) + sapma, çevrimdışıyken geri
+        çekilme; konum değişimi ve yeniden görünme döngüyü hemen uyandırır.
+        """
+        self._loop_running = True
+        try:
+            while True:
+                await self._scheduler.sleep(
+                    self._scheduler.next_delay(self._expires_at())
+                )
+                try:
+                    await self.update_weather_once()
+                except Exception as e:
+                    print("[weather loop] error:", e)
+                    self._scheduler.record(False)
+        finally:
+            self._loop_running = False
+
+    def _expires_at(self) -> Optional[float]:
+        """Gösterilen verinin tazelik bitişi (epoch sn); bilinmiyorsa None."""
+        if self._client is not None:
+            return self._remote_expires_at
+        lat, lon = getattr(self, "_lat", None), getattr(self, "_lon", None)
+        if lat is None or lon is None:
+            return None
+        return self._forecast_cache.expires_at(lat, lon, self.FORECAST_DAYS)
 
-    async def update_weather_once(self):
+    async def update_weather_once(self) -> bool:
+        """Veriyi tazeler; taze veri (önbellek ya da ağ) gösterildiyse True."""
         async with self._fetch_lock:
             lat, lon = getattr(self, "_lat", None), getattr(self, "_lon", None)
             if lat is None or lon is None:
-                return
-            bundle = await fetch_weather_bundle(lat, lon, forecast_days=5)
-            if not bundle:
-                # offline cache
-                cached = self._load_cache()
-                if cached:
-                    print("[weather] using cached bundle")
-                    self._last_bundle = cached
-                    self._update_consistency_from_bundle()
-                    self.render_content()
-                    return
-                # son çare: sadece current
-                current = await fetch_current_weather(lat, lon)
-                if not current:
-                    self._last_bundle = None
-                    self._clear_layout_recursive(self.content_layout)
-                    self.content_layout.addWidget(
-                        self._make_label("Bağlantı yok", "condition")
-                    )
-                    self.consistency_label.setText("—")
-                    self.consistency_label.setToolTip(
-                        "Model tutarlılığı hesaplanamadı."
-                    )
-                    return
-                bundle = {"current": current, "hourly": {}, "daily": {}}
-            self._last_bundle = bundle
-            self._save_cache(bundle)
-            self._update_consistency_from_bundle()
+                return False
+            if self._client is not None:
+                ok = await self._refresh_remote(lat, lon)
+            else:
+                ok = await self._refresh(lat, lon)
+            self._scheduler.record(ok)
+            return ok
+
+    async def _refresh(self, lat: float, lon: float) -> bool:
+        # taze önbellek varsa HTTP'ye hiç gitme
+        cached = self._load_cache(lat, lon)
+        if cached:
+            self._last_bundle = cached
             self.render_content()
+            await self._update_consistency_from_bundle()
+            return True
+        bundle = await fetch_weather_bundle(lat, lon, forecast_days=self.FORECAST_DAYS)
+        if not bundle:
+            # offline cache (bayat da olsa)
+            cached = self._load_cache(lat, lon, allow_stale=True)
+            if cached:
+                print("[weather] using cached bundle")
+                self._last_bundle = cached
+                self.render_content()
+                await self._update_consistency_from_bundle()
+                return False
+            # son çare: sadece current
+            current = await fetch_current_weather(lat, lon)
+            if not current:
+                self._last_bundle = None
+                self._show_message("Bağlantı yok")
+                self.consistency_label.setText("—")
+                self.consistency_label.setToolTip("Model tutarlılığı hesaplanamadı.")
+                return False
+            self._last_bundle = WeatherBundle(current)
+            self.render_content()
+            await self._update_consistency_from_bundle()
+            return False
+        self._save_cache(lat, lon, bundle)
+        self._last_bundle = bundle
+        self.render_content()
+        await self._update_consistency_from_bundle()
+        return True
+
+    async def _refresh_remote(self, lat: float, lon: float) -> bool:
+        got = await self._client.fetch_bundle(lat, lon, self.FORECAST_DAYS)
+        if got is None:
+            # servis yanıt vermedi: elde veri varsa göstermeye devam et
+            if self._last_bundle is None:
+                self._show_message("Bağlantı yok")
+                self.consistency_label.setText("—")
+                self.consistency_label.setToolTip("Model tutarlılığı hesaplanamadı.")
+            return False
+        bundle, meta = got
+        self._remote_expires_at = meta.get("expires_at")
+        self._last_bundle = bundle
+        self.render_content()
+        await self._update_consistency_from_bundle()
+        return meta.get("status") == "fresh"
 
     # ----- Cache helpers -----
-    def _save_cache(self, bundle: Dict[str, Any]):
-        try:
-            s = QSettings("YourOrg", "WeatherWidget")
-            s.setValue(self._cache_key, json.dumps(bundle))
-        except Exception:
-            pass
+    def _save_cache(self, lat: float, lon: float, bundle: WeatherBundle):
+        self._forecast_cache.put(lat, lon, self.FORECAST_DAYS, bundle)
+
+    def _load_cache(
+        self, lat: float, lon: float, allow_stale: bool = False
+    ) -> Optional[WeatherBundle]:
+        return self._forecast_cache.get(
+            lat, lon, self.FORECAST_DAYS, allow_stale=allow_stale
+        )
 
-    def _load_cache(self) -> Optional[Dict[str, Any]]:
-        try:
-            s = QSettings("YourOrg", "WeatherWidget")
-            raw = s.value(self._cache_key)
-            if raw:
-                return json.loads(raw)
-        except Exception:
-            return None
-        return None
+    # ----- Rendering (kalıcı widget havuzları) -----
+    # Her boyut varyantı için sayfa bir kez kurulur; yenilemede yalnızca
+    # değişen metin/pixmap güncellenir (yıkıp yeniden kurma yok).
+    def _page(self, variant: str) -> QFrame:
+        page = self._pages.get(variant)
+        if page is None:
+            builders = {
+                "small": self._build_small_page,
+                "medium": self._build_five_day_page,
+                "large": self._build_hours_page,
+                "message": self._build_message_page,
+            }
+            page = builders[variant]()
+            # sonradan kurulan dikey sayfa da geçerli boyutun aralığını alır
+            if variant in self.STACKED_PAGES:
+                page.layout().setSpacing(self.content_layout.spacing())
+            page.setVisible(False)
+            self._pages[variant] = page
+            self.content_layout.addWidget(page)
+        return page
+
+    def _show_page(self, variant: str) -> QFrame:
+        page = self._page(variant)
+        for p in self._pages.values():
+            if p is not page and p.isVisibleTo(self.content_frame):
+                p.setVisible(False)
+        if not page.isVisibleTo(self.content_frame):
+            page.setVisible(True)
+        return page
+
+    def _show_message(self, text: str):
+        self._show_page("message")
+        self._set_text(self._message_label, text)
+
+    @staticmethod
+    def _set_text(lbl: QLabel, text: str):
+        if lbl.text() != text:
+            lbl.setText(text)
+
+    @staticmethod
+    def _set_tooltip(w: QWidget, text: str):
+        if w.toolTip() != text:
+            w.setToolTip(text)
+
+    @staticmethod
+    def _overlay_value(overlay: Optional[Dict[str, Any]], key: str, i: int) -> Any:
+        return value_at((overlay or {}).get(key), i)
+
+    @staticmethod
+    def _set_visible(w: QWidget, visible: bool):
+        if w.isVisibleTo(w.parentWidget()) != visible:
+            w.setVisible(visible)
+
+    def _set_icon(self, lbl: QLabel, icon_path: Optional[Path]):
+        size = self._icon_px_for_variant()
+        dpr = self.devicePixelRatioF()
+        theme = str(self.settings.value("theme", "dark"))
+        key = f"{icon_path}|{size}|{dpr}|{theme}" if icon_path is not None else ""
+        if lbl.property("iconKey") == key:
+            return
+        lbl.setProperty("iconKey", key)
+        pix = icon_pixmap(icon_path, size, dpr, theme) if icon_path is not None else None
+        if pix is not None:
+            lbl.setPixmap(pix)
+        else:
+            lbl.clear()
 
-    # ----- Layout clear (derin) -----
-    def _clear_layout_recursive(self, layout):
-        while layout.count():
-            item = layout.takeAt(0)
-            w = item.widget()
-            ch = item.layout()
-            if w is not None:
-                w.setParent(None)
-                w.deleteLater()
-            if ch is not None:
-                self._clear_layout_recursive(ch)
-
-    # ----- Rendering -----
-    def render_content(self):
-        self._clear_layout_recursive(self.content_layout)
+    def _build_small_page(self) -> QFrame:
+        page = QFrame(self.content_frame)
+        col = QVBoxLayout(page)
+        col.setContentsMargins(0, 0, 0, 0)
+        col.setSpacing(self.content_layout.spacing())
 
+        row = QHBoxLayout()
+        row.setContentsMargins(0, 0, 0, 0)
+        row.setSpacing(6)
+        self._small_icon = self._make_label("", "weatherIcon", page)
+        self._small_temp = self._make_label("— °C", "tempValue", page)
+        row.addWidget(self._small_icon)
+        row.addWidget(self._small_temp)
+        row.addStretch(1)
+        col.addLayout(row)
+
+        self._small_cond = self._make_label("—", "condition", page)
+        self._small_low = self._make_label("", None, page)
+        col.addWidget(self._small_cond)
+        col.addWidget(self._small_low)
+        return page
+
+    def _build_five_day_page(self) -> QFrame:
+        page = QFrame(self.content_frame)
+        col = QVBoxLayout(page)
+        col.setContentsMargins(0, 0, 0, 0)
+        col.setSpacing(self.content_layout.spacing())
+
+        self._day_rows: List[Tuple[QWidget, QLabel, QLabel, QLabel, QLabel]] = []
+        for _ in range(5):
+            # tek satır: [ikon] [başlık] [max/min°] [model uyumu]
+            row_w = QWidget(page)
+            row = QHBoxLayout(row_w)
+            row.setContentsMargins(0, 0, 0, 0)
+            row.setSpacing(6)
+            icon_lbl = self._make_label("", "weatherIcon", row_w)
+            title_lbl = self._make_label("—", None, row_w)
+            mm_lbl = self._make_label("—", None, row_w)
+            model_lbl = self._make_label("", "overlay", row_w)
+            model_lbl.setVisible(False)
+            row.addWidget(icon_lbl)
+            row.addWidget(title_lbl)
+            row.addStretch(1)
+            row.addWidget(mm_lbl)
+            row.addWidget(model_lbl)
+            col.addWidget(row_w)
+            self._day_rows.append((row_w, icon_lbl, title_lbl, mm_lbl, model_lbl))
+        col.addStretch(1)
+        return page
+
+    def _build_hours_page(self) -> QFrame:
+        page = QFrame(self.content_frame)
+        row = QHBoxLayout(page)
+        row.setContentsMargins(0, 0, 0, 0)
+        row.setSpacing(6)
+
+        self._hour_cols: List[Tuple[QWidget, QLabel, QLabel, QLabel, QLabel]] = []
+        for _ in range(self.HOUR_SLOTS):
+            col_w = QWidget(page)
+            col = QVBoxLayout(col_w)
+            col.setContentsMargins(0, 0, 0, 0)
+            col.setSpacing(0)
+            t_label = self._make_label("—", None, col_w)
+            icon_lbl = self._make_label("", "weatherIcon", col_w)
+            temp_lbl = self._make_label("—", None, col_w)
+            model_lbl = self._make_label("", "overlay", col_w)
+            for lbl in (t_label, icon_lbl, temp_lbl, model_lbl):
+                lbl.setAlignment(Qt.AlignHCenter)
+                col.addWidget(lbl)
+            model_lbl.setVisible(False)
+            row.addWidget(col_w)
+            self._hour_cols.append((col_w, t_label, icon_lbl, temp_lbl, model_lbl))
+        return page
+
+    def _build_message_page(self) -> QFrame:
+        page = QFrame(self.content_frame)
+        col = QVBoxLayout(page)
+        col.setContentsMargins(0, 0, 0, 0)
+        self._message_label = self._make_label("", "condition", page)
+        col.addWidget(self._message_label)
+        return page
+
+    @metrics.timed("ui.render")
+    def render_content(self):
         v = self.card.property("sizeVariant") or "small"
         if not self._last_bundle:
-            self.content_layout.addWidget(self._make_label("— °C", "tempValue"))
-            self.content_layout.addWidget(self._make_label("—", "condition"))
+            # yer tutucu: "— °C" / "—"
+            self._show_page("small")
+            self._set_icon(self._small_icon, None)
+            self._set_visible(self._small_icon, False)
+            self._set_text(self._small_temp, "— °C")
+            self._set_text(self._small_cond, "—")
+            self._set_visible(self._small_low, False)
             return
 
         current = self._last_bundle.get("current", {})
         hourly = self._last_bundle.get("hourly", {})
         daily = self._last_bundle.get("daily", {})
 
+        overlay = self._last_bundle.get("overlay") or {}
+        # zaman eksenleri bundle geldiğinde bir kez ayrıştırılır (datetime64)
+        axes = time_axes(self._last_bundle)
+
         if v == "small":
             self._render_small(current, daily)
         elif v == "medium":
-            self._render_five_day_vertical(daily)
+            self._render_five_day_vertical(daily, axes["daily"], overlay.get("daily"))
         else:
             # "şu andan itibaren" hizalı saatlik görünüm
-            self._render_next_hours(hourly, start_from_now=True, step_hours=3, slots=8)
+            self._render_next_hours(
+                hourly,
+                axes["hourly"],
+                start_from_now=True,
+                step_hours=3,
+                slots=self.HOUR_SLOTS,
+                overlay=overlay.get("hourly"),
+            )
 
     def _render_small(self, current: Dict[str, Any], daily: Dict[str, Any]):
         cur_temp = current.get("temperature")
         cur_code = current.get("weathercode")
         cur_is_day = int(current.get("is_day", 1))
-        icon_path = pick_icon_path(cur_code, cur_is_day)
-
-        row = QHBoxLayout()
-        row.setContentsMargins(0, 0, 0, 0)
-        row.setSpacing(6)
-        icon_lbl = QLabel(self.content_frame)
-        icon_lbl.setObjectName("weatherIcon")
-        if icon_path.exists():
-            size = self._icon_px_for_variant()
-            icon_lbl.setPixmap(
-                QPixmap(str(icon_path)).scaled(
-                    size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation
-                )
-            )
-        row.addWidget(icon_lbl)
 
-        temp_lbl = self._make_label(
+        self._show_page("small")
+        self._set_visible(self._small_icon, True)
+        self._set_icon(self._small_icon, pick_icon_path(cur_code, cur_is_day))
+        self._set_text(
+            self._small_temp,
             f"{int(round(cur_temp))} °C" if cur_temp is not None else "— °C",
-            "tempValue",
-        )
-        row.addWidget(temp_lbl)
-        row.addStretch(1)
-        self.content_layout.addLayout(row)
-        self.content_layout.addWidget(
-            self._make_label(describe_weather(cur_code), "condition")
         )
+        self._set_text(self._small_cond, describe_weather(cur_code))
 
         # bugün min
-        if daily.get("temperature_2m_min"):
-            today_min = daily["temperature_2m_min"][0]
-            if today_min is not None:
-                low_lbl = QLabel(
-                    f"Bugün en düşük: {int(round(today_min))} °C", self.content_frame
-                )
-                self.content_layout.addWidget(low_lbl)
-
-    def _render_five_day_vertical(self, daily: Dict[str, Any]):
-        times: List[str] = daily.get("time", []) or []
-        mins: List[Optional[float]] = daily.get("temperature_2m_min", []) or []
-        maxs: List[Optional[float]] = daily.get("temperature_2m_max", []) or []
-        codes: List[Optional[int]] = daily.get("weathercode", []) or []
+        low_text = ""
+        today_min = value_at(daily.get("temperature_2m_min"), 0)
+        if today_min is not None:
+            low_text = f"Bugün en düşük: {int(round(today_min))} °C"
+        self._set_text(self._small_low, low_text)
+        self._set_visible(self._small_low, bool(low_text))
+
+    def _render_five_day_vertical(
+        self,
+        daily: Dict[str, Any],
+        days: np.ndarray,
+        overlay: Optional[Dict[str, Any]] = None,
+    ):
+        # seriler liste ya da tipli dizi olabilir; eksikler value_at ile None
+        mins = daily.get("temperature_2m_min")
+        maxs = daily.get("temperature_2m_max")
+        codes = daily.get("weathercode")
 
+        self._show_page("medium")
         # 5 güne kadar göster
-        n = min(5, len(times))
-        today_iso = date.today().isoformat()
+        n = min(5, len(days))
+        today = np.datetime64(date.today(), "D")
 
-        for i in range(n):
-            # tek satır: [ikon] [başlık] [max/min°]
-            row = QHBoxLayout()
-            row.setContentsMargins(0, 0, 0, 0)
-            row.setSpacing(6)
+        for i, (row_w, icon_lbl, title_lbl, mm_lbl, model_lbl) in enumerate(
+            self._day_rows
+        ):
+            if i >= n:
+                self._set_visible(row_w, False)
+                continue
 
-            code = codes[i] if i < len(codes) else None
-            icon = pick_icon_path(code, 1)
-            icon_lbl = QLabel(self.content_frame)
-            icon_lbl.setObjectName("weatherIcon")
-            if icon.exists():
-                size = self._icon_px_for_variant()
-                icon_lbl.setPixmap(
-                    QPixmap(str(icon)).scaled(
-                        size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation
-                    )
-                )
-            row.addWidget(icon_lbl)
+            self._set_icon(icon_lbl, pick_icon_path(value_at(codes, i), 1))
 
             # Başlık: Bugün / Yarın / Gün kısaltması
             title = "—"
-            try:
-                d = datetime.fromisoformat(times[i]).date()
-                if times[i].startswith(today_iso):
+            d = days[i]
+            if not np.isnat(d):
+                delta = int((d - today).astype(np.int64))
+                if delta == 0:
                     title = "Bugün"
-                elif (d - date.today()).days == 1:
+                elif delta == 1:
                     title = "Yarın"
                 else:
-                    title = TR_WD[d.weekday()]
-            except Exception:
-                title = "—"
-            title_lbl = QLabel(title, self.content_frame)
-            row.addWidget(title_lbl)
+                    # 1970-01-01 Perşembe (Pazartesi=0 -> 3)
+                    title = TR_WD[int((d.astype(np.int64) + 3) % 7)]
+            self._set_text(title_lbl, title)
 
-            max_str = (
-                int(round(maxs[i])) if i < len(maxs) and maxs[i] is not None else None
-            )
-            min_str = (
-                int(round(mins[i])) if i < len(mins) and mins[i] is not None else None
-            )
+            hi, lo = value_at(maxs, i), value_at(mins, i)
             combo = (
-                f"{max_str}/{min_str}°"
-                if (max_str is not None and min_str is not None)
+                f"{int(round(hi))}/{int(round(lo))}°"
+                if (hi is not None and lo is not None)
                 else "—"
             )
-            mm_lbl = QLabel(combo, self.content_frame)
-
-            row.addStretch(1)
-            row.addWidget(mm_lbl)
-
-            self.content_layout.addLayout(row)
+            self._set_text(mm_lbl, combo)
+
+            # model katmanı: uyum yüzdesi + ayrıntılar ipucunda
+            agree = self._overlay_value(overlay, "agreement", i)
+            self._set_text(model_lbl, f"%{agree}" if agree is not None else "")
+            self._set_visible(model_lbl, agree is not None)
+            tip = ""
+            if agree is not None:
+                tip = (
+                    f"Model: {self._overlay_value(overlay, 'temperature_2m_max', i)}/"
+                    f"{self._overlay_value(overlay, 'temperature_2m_min', i)}°C · "
+                    f"yağış {self._overlay_value(overlay, 'precipitation_sum', i)} mm · "
+                    f"Uyum %{agree}"
+                )
+            self._set_tooltip(row_w, tip)
+            self._set_visible(row_w, True)
 
     def _render_next_hours(
-        self, hourly: Dict[str, Any], start_from_now: bool, step_hours: int, slots: int
+        self,
+        hourly: Dict[str, Any],
+        times: np.ndarray,
+        start_from_now: bool,
+        step_hours: int,
+        slots: int,
+        overlay: Optional[Dict[str, Any]] = None,
     ):
-        times: List[str] = hourly.get("time", []) or []
-        temps: List[Optional[float]] = hourly.get("temperature_2m", []) or []
-        codes: List[Optional[int]] = hourly.get("weathercode", []) or []
-        is_day: List[int] = hourly.get("is_day", []) or []
-
-        if not times:
-            self.content_layout.addWidget(
-                self._make_label("Saatlik veri yok", "condition")
-            )
+        temps = hourly.get("temperature_2m")
+        codes = hourly.get("weathercode")
+        is_day = hourly.get("is_day")
+
+        if not len(times):
+            self._show_message("Saatlik veri yok")
             return
 
         start_idx = 0
@@ -639,70 +917,79 @@ class MainWidget(QWidget):
             range(
                 start_idx, min(len(times), start_idx + step_hours * slots), step_hours
             )
-        )
-        row = QHBoxLayout()
-        row.setContentsMargins(0, 0, 0, 0)
-        row.setSpacing(6)
-
-        for idx in idxs[:slots]:
-            col = QVBoxLayout()
-            col.setContentsMargins(0, 0, 0, 0)
-            col.setSpacing(0)
-
-            try:
-                t = datetime.fromisoformat(times[idx])
-                t_label = QLabel(t.strftime("%H:%M"), self.content_frame)
-            except Exception:
-                t_label = QLabel("—", self.content_frame)
-            t_label.setAlignment(Qt.AlignHCenter)
-            col.addWidget(t_label)
-
-            code = codes[idx] if idx < len(codes) else None
-            dayf = int(is_day[idx]) if idx < len(is_day) else 1
-            icon = pick_icon_path(code, dayf)
-            icon_lbl = QLabel(self.content_frame)
-            icon_lbl.setObjectName("weatherIcon")
-            if icon.exists():
-                size = self._icon_px_for_variant()
-                icon_lbl.setPixmap(
-                    QPixmap(str(icon)).scaled(
-                        size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation
-                    )
-                )
-            icon_lbl.setAlignment(Qt.AlignHCenter)
-            col.addWidget(icon_lbl)
-
-            temp = temps[idx] if idx < len(temps) else None
-            temp_lbl = QLabel(
-                f"{int(round(temp))}°" if temp is not None else "—", self.content_frame
+        )[:slots]
+
+        self._show_page("large")
+        for slot, (col_w, t_label, icon_lbl, temp_lbl, model_lbl) in enumerate(
+            self._hour_cols
+        ):
+            if slot >= len(idxs):
+                self._set_visible(col_w, False)
+                continue
+            idx = idxs[slot]
+
+            t = times[idx]
+            # datetime64[m] -> "YYYY-MM-DDTHH:MM"; saat:dakika kısmı
+            self._set_text(t_label, "—" if np.isnat(t) else str(t)[11:16])
+
+            dayf = value_at(is_day, idx)
+            self._set_icon(
+                icon_lbl,
+                pick_icon_path(value_at(codes, idx), 1 if dayf is None else dayf),
             )
-            temp_lbl.setAlignment(Qt.AlignHCenter)
-            col.addWidget(temp_lbl)
 
-            row.addLayout(col)
+            temp = value_at(temps, idx)
+            self._set_text(temp_lbl, f"{int(round(temp))}°" if temp is not None else "—")
+
+            agree = self._overlay_value(overlay, "agreement", idx)
+            self._set_text(model_lbl, f"%{agree}" if agree is not None else "")
+            self._set_visible(model_lbl, agree is not None)
+            tip = ""
+            if agree is not None:
+                tip = (
+                    f"Model: {self._overlay_value(overlay, 'temperature_2m', idx)}°C · "
+                    f"yağış {self._overlay_value(overlay, 'precipitation', idx)} mm · "
+                    f"Uyum %{agree}"
+                )
+            self._set_tooltip(col_w, tip)
+            self._set_visible(col_w, True)
 
-        self.content_layout.addLayout(row)
+    @staticmethod
+    def _nearest_future_index(times: np.ndarray) -> int:
+        """
+        hourly zaman ekseninde (sıralı datetime64) 'şimdi'ye en yakın
+        GELECEK/eşit saat indexi; ikili arama ile O(log n).
+        """
+        now = np.datetime64(datetime.now(), "us")
+        i = int(np.searchsorted(times, now, side="left"))
+        return i if i < len(times) else 0
 
-    def _nearest_future_index(self, iso_times: List[str]) -> int:
-        """hourly time dizisinde 'şimdi'ye en yakın GELECEK/eşit saat indexi."""
-        try:
-            now = datetime.now()
-            for i, t in enumerate(iso_times):
-                try:
-                    dt = datetime.fromisoformat(t)
-                    if dt >= now:
-                        return i
-                except Exception:
-                    continue
-            return 0
-        except Exception:
-            return 0
+    async def _attach_overlay(self) -> bool:
+        """
+        Bundle'daki tüm saatlik/günlük dilimleri tek toplu tahminle skorlayıp
+        bundle["overlay"] olarak ekler (aynı model için bir kez). Yeni bir
+        overlay eklendiyse True.
+        """
+        bundle, predictor = self._last_bundle, self.predictor
+        if not bundle or predictor is None:
+            return False
+        current = bundle.get("overlay")
+        if current and current.get("model") == predictor.fingerprint:
+            return False
+        overlay = await predictor.aoverlay(bundle, key="overlay")
+        # beklerken daha yeni bir bundle geldiyse bu sonuç bayat
+        if overlay is None or self._last_bundle is not bundle:
+            return False
+        bundle["overlay"] = overlay
+        return True
 
     # ✨ MODEL tabanlı tutarlılık
-    def _update_consistency_from_bundle(self):
+    @metrics.timed("ui.consistency")
+    async def _update_consistency_from_bundle(self):
         """
         self._last_bundle içindeki current sıcaklık ile model tahminini karşılaştır,
-        % tutarlılık üret ve UI'a yaz.
+        % tutarlılık üret ve UI'a yaz. Tahminler çıkarım havuzunda koşar;
+        olay döngüsü (sürükleme, çizim) bu sırada bloklanmaz.
         """
         try:
             if not self._last_bundle:
@@ -715,6 +1002,25 @@ class MainWidget(QWidget):
             now = datetime.now()
             predict_dt = now.replace(minute=0, second=0, microsecond=0)
 
+            if self._client is not None:
+                await self._update_consistency_remote(cur_temp, predict_dt)
+                return
+
+            if not self._model_requested:
+                # ilk kullanım: ML yığını ve model burada (arka planda) yüklenir
+                self._start_model_load()
+            if self.predictor is None and self._model_loading:
+                self.consistency_label.setText("Model yükleniyor…")
+                self.consistency_label.setToolTip(
+                    "Tahmin modeli arka planda yükleniyor."
+                )
+                return
+
+            # saatlik/günlük model katmanı (render_content kullanır)
+            bundle = self._last_bundle
+            if await self._attach_overlay():
+                self.render_content()
+
             if cur_temp is None or self.predictor is None:
                 self.consistency_label.setText("—")
                 tt = []
@@ -725,31 +1031,20 @@ class MainWidget(QWidget):
                 self.consistency_label.setToolTip(" ".join(tt) or "Hesaplanamadı.")
                 return
 
-            df = self.predictor.predict([predict_dt])
-            if df is None or df.empty:
+            # önbellekli: aynı saat tekrar tekrar modelden geçirilmez
+            rec = await self.predictor.apredict_array(
+                np.array([predict_dt], dtype="datetime64[h]"), key="consistency"
+            )
+            if self._last_bundle is not bundle:
+                return  # yerini daha yeni bir güncelleme aldı
+            if rec is None or rec.size == 0:
                 self.consistency_label.setText("—")
                 self.consistency_label.setToolTip("Model tahmini üretilemedi.")
                 return
 
-            if "prediction" in df.columns:
-                pred = float(df["prediction"].iloc[0])
-            else:
-                pred_cols = [c for c in df.columns if c.startswith("prediction_")]
-                pred = float(df[pred_cols[0]].iloc[0]) if pred_cols else None
-
-            if pred is None or np.isnan(pred):
-                self.consistency_label.setText("—")
-                self.consistency_label.setToolTip("Model tahmini geçersiz.")
-                return
-
-            err = abs(float(cur_temp) - float(pred))
-            # 0°C fark = 100%; 8°C fark ve üzeri = 0%
-            score = max(0.0, 100.0 - (err / 8.0) * 100.0)
-            score_i = int(round(score))
-
-            self.consistency_label.setText(f"%{score_i} Tutarlılık")
-            self.consistency_label.setToolTip(
-                f"Model: {pred:.1f}°C · Anlık: {float(cur_temp):.1f}°C · Hata: {err:.1f}°C"
+            pred = float(rec["temperature_2m"][0])
+            self._show_consistency(
+                pred, cur_temp, self.predictor.climatology_at(predict_dt)
             )
 
         except Exception as e:
@@ -757,8 +1052,55 @@ class MainWidget(QWidget):
             self.consistency_label.setText("—")
             self.consistency_label.setToolTip("Model tutarlılığı hesaplanamadı.")
 
-    def _make_label(self, text: str, obj_name: Optional[str] = None) -> QLabel:
-        lbl = QLabel(text, self.content_frame)
+    async def _update_consistency_remote(self, cur_temp: Any, predict_dt: datetime):
+        bundle = self._last_bundle
+        info = None
+        if cur_temp is not None:
+            info = await self._client.consistency(self._lat, self._lon, predict_dt)
+            if self._last_bundle is not bundle:
+                return  # yerini daha yeni bir güncelleme aldı
+        pred = (info or {}).get("temperature_2m")
+        if cur_temp is None or pred is None:
+            self.consistency_label.setText("—")
+            tt = []
+            if cur_temp is None:
+                tt.append("Anlık sıcaklık yok.")
+            if info is not None and info.get("model") is None:
+                tt.append("Model yüklenmedi.")
+            self.consistency_label.setToolTip(" ".join(tt) or "Hesaplanamadı.")
+            return
+        self._show_consistency(pred, cur_temp, info.get("climatology"))
+
+    def _show_consistency(
+        self, pred: float, cur_temp: Any, clim: Optional[Dict[str, Any]]
+    ):
+        if pred is None or np.isnan(pred):
+            self.consistency_label.setText("—")
+            self.consistency_label.setToolTip("Model tahmini geçersiz.")
+            return
+
+        err = abs(float(cur_temp) - float(pred))
+        # 0°C fark = 100%; 8°C fark ve üzeri = 0%
+        score = max(0.0, 100.0 - (err / 8.0) * 100.0)
+        score_i = int(round(score))
+
+        self.consistency_label.setText(f"%{score_i} Tutarlılık")
+        tip = f"Model: {pred:.1f}°C · Anlık: {float(cur_temp):.1f}°C · Hata: {err:.1f}°C"
+        # geçmiş bağlam: modelin yanındaki iklim tablosundan (O(1))
+        if clim:
+            scope = "bu gün ve saat" if clim["exact"] else "bu ay ve saat"
+            std = clim["temperature_2m_std"]
+            spread = f" ±{std:.1f}" if not np.isnan(std) else ""
+            tip += (
+                f"\nGeçmiş ({scope}): {clim['temperature_2m_mean']:.1f}°C{spread} · "
+                f"yağış {clim['precipitation_mean']:.2f} mm · {clim['count']} kayıt"
+            )
+        self.consistency_label.setToolTip(tip)
+
+    def _make_label(
+        self, text: str, obj_name: Optional[str] = None, parent: Optional[QWidget] = None
+    ) -> QLabel:
+        lbl = QLabel(text, parent or self.content_frame)
         if obj_name:
             lbl.setObjectName(obj_name)
         return lbl
@@ -780,4 +1122,15 @@ class MainWidget(QWidget):
             self.settings.setValue("geo_country", country)
             self.settings.setValue("geo_city", city)
             self._lat, self._lon = self.resolve_coords(country, city)
-            asyncio.create_task(self._safe_update())
+            if (
+                self._client is None
+                and self._model_requested
+                and resolve_model_path(self._lat, self._lon) != self._model_key
+            ):
+                # yeni konumun istasyon modeli farklı: arka planda değiştir
+                self._start_model_load()
+            if self._loop_running:
+                # döngü beklemedeyse hemen uyanır, meşgulse bitince tekrar çalışır
+                self._scheduler.wake()
+            else:
+                asyncio.create_task(self._safe_update())
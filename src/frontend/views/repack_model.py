@@ -5,17 +5,31 @@ from pathlib import Path
 
 import joblib
 
+# src/ kökünü ekle: script doğrudan çalıştırıldığında paket importları için
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from frontend.views.weather_predictor import export_forest  # noqa: E402
+
 SRC = Path("src\\frontend\\views\\weather_prediction_model.pkl")  # mevcut pkl
 DST = Path("src\\frontend\\views\\weather_prediction_model.joblib")
+# Düz, mmap'lenebilir orman dosyası (WeatherPredictor önce bunu arar)
+FOREST_DST = Path("src\\frontend\\views\\weather_prediction_model.forest")
 
-if not SRC.exists():
+if SRC.exists():
+    # Eski ortamda aç
+    with open(SRC, "rb") as f:
+        model = pickle.load(f)
+
+    # Joblib'e yaz
+    joblib.dump(model, DST)
+    print("Yazıldı:", DST.resolve())
+elif DST.exists():
+    # pkl yoksa mevcut joblib'den yalnızca orman dosyasını üret
+    model = joblib.load(DST)
+else:
     print("Kaynak pkl bulunamadı:", SRC.resolve())
     sys.exit(1)
 
-# Eski ortamda aç
-with open(SRC, "rb") as f:
-    model = pickle.load(f)
-
-# Joblib'e yaz
-joblib.dump(model, DST)
-print("Yazıldı:", DST.resolve())
+# Ağaç düğüm dizilerini tek dosyaya paketle (anında yükleme, süreçler arası paylaşım)
+export_forest(model, FOREST_DST)
+print("Yazıldı:", FOREST_DST.resolve())
@@ -1,12 +1,78 @@
 # src/frontend/views/weather_predictor.py
+from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
 import pickle
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Tuple, Union
 
 import numpy as np
-import pandas as pd
+
+from backend import metrics
+from backend.bundle import time_axes
+from backend.climatology import Climatology, climatology_path
+from backend.features import (
+    FEATURE_COLUMNS,
+    TARGET_COLUMNS,
+    date_features,
+    wall_clock_hours,
+)
+
+# pandas / sklearn / joblib / skops açılışta yüklenmez: widget ve servis ilk
+# pencereyi ML yığını olmadan açar, bunlar ilk tahminde (ya da model
+# yüklenirken) içe aktarılır.
+if TYPE_CHECKING:
+    import pandas as pd
+
+# NumPy API'sinin satır tipi: (temperature_2m, precipitation); tek çıktılı
+# modellerde precipitation NaN
+PREDICTION_DTYPE = np.dtype([(name, np.float32) for name in TARGET_COLUMNS])
+
+
+def _require_pandas(api: str):
+    """
+    Eski DataFrame API'si için pandas; paketlenmiş uygulamada pandas yoktur
+    (WeatherWidget.spec), bu durumda NumPy API'sini gösteren açık bir hata.
+    """
+    try:
+        import pandas as pd
+    except ImportError as e:
+        raise ImportError(
+            f"WeatherPredictor.{api} pandas gerektirir ve bu kurulumda pandas yok; "
+            "predict_array / apredict_array (NumPy API) kullanın"
+        ) from e
+    return pd
+
+
+def _fresh_artifact(path: Path) -> Path:
+    """
+    .forest dosyası yanındaki kaynak modelden (aynı adlı .joblib/.pkl) eskiyse
+    kaynağı döndürür: model yeniden eğitilip repack_model.py çalıştırılmadıysa
+    eski orman yeni modeli gölgelemesin.
+    """
+    if path.suffix.lower() != ".forest":
+        return path
+    try:
+        forest_mtime = path.stat().st_mtime_ns
+    except OSError:
+        return path
+    for ext in (".joblib", ".pkl"):
+        source = path.with_suffix(ext)
+        try:
+            if source.stat().st_mtime_ns > forest_mtime:
+                print(f"[predictor] {path.name} is older than {source.name}, using the latter")
+                return source
+        except OSError:
+            continue
+    return path
 
 
 def _find_model_path(given: Optional[str]) -> Optional[str]:
@@ -24,26 +90,526 @@ def _find_model_path(given: Optional[str]) -> Optional[str]:
     root = here.parents[3] if len(here.parents) >= 4 else here
 
     candidates = [
+        # düz orman dosyası varsa önce o (mmap ile anında yüklenir), yanındaki
+        # .joblib'den daha eski değilse
+        here / "weather_prediction_model.forest",
         here / "weather_prediction_model.joblib",
         here / "weather_prediction_model.pkl",
         here / "models" / "weather_prediction_model.joblib",
         here.parent / "weather_prediction_model.joblib",
         root / "weather_prediction_model.joblib",
+        Path.cwd() / "weather_prediction_model.forest",
         Path.cwd() / "weather_prediction_model.joblib",
     ]
     for c in candidates:
         if c.is_file():
-            return str(c.resolve())
+            return str(_fresh_artifact(c).resolve())
 
     return None
 
 
+# -------- İstasyon model kaydı (backend/batch_training.py üretir) --------
+# Bir konuma bu kadar km'den yakın istasyon yoksa varsayılan model kullanılır
+REGISTRY_MAX_KM = 75.0
+
+_registry_lock = threading.Lock()
+_registry_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def _find_registry_path() -> Optional[Path]:
+    env = os.environ.get("WEATHER_MODEL_REGISTRY")
+    here = Path(__file__).parent
+    candidates = [
+        Path(env) if env else None,
+        here / "models" / "registry.json",
+        Path.cwd() / "models" / "registry.json",
+    ]
+    for c in candidates:
+        if c is not None and c.is_file():
+            return c.resolve()
+    return None
+
+
+def _load_registry(path: Path) -> Dict[str, Any]:
+    """registry.json içeriği; dosya değişmedikçe tekrar okunmaz."""
+    mtime = path.stat().st_mtime
+    with _registry_lock:
+        cached = _registry_cache.get(str(path))
+        if cached and cached[0] == mtime:
+            return cached[1]
+    try:
+        reg = json.loads(path.read_text(encoding="utf-8"))
+    except Exception as e:
+        print(f"[predictor] registry okunamadı ({path}): {e}")
+        reg = {}
+    with _registry_lock:
+        _registry_cache[str(path)] = (mtime, reg)
+    return reg
+
+
+def resolve_model_path(
+    lat: float, lon: float, max_km: float = REGISTRY_MAX_KM
+) -> Optional[str]:
+    """
+    Konuma en yakın istasyon modelinin yolu (kayıt yoksa veya en yakın
+    istasyon `max_km`'den uzaksa None -> varsayılan model).
+    """
+    from backend.cities import haversine_km
+
+    reg_path = _find_registry_path()
+    if reg_path is None:
+        return None
+    best: Optional[Tuple[float, Dict[str, Any]]] = None
+    for entry in _load_registry(reg_path).get("stations", {}).values():
+        if entry.get("lat") is None or entry.get("lon") is None:
+            continue
+        d = haversine_km(lat, lon, entry["lat"], entry["lon"])
+        if d <= max_km and (best is None or d < best[0]):
+            best = (d, entry)
+    if best is None:
+        return None
+    entry = best[1]
+    for name in (entry.get("artifact"), entry.get("joblib")):
+        if name and (reg_path.parent / name).is_file():
+            return str(_fresh_artifact(reg_path.parent / name).resolve())
+    return None
+
+
+# -------- Düz (flat) orman dosyası --------
+# Yerleşim: [MAGIC][u32 başlık uzunluğu][JSON başlık][hizalı bölümler...]
+# Bölümler (hepsi düğüm sayısı N uzunluğunda, 64 bayta hizalı):
+#   left/right (int32, mutlak düğüm indeksi), feature (int16),
+#   threshold (float64), value (float64, N x value_cols)
+# Yapraklarda left == right == kendi indeksi; böylece dallanma döngüsü
+# maske gerektirmeden max_depth adımda sabitlenir.
+FOREST_MAGIC = b"WWFOREST"
+FOREST_VERSION = 1
+_FOREST_ALIGN = 64
+_FOREST_SECTIONS = (
+    ("left", "<i4"),
+    ("right", "<i4"),
+    ("feature", "<i2"),
+    ("threshold", "<f8"),
+    ("value", "<f8"),
+)
+
+
+def _forest_groups(model: Any) -> Tuple[list, int, bool]:
+    """
+    Modeli (çıktı -> [(ağaç, değer sütunu)]) gruplarına ayırır.
+    MultiOutputRegressor(RandomForestRegressor) ve tek başına
+    RandomForestRegressor desteklenir.
+    """
+    if hasattr(model, "estimators_") and all(
+        hasattr(e, "estimators_") for e in model.estimators_
+    ):
+        # MultiOutputRegressor: her çıktı için ayrı orman, tek değer sütunu
+        groups = [[(t.tree_, 0) for t in forest.estimators_] for forest in model.estimators_]
+        return groups, 1, False
+    if hasattr(model, "estimators_") and hasattr(model, "n_outputs_"):
+        k = int(model.n_outputs_)
+        groups = [[(t.tree_, i) for t in model.estimators_] for i in range(k)]
+        return groups, k, k == 1
+    raise TypeError(f"desteklenmeyen model türü: {type(model).__name__}")
+
+
+def _pack_forest(model: Any) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """Eğitilmiş ormanı (başlık, düz düğüm dizileri) ikilisine çevirir."""
+    groups, value_cols, squeeze = _forest_groups(model)
+
+    # Aynı ağaç birden fazla grupta geçebilir (çok çıktılı RF); bir kez yaz
+    tree_offsets: Dict[int, int] = {}
+    trees = []
+    n_nodes = 0
+    max_depth = 0
+    for group in groups:
+        for tree, _ in group:
+            if id(tree) not in tree_offsets:
+                tree_offsets[id(tree)] = n_nodes
+                trees.append(tree)
+                n_nodes += tree.node_count
+                max_depth = max(max_depth, int(tree.max_depth))
+
+    arrays = {
+        "left": np.empty(n_nodes, "<i4"),
+        "right": np.empty(n_nodes, "<i4"),
+        "feature": np.empty(n_nodes, "<i2"),
+        "threshold": np.empty(n_nodes, "<f8"),
+        "value": np.empty((n_nodes, value_cols), "<f8"),
+    }
+    for tree in trees:
+        off = tree_offsets[id(tree)]
+        n = tree.node_count
+        own = np.arange(off, off + n, dtype=np.int64)
+        leaf = tree.children_left == -1
+        arrays["left"][off : off + n] = np.where(leaf, own, tree.children_left + off)
+        arrays["right"][off : off + n] = np.where(leaf, own, tree.children_right + off)
+        arrays["feature"][off : off + n] = np.where(leaf, 0, tree.feature)
+        arrays["threshold"][off : off + n] = tree.threshold
+        arrays["value"][off : off + n] = tree.value[:, :value_cols, 0]
+
+    digest = hashlib.blake2b(digest_size=16)
+    for name, _ in _FOREST_SECTIONS:
+        digest.update(arrays[name].tobytes())
+
+    feature_names = getattr(model, "feature_names_in_", None)
+    header: Dict[str, Any] = {
+        "version": FOREST_VERSION,
+        "n_nodes": n_nodes,
+        "value_cols": value_cols,
+        "max_depth": max_depth,
+        "squeeze": squeeze,
+        "n_features": int(getattr(model, "n_features_in_", 0)),
+        "feature_names": list(feature_names) if feature_names is not None else None,
+        "outputs": [
+            {"roots": [tree_offsets[id(t)] for t, _ in g], "column": g[0][1]}
+            for g in groups
+        ],
+        "fingerprint": digest.hexdigest(),
+        "sections": {},
+    }
+    return header, arrays
+
+
+def export_forest(model: Any, path: Union[str, Path]) -> Path:
+    """Eğitilmiş ormanın düğüm dizilerini tek, mmap'lenebilir dosyaya yazar."""
+    header, arrays = _pack_forest(model)
+
+    # Başlık uzunluğu bölüm ofsetlerine bağlı: sabitlenene kadar yeniden hesapla
+    offsets: Dict[str, int] = {}
+    prefix = len(FOREST_MAGIC) + 4
+    raw = b""
+    for _ in range(4):
+        pos = prefix + len(raw)
+        for name, _dt in _FOREST_SECTIONS:
+            pos = -(-pos // _FOREST_ALIGN) * _FOREST_ALIGN
+            offsets[name] = pos
+            pos += arrays[name].nbytes
+        header["sections"] = {
+            name: {"offset": offsets[name], "dtype": dt, "shape": list(arrays[name].shape)}
+            for name, dt in _FOREST_SECTIONS
+        }
+        new_raw = json.dumps(header).encode("utf-8")
+        if len(new_raw) == len(raw):
+            break
+        raw = new_raw
+
+    path = Path(path)
+    with open(path, "wb") as f:
+        f.write(FOREST_MAGIC)
+        f.write(len(raw).to_bytes(4, "little"))
+        f.write(raw)
+        for name, _dt in _FOREST_SECTIONS:
+            f.write(b"\0" * (offsets[name] - f.tell()))
+            f.write(arrays[name].tobytes())
+    return path
+
+
+class ForestModel:
+    """
+    Düz düğüm dizileri üzerinde çalışan yerel (NumPy) orman çıkarım motoru.
+    Dosyadan yüklendiğinde salt-okunur mmap kullanır; sayfalar süreçler
+    arasında işletim sistemi tarafından paylaşılır.
+
+    Tüm ağaçlar x tüm satırlar tek seferde, NumPy indeksleme ile dallanır;
+    sklearn'ün her çağrıdaki doğrulama / DataFrame dönüşümü / joblib iş
+    parçacığı dağıtımı maliyeti yoktur.
+    """
+
+    # Bir adımda yürütülecek en fazla (ağaç x satır) düğüm sayısı (bellek sınırı)
+    BLOCK_SIZE = 1 << 18
+
+    def __init__(self, header: Dict[str, Any], arrays: Dict[str, np.ndarray]):
+        self.header = header
+        # memmap alt sınıfını bırak: fancy indexing düz ndarray üzerinde daha hızlı
+        self.left = np.asarray(arrays["left"])
+        self.right = np.asarray(arrays["right"])
+        self.feature = np.asarray(arrays["feature"])
+        self.threshold = np.asarray(arrays["threshold"])
+        self.value = np.asarray(arrays["value"])
+        self.max_depth = int(header["max_depth"])
+        self.squeeze = bool(header.get("squeeze"))
+        self.fingerprint: str = header["fingerprint"]
+        # eğitimdeki sütun adları (DataFrame ile eğitildiyse) ve sayısı
+        self.feature_names: Optional[list] = header.get("feature_names")
+        self.n_features = int(header.get("n_features") or 0)
+
+        # Çok çıktılı RF'de aynı ağaç birden çok çıktıda geçer: kökleri tekilleştir
+        all_roots = [r for o in header["outputs"] for r in o["roots"]]
+        self.roots, inverse = np.unique(np.asarray(all_roots, dtype=np.int64), return_inverse=True)
+        self.outputs = []
+        pos = 0
+        for o in header["outputs"]:
+            n = len(o["roots"])
+            self.outputs.append((inverse[pos : pos + n], int(o["column"])))
+            pos += n
+
+    @classmethod
+    def from_sklearn(cls, model: Any) -> "ForestModel":
+        """Bellekteki sklearn ormanından (dosyaya yazmadan) motor oluşturur."""
+        header, arrays = _pack_forest(model)
+        return cls(header, arrays)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ForestModel":
+        mm = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(mm[: len(FOREST_MAGIC)]) != FOREST_MAGIC:
+            raise ValueError(f"orman dosyası değil: {path}")
+        pos = len(FOREST_MAGIC)
+        n = int.from_bytes(bytes(mm[pos : pos + 4]), "little")
+        header = json.loads(bytes(mm[pos + 4 : pos + 4 + n]).decode("utf-8"))
+        if header.get("version") != FOREST_VERSION:
+            raise ValueError(f"desteklenmeyen orman sürümü: {header.get('version')}")
+        arrays = {}
+        for name, meta in header["sections"].items():
+            dt = np.dtype(meta["dtype"])
+            shape = tuple(meta["shape"])
+            count = int(np.prod(shape))
+            start = meta["offset"]
+            arrays[name] = (
+                mm[start : start + count * dt.itemsize].view(dt).reshape(shape)
+            )
+        return cls(header, arrays)
+
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        """Her (tekil kök, satır) için ulaşılan yaprak indeksi: (T, R)."""
+        n_rows, n_feat = X.shape
+        n_trees = len(self.roots)
+        flat = X.ravel()
+        leaves = np.empty((n_trees, n_rows), dtype=self.left.dtype)
+        chunk = max(1, self.BLOCK_SIZE // max(1, n_trees))
+        for start in range(0, n_rows, chunk):
+            stop = min(n_rows, start + chunk)
+            # satırın düz X içindeki başlangıcı; ağaç ekseninde yayınlanır
+            base = (np.arange(start, stop, dtype=np.intp) * n_feat)[None, :]
+            idx = np.repeat(self.roots.astype(self.left.dtype)[:, None], stop - start, axis=1)
+            for _ in range(self.max_depth):
+                go_left = flat[base + self.feature[idx]] <= self.threshold[idx]
+                nxt = np.where(go_left, self.left[idx], self.right[idx])
+                # yapraklar kendine döner: hiçbir düğüm ilerlemediyse bitti
+                if np.array_equal(nxt, idx):
+                    break
+                idx = nxt
+            leaves[:, start:stop] = idx
+        return leaves
+
+    def predict(self, X: Any) -> np.ndarray:
+        # sklearn ağaçları girdiyi float32'ye çevirip float64 eşikle karşılaştırır
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        leaves = self._leaves(X)
+        out = np.empty((X.shape[0], len(self.outputs)), dtype=np.float64)
+        for k, (positions, col) in enumerate(self.outputs):
+            out[:, k] = self.value[leaves[positions], col].sum(axis=0) / len(positions)
+        return out[:, 0] if self.squeeze else out
+
+
+def _check_feature_columns(model: Any):
+    """
+    Modelin eğitildiği özellik sırası FEATURE_COLUMNS değilse ValueError.
+    Tahmin düz matrisle yapıldığından (sklearn'ün DataFrame sütun kontrolü
+    yok) farklı sırayla eğitilmiş bir model sessizce yanlış tahmin ederdi.
+    """
+    names = getattr(model, "feature_names_in_", None)
+    if names is None:
+        names = getattr(model, "feature_names", None)
+    if names is not None and list(names) != FEATURE_COLUMNS:
+        raise ValueError(
+            f"model özellik sırası FEATURE_COLUMNS ile uyuşmuyor: {list(names)}"
+        )
+    n = getattr(model, "n_features_in_", None) or getattr(model, "n_features", 0)
+    if n and int(n) != len(FEATURE_COLUMNS):
+        raise ValueError(
+            f"model {int(n)} özellik bekliyor, FEATURE_COLUMNS {len(FEATURE_COLUMNS)}"
+        )
+
+
+# Model ile tahmin arasındaki bu kadar (ve üstü) °C fark %0 uyum sayılır
+AGREEMENT_TOLERANCE_C = 8.0
+
+
+def agreement_percent(
+    model: np.ndarray, forecast: np.ndarray, tolerance: float = AGREEMENT_TOLERANCE_C
+) -> np.ndarray:
+    """0°C fark = 100, `tolerance` ve üzeri = 0; tahmin eksikse NaN."""
+    err = np.abs(
+        np.asarray(model, dtype=np.float64) - np.asarray(forecast, dtype=np.float64)
+    )
+    return np.clip(100.0 - err / tolerance * 100.0, 0.0, 100.0)
+
+
+def _series(values: Any) -> np.ndarray:
+    """Bundle listesi (None içerebilir) -> float64 dizi (None -> NaN)."""
+    return np.array(values if values is not None else [], dtype=np.float64)
+
+
+def _optional_list(arr: np.ndarray, ndigits: Optional[int] = 1) -> list:
+    vals = np.round(arr, ndigits) if ndigits is not None else np.round(arr)
+    return [
+        None if np.isnan(v) else (v if ndigits is not None else int(v))
+        for v in vals.tolist()
+    ]
+
+
+def _file_fingerprint(path: str, chunk_size: int = 1 << 20) -> str:
+    """Model dosyasının içerik özeti (önbellek anahtarı için)."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class _PredictionCache:
+    """
+    (model parmak izi, saat) -> tahmin satırı eşlemesi.
+    Boyutu sınırlı LRU + TTL; isabet/ıskalama sayaçları tutar.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 24 * 3600):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Tuple[str, np.datetime64], Tuple[float, np.ndarray]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, np.datetime64]) -> Optional[np.ndarray]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or now - item[0] > self.ttl_seconds:
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                metrics.incr("predict.cache_misses")
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            metrics.incr("predict.cache_hits")
+            return item[1]
+
+    def contains(self, key: Tuple[str, np.datetime64]) -> bool:
+        """Sayaçları etkilemeden taze kayıt var mı?"""
+        with self._lock:
+            item = self._data.get(key)
+            return item is not None and time.monotonic() - item[0] <= self.ttl_seconds
+
+    def put(self, key: Tuple[str, np.datetime64], row: np.ndarray):
+        with self._lock:
+            self._data[key] = (time.monotonic(), row)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+
+# -------- Olay döngüsü dışı çıkarım havuzları --------
+# Tahminler Qt/qasync döngüsünü bloklamasın diye ayrı bir havuzda koşar.
+# "thread": aynı süreç (NumPy/sklearn GIL'i büyük ölçüde bırakır),
+# "process": tam yalıtım; işçi süreç modeli kendisi bir kez yükler.
+EXECUTOR_KINDS = ("thread", "process")
+
+_executors: Dict[str, Executor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_inference_executor(kind: str = "thread") -> Executor:
+    """Süreç genelinde paylaşılan çıkarım havuzu (işçi sayısı: WEATHER_PREDICTOR_WORKERS)."""
+    with _executors_lock:
+        ex = _executors.get(kind)
+        if ex is None:
+            workers = int(os.environ.get("WEATHER_PREDICTOR_WORKERS") or 1)
+            if kind == "process":
+                ex = ProcessPoolExecutor(max_workers=workers)
+            else:
+                ex = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="predictor")
+            _executors[kind] = ex
+        return ex
+
+
+def shutdown_inference_executors(wait: bool = False):
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for ex in executors:
+        ex.shutdown(wait=wait, cancel_futures=True)
+
+
+# işçi süreç tarafı: (model yolu, motor) -> yüklenmiş tahminci
+_worker_predictors: Dict[Tuple[Optional[str], str], "WeatherPredictor"] = {}
+
+
+def _process_run_model(
+    model_path: Optional[str], backend: str, hours: np.ndarray
+) -> np.ndarray:
+    predictor = _worker_predictors.get((model_path, backend))
+    if predictor is None:
+        predictor = WeatherPredictor(model_path, backend=backend)
+        _worker_predictors[(model_path, backend)] = predictor
+    if predictor.model is None:
+        raise RuntimeError("model not loaded in worker")
+    return predictor._compute_raw(hours)
+
+
 class WeatherPredictor:
     """Hava durumu tahmin sınıfı - joblib/pickle modelini yükler ve tahmin yapar"""
 
-    def __init__(self, model_path: Optional[str] = None):
+    # Bir ıskalamada ileriye dönük toplu hesaplanacak saat sayısı
+    PREFETCH_HOURS = 48
+
+    # "native": ForestModel (NumPy), "sklearn": model.predict,
+    # "auto": küçük partilerde native, büyük partilerde (varsa) sklearn
+    BACKENDS = ("auto", "native", "sklearn")
+    # auto modunda native motorun kullanılacağı en büyük parti (sklearn'ün
+    # çağrı başı sabit maliyeti ancak bunun üstünde geri kazanılıyor)
+    NATIVE_MAX_ROWS = 256
+
+    # Havuzda aynı anda bekleyen/çalışan en fazla async tahmin sayısı
+    MAX_INFLIGHT = 2
+
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        backend: Optional[str] = None,
+        executor: Optional[str] = None,
+        max_inflight: Optional[int] = None,
+    ):
         self.model = None
+        self.engine: Optional[ForestModel] = None
         self.model_path = _find_model_path(model_path)
+        self.backend = (
+            backend or os.environ.get("WEATHER_PREDICTOR_BACKEND") or "auto"
+        ).lower()
+        if self.backend not in self.BACKENDS:
+            print(f"[predictor] unknown backend {self.backend!r}, using auto")
+            self.backend = "auto"
+        self.fingerprint: Optional[str] = None
+        self.cache = _PredictionCache()
+        self.climatology: Optional[Climatology] = None
+
+        self.executor_kind = (
+            executor or os.environ.get("WEATHER_PREDICTOR_EXECUTOR") or "thread"
+        ).lower()
+        if self.executor_kind not in EXECUTOR_KINDS:
+            print(f"[predictor] unknown executor {self.executor_kind!r}, using thread")
+            self.executor_kind = "thread"
+        self.max_inflight = max_inflight or self.MAX_INFLIGHT
+        self._slots: Optional[asyncio.Semaphore] = None
+        # anahtar -> son istek; aynı anahtarla gelen yeni istek eskisini iptal eder
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._generation: Dict[str, int] = {}
+        self._superseded: set = set()
 
         if not self.model_path:
             print("[predictor] ERROR: model file not found")
@@ -57,6 +623,8 @@ class WeatherPredictor:
                 import joblib
 
                 self.model = joblib.load(self.model_path)
+            elif ext == ".forest":
+                self.model = ForestModel.load(self.model_path)
             elif ext == ".skops":
                 from skops.io import load
 
@@ -64,70 +632,451 @@ class WeatherPredictor:
             else:
                 with open(self.model_path, "rb") as f:
                     self.model = pickle.load(f)
+            _check_feature_columns(self.model)
+            # orman dosyası parmak izini başlığında taşır; tüm dosyayı okumaya gerek yok
+            self.fingerprint = getattr(self.model, "fingerprint", None) or (
+                _file_fingerprint(self.model_path)
+            )
         except Exception as e:
             print("[predictor] load failed:", e)
             self.model = None
+            return
 
-    def create_features(self, dates: List[pd.Timestamp]) -> pd.DataFrame:
-        features = []
-        for date in dates:
-            month = date.month
-            day = date.day
-            hour = date.hour
-            day_of_week = date.weekday()
-            day_of_year = date.timetuple().tm_yday
-            quarter = (month - 1) // 3 + 1
-            is_weekend = 1 if day_of_week >= 5 else 0
-
-            if month in [12, 1, 2]:
-                season = 1
-            elif month in [3, 4, 5]:
-                season = 2
-            elif month in [6, 7, 8]:
-                season = 3
-            else:
-                season = 4
-
-            features.append(
-                {
-                    "month": month,
-                    "day": day,
-                    "hour": hour,
-                    "day_of_week": day_of_week,
-                    "day_of_year": day_of_year,
-                    "quarter": quarter,
-                    "is_weekend": is_weekend,
-                    "season": season,
-                    "month_sin": np.sin(2 * np.pi * month / 12),
-                    "month_cos": np.cos(2 * np.pi * month / 12),
-                    "hour_sin": np.sin(2 * np.pi * hour / 24),
-                    "hour_cos": np.cos(2 * np.pi * hour / 24),
-                }
+        self._select_backend()
+        self._load_climatology()
+
+    @classmethod
+    def for_location(
+        cls, lat: float, lon: float, backend: Optional[str] = None
+    ) -> "WeatherPredictor":
+        """Konuma en yakın istasyon modeli; kayıtta yoksa varsayılan model."""
+        return cls(resolve_model_path(lat, lon), backend=backend)
+
+    def _load_climatology(self):
+        """Modelin yanındaki iklim tablosu (<model>.clim.npz); yoksa sessizce geç."""
+        path = climatology_path(self.model_path)
+        if not path.is_file():
+            return
+        try:
+            self.climatology = Climatology.load(path)
+        except Exception as e:
+            print(f"[predictor] climatology load failed: {e}")
+
+    def climatology_at(self, when: Any) -> Optional[Dict[str, Any]]:
+        """
+        `when` anının ay-gün-saatine ait geçmiş istatistikler (O(1)):
+        count, exact, temperature_2m_mean/std, precipitation_mean/std.
+        """
+        if self.climatology is None:
+            return None
+        t = wall_clock_hours(when)
+        day = t.astype("datetime64[D]")
+        month = day.astype("datetime64[M]")
+        return self.climatology.lookup(
+            int(month.astype(np.int64) % 12) + 1,
+            int((day - month).astype(np.int64)) + 1,
+            int((t - day).astype(np.int64)),
+        )
+
+    def _select_backend(self):
+        if isinstance(self.model, ForestModel):
+            if self.backend == "sklearn":
+                print("[predictor] .forest model only supports the native backend")
+            self.backend = "native"
+            self.engine = self.model
+            return
+        if self.backend == "sklearn":
+            return
+        try:
+            self.engine = ForestModel.from_sklearn(self.model)
+        except Exception as e:
+            print(f"[predictor] native backend unavailable ({e}), using sklearn")
+            self.backend = "sklearn"
+            return
+        if self.backend == "native":
+            # sklearn nesnesine artık gerek yok; belleği bırak
+            self.model = self.engine
+
+    def _run_model(self, features: np.ndarray) -> np.ndarray:
+        """Seçili motora göre ham model çıktısı."""
+        if self.engine is not None and (
+            self.model is self.engine or len(features) <= self.NATIVE_MAX_ROWS
+        ):
+            return self.engine.predict(features)
+        with warnings.catch_warnings():
+            # Modeller DataFrame ile eğitildi; tahminde aynı sıradaki
+            # (FEATURE_COLUMNS) düz matris verilir, sütun adı uyarısı gereksiz
+            warnings.filterwarnings(
+                "ignore", message="X does not have valid feature names", category=UserWarning
             )
-        return pd.DataFrame(features)
+            return self.model.predict(features)
+
+    @staticmethod
+    def feature_matrix(dates: Any) -> np.ndarray:
+        """
+        (n, len(FEATURE_COLUMNS)) float32 özellik matrisi (pandas gerektirmez).
+        İki motor da girdiyi float32'ye çevirdiğinden sonuç DataFrame ile aynıdır.
+        """
+        cols = date_features(dates)
+        first = cols[FEATURE_COLUMNS[0]]
+        X = np.empty((len(first), len(FEATURE_COLUMNS)), dtype=np.float32)
+        for j, name in enumerate(FEATURE_COLUMNS):
+            X[:, j] = cols[name]
+        return X
+
+    def create_features(
+        self, dates: Union[Sequence[pd.Timestamp], pd.DatetimeIndex, np.ndarray]
+    ) -> pd.DataFrame:
+        """
+        Tarih özelliklerini sütun bazında (satır döngüsü olmadan) üretir.
+        `dates`: Timestamp/datetime listesi, pd.DatetimeIndex veya np.datetime64 dizisi.
+        """
+        pd = _require_pandas("create_features")
+
+        return pd.DataFrame(date_features(dates), columns=FEATURE_COLUMNS)
+
+    @staticmethod
+    def _to_records(matrix: np.ndarray) -> np.ndarray:
+        """(n, çıktı_sayısı) matris -> PREDICTION_DTYPE yapılı dizi."""
+        out = np.full(len(matrix), np.nan, dtype=PREDICTION_DTYPE)
+        for i, name in enumerate(PREDICTION_DTYPE.names[: matrix.shape[1]]):
+            out[name] = matrix[:, i]
+        return out
+
+    @staticmethod
+    def _to_frame(idx: pd.DatetimeIndex, predictions: np.ndarray) -> pd.DataFrame:
+        import pandas as pd
+
+        date_strs = idx.strftime("%Y-%m-%d")
+
+        if predictions.ndim > 1:
+            df = pd.DataFrame({"date": date_strs})
+            for i in range(predictions.shape[1]):
+                df[f"prediction_{i+1}"] = predictions[:, i]
+            return df
+
+        return pd.DataFrame(
+            {
+                "date": date_strs,
+                "prediction": predictions,
+            }
+        )
+
+    def predict(
+        self, dates: Union[Sequence[pd.Timestamp], pd.DatetimeIndex, np.ndarray]
+    ) -> pd.DataFrame:
+        """NumPy çekirdeği üzerinde DataFrame sarmalayıcısı (eski API)."""
+        pd = _require_pandas("predict")
 
-    def predict(self, dates: List[pd.Timestamp]) -> pd.DataFrame:
         if self.model is None:
             print("[predictor] ERROR: model not loaded")
             return pd.DataFrame()
 
         try:
-            features_df = self.create_features(dates)
-            predictions = self.model.predict(features_df)
-
-            if predictions.ndim > 1:
-                df = pd.DataFrame({"date": [d.strftime("%Y-%m-%d") for d in dates]})
-                for i in range(predictions.shape[1]):
-                    df[f"prediction_{i+1}"] = predictions[:, i]
-                return df
-
-            return pd.DataFrame(
-                {
-                    "date": [d.strftime("%Y-%m-%d") for d in dates],
-                    "prediction": predictions,
-                }
-            )
+            with metrics.span("predict"):
+                idx = pd.DatetimeIndex(dates)
+                if idx.tz is not None:
+                    idx = idx.tz_localize(None)  # duvar saati (eğitimle aynı)
+                return self._to_frame(idx, self._compute_raw(idx.to_numpy()))
+        except Exception as e:
+            print("[predictor] predict failed:", e)
+            return pd.DataFrame()
+
+    def _compute_raw(self, dates: Any) -> np.ndarray:
+        """Ham model çıktısı (havuzdaki iş parçacığı/süreçte de çalışır)."""
+        with metrics.span("predict.features"):
+            features = self.feature_matrix(dates)
+        with metrics.span("predict.model"):
+            return np.asarray(self._run_model(features))
+
+    def _predict_matrix(self, hours: np.ndarray) -> np.ndarray:
+        """Model çıktısını her zaman (n, çıktı_sayısı) biçiminde döndürür."""
+        return self._as_matrix(self._compute_raw(hours))
 
+    @staticmethod
+    def _as_matrix(predictions: np.ndarray) -> np.ndarray:
+        predictions = np.asarray(predictions)
+        if predictions.ndim == 1:
+            predictions = predictions[:, None]
+        return predictions
+
+    def _plan_hours(
+        self, dates: Union[Sequence[Any], np.ndarray], prefetch: bool
+    ) -> Tuple[np.ndarray, list, Optional[np.ndarray]]:
+        """
+        (saatler, önbellek satırları, hesaplanacak toplu saatler) üçlüsü.
+        Iskalama yoksa üçüncü eleman None'dır.
+        """
+        hours = wall_clock_hours(dates)
+        fp = self.fingerprint or ""
+        rows = [self.cache.get((fp, h)) for h in hours]
+        missing = [h for h, r in zip(hours, rows) if r is None]
+        if not missing:
+            return hours, rows, None
+        batch = list(dict.fromkeys(missing))
+        if prefetch:
+            step = np.timedelta64(1, "h")
+            for h in (missing[0] + step * i for i in range(self.PREFETCH_HOURS)):
+                if h not in batch and not self.cache.contains((fp, h)):
+                    batch.append(h)
+        return hours, rows, np.array(batch, dtype="datetime64[h]")
+
+    def _fill_hours(
+        self,
+        hours: np.ndarray,
+        rows: list,
+        batch: Optional[np.ndarray],
+        matrix: Optional[np.ndarray],
+    ) -> np.ndarray:
+        if batch is not None:
+            fp = self.fingerprint or ""
+            computed = dict(zip(batch, matrix))
+            for h, row in computed.items():
+                self.cache.put((fp, h), row)
+            rows = [computed[h] if r is None else r for h, r in zip(hours, rows)]
+        return np.vstack(rows) if rows else np.empty((0, 0))
+
+    def predict_hours(
+        self, dates: Union[Sequence[Any], np.ndarray], prefetch: bool = True
+    ) -> Optional[np.ndarray]:
+        """
+        Saate yuvarlanmış tarihler için (n, çıktı_sayısı) tahmin matrisi.
+        Sonuçlar önbellekten gelir; ıskalanan saatler (ve prefetch=True ise
+        sonraki PREFETCH_HOURS saat) tek bir toplu model çağrısıyla hesaplanır.
+        """
+        if self.model is None:
+            print("[predictor] ERROR: model not loaded")
+            return None
+
+        try:
+            hours, rows, batch = self._plan_hours(dates, prefetch)
+            matrix = self._predict_matrix(batch) if batch is not None else None
+            return self._fill_hours(hours, rows, batch, matrix)
+        except Exception as e:
+            print("[predictor] predict failed:", e)
+            return None
+
+    def predict_array(
+        self, times: Union[Sequence[Any], np.ndarray], prefetch: bool = True
+    ) -> Optional[np.ndarray]:
+        """
+        NumPy API: datetime64 dizisi -> PREDICTION_DTYPE yapılı dizi
+        (temperature_2m, precipitation; float32). `predict_hours` önbelleğini
+        kullanır; model yoksa ya da hata olursa None.
+        """
+        matrix = self.predict_hours(times, prefetch)
+        return None if matrix is None else self._to_records(matrix)
+
+    @staticmethod
+    def _overlay_hours(
+        bundle: Dict[str, Any],
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, int]]:
+        """(tekil saatler, geri dağıtım indeksi, saatlik dilim sayısı)."""
+        axes = time_axes(bundle)  # bundle geldiğinde bir kez ayrıştırılmış
+        h_times = axes["hourly"].astype("datetime64[h]")
+        d_times = axes["daily"]
+        day_hours = (d_times.astype("datetime64[h]")[:, None] + np.arange(24)).ravel()
+        all_hours = np.concatenate([h_times, day_hours])
+        if all_hours.size == 0:
+            return None
+        uniq, inverse = np.unique(all_hours, return_inverse=True)
+        return uniq, inverse.ravel(), len(h_times)
+
+    def _overlay_from(
+        self, bundle: Dict[str, Any], pred: np.ndarray, inverse: np.ndarray, n_h: int
+    ) -> Dict[str, Any]:
+        hourly = bundle.get("hourly") or {}
+        daily = bundle.get("daily") or {}
+        pred = pred[inverse]
+        temp = pred[:, 0]
+        precip = pred[:, 1] if pred.shape[1] > 1 else np.full(len(pred), np.nan)
+
+        h_temp, h_precip = temp[:n_h], precip[:n_h]
+        d_temp = temp[n_h:].reshape(-1, 24)
+        d_precip = precip[n_h:].reshape(-1, 24)
+        d_max, d_min = d_temp.max(axis=1), d_temp.min(axis=1)
+
+        h_agree = agreement_percent(
+            h_temp, _series(hourly.get("temperature_2m"))[:n_h]
+        )
+        # günlük uyum: en yüksek ve en düşük sıcaklık uyumlarının ortalaması
+        d_agree = (
+            agreement_percent(d_max, _series(daily.get("temperature_2m_max")))
+            + agreement_percent(d_min, _series(daily.get("temperature_2m_min")))
+        ) / 2.0
+
+        return {
+            "model": self.fingerprint,
+            "hourly": {
+                "temperature_2m": _optional_list(h_temp),
+                "precipitation": _optional_list(h_precip, 2),
+                "agreement": _optional_list(h_agree, None),
+            },
+            "daily": {
+                "temperature_2m_max": _optional_list(d_max),
+                "temperature_2m_min": _optional_list(d_min),
+                "precipitation_sum": _optional_list(d_precip.sum(axis=1), 2),
+                "agreement": _optional_list(d_agree, None),
+            },
+        }
+
+    def overlay(self, bundle: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Bundle'daki tüm saatlik ve günlük dilimler için model katmanı.
+        Saatlik zamanlar ile günlerin 24 saati birleştirilip tekilleştirilir
+        ve tek bir toplu tahminle skorlanır. Dönen listeler bundle'ın
+        hourly/daily dizileriyle aynı indekstedir:
+          hourly: temperature_2m, precipitation, agreement (%)
+          daily:  temperature_2m_max/min, precipitation_sum, agreement (%)
+        """
+        if self.model is None:
+            return None
+        try:
+            plan = self._overlay_hours(bundle)
+            if plan is None:
+                return None
+            uniq, inverse, n_h = plan
+            pred = self.predict_hours(uniq, prefetch=False)
+            if pred is None:
+                return None
+            return self._overlay_from(bundle, pred, inverse, n_h)
+        except Exception as e:
+            print("[predictor] overlay failed:", e)
+            return None
+
+    # ----- Async API: çıkarım olay döngüsü dışında -----
+    async def _run_in_pool(self, dates: Any, key: Optional[str]) -> Optional[np.ndarray]:
+        """
+        Ham model çıktısını havuzda hesaplar. Aynı `key` ile yeni bir istek
+        gelirse eskisi iptal edilir ve None döner; havuzdaki iş sayısı
+        `max_inflight` ile sınırlıdır (iptal edilen iş bitene dek yer tutar).
+        """
+        loop = asyncio.get_running_loop()
+        if key is not None:
+            gen = self._generation[key] = self._generation.get(key, 0) + 1
+            prev = self._pending.pop(key, None)
+            if prev is not None and not prev.done():
+                self._superseded.add(prev)
+                prev.cancel()
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_inflight)
+        slots = self._slots
+
+        await slots.acquire()
+        if key is not None and self._generation[key] != gen:
+            # sıra beklerken daha yeni bir istek geldi
+            slots.release()
+            return None
+
+        try:
+            if self.executor_kind == "process":
+                cf = get_inference_executor("process").submit(
+                    _process_run_model, self.model_path, self.backend, dates
+                )
+            else:
+                cf = get_inference_executor("thread").submit(self._compute_raw, dates)
+        except BaseException:
+            # havuz kapalı/bozuk: iş kuyruğa girmedi, yeri hemen geri ver
+            slots.release()
+            raise
+
+        def _release(_):
+            try:
+                loop.call_soon_threadsafe(slots.release)
+            except RuntimeError:
+                pass  # döngü kapanmış
+
+        # yer, havuzdaki iş gerçekten bitince boşalır (run_in_executor'ün
+        # döndürdüğü sarmalayıcı iptalde hemen "biter", bu yüzden submit)
+        cf.add_done_callback(_release)
+        fut = asyncio.wrap_future(cf)
+        if key is not None:
+            self._pending[key] = fut
+        try:
+            return await fut
+        except asyncio.CancelledError:
+            if fut in self._superseded:
+                return None
+            raise
+        finally:
+            self._superseded.discard(fut)
+            if key is not None and self._pending.get(key) is fut:
+                del self._pending[key]
+
+    async def apredict(
+        self,
+        dates: Union[Sequence[pd.Timestamp], pd.DatetimeIndex, np.ndarray],
+        key: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """`predict` ile aynı sonuç; model havuzda çalışır, döngü bloklanmaz."""
+        pd = _require_pandas("apredict")
+
+        if self.model is None:
+            print("[predictor] ERROR: model not loaded")
+            return pd.DataFrame()
+        try:
+            idx = pd.DatetimeIndex(dates)
+            if idx.tz is not None:
+                idx = idx.tz_localize(None)  # duvar saati (eğitimle aynı)
+            raw = await self._run_in_pool(idx.to_numpy(), key)
+            if raw is None:
+                return pd.DataFrame()
+            return self._to_frame(idx, raw)
         except Exception as e:
             print("[predictor] predict failed:", e)
             return pd.DataFrame()
+
+    async def apredict_hours(
+        self,
+        dates: Union[Sequence[Any], np.ndarray],
+        prefetch: bool = True,
+        key: Optional[str] = None,
+    ) -> Optional[np.ndarray]:
+        """`predict_hours`'un async hali; önbellek isabetleri havuza gitmez."""
+        if self.model is None:
+            print("[predictor] ERROR: model not loaded")
+            return None
+        try:
+            hours, rows, batch = self._plan_hours(dates, prefetch)
+            matrix = None
+            if batch is not None:
+                raw = await self._run_in_pool(batch, key)
+                if raw is None:
+                    return None
+                matrix = self._as_matrix(raw)
+            return self._fill_hours(hours, rows, batch, matrix)
+        except Exception as e:
+            print("[predictor] predict failed:", e)
+            return None
+
+    async def apredict_array(
+        self,
+        times: Union[Sequence[Any], np.ndarray],
+        prefetch: bool = True,
+        key: Optional[str] = None,
+    ) -> Optional[np.ndarray]:
+        """`predict_array`'in async hali; model havuzda çalışır."""
+        matrix = await self.apredict_hours(times, prefetch, key)
+        return None if matrix is None else self._to_records(matrix)
+
+    async def aoverlay(
+        self, bundle: Dict[str, Any], key: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """`overlay`'in async hali."""
+        if self.model is None:
+            return None
+        try:
+            plan = self._overlay_hours(bundle)
+            if plan is None:
+                return None
+            uniq, inverse, n_h = plan
+            pred = await self.apredict_hours(uniq, prefetch=False, key=key)
+            if pred is None:
+                return None
+            return self._overlay_from(bundle, pred, inverse, n_h)
+        except Exception as e:
+            print("[predictor] overlay failed:", e)
+            return None
+
+    def cache_stats(self) -> Dict[str, int]:
+        return self.cache.stats()
@@ -0,0 +1,81 @@
+"""
+WeatherPredictor çıkarım motorları için mikro kıyaslama (sklearn vs native).
+
+Kullanım:
+    python tests/benchmarks/bench_inference.py [model.joblib|model.pkl]
+
+Model yolu verilmezse WEATHER_MODEL_PATH / otomatik arama kullanılır;
+o da bulamazsa sentetik bir orman eğitilir (synthetic_model.py).
+Her parti boyu için sklearn ve native sürelerini, hızlanmayı, en büyük
+mutlak farkı ve "auto" modunun o boyda seçtiği motoru yazdırır.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+SRC = Path(__file__).resolve().parents[2] / "src"
+sys.path.insert(0, str(SRC))
+
+from frontend.views.weather_predictor import ForestModel, WeatherPredictor  # noqa: E402
+from synthetic_model import synthetic_model_path  # noqa: E402
+
+BATCH_SIZES = (1, 24, 8760, 1_000_000)
+
+
+def _timeit(fn, min_time: float = 0.5, max_runs: int = 200):
+    """En az `min_time` saniye (veya `max_runs` tur) çalıştırır; (en iyi süre, sonuç)."""
+    best = float("inf")
+    spent = 0.0
+    runs = 0
+    result = None
+    while (spent < min_time and runs < max_runs) or runs == 0:
+        t0 = time.perf_counter()
+        result = fn()
+        dt = time.perf_counter() - t0
+        best = min(best, dt)
+        spent += dt
+        runs += 1
+    return best, result
+
+
+def main(argv):
+    given = argv[1] if len(argv) > 1 else None
+    predictor = WeatherPredictor(given, backend="auto")
+    if predictor.model is None and given is None:
+        predictor = WeatherPredictor(synthetic_model_path(), backend="auto")
+    if predictor.model is None:
+        print("model bulunamadı")
+        return 1
+    if isinstance(predictor.model, ForestModel) or predictor.engine is None:
+        print("sklearn orman modeli gerekli (.joblib/.pkl), .forest değil")
+        return 1
+
+    sk_model = predictor.model
+    native = predictor.engine
+
+    start = np.datetime64("2025-01-01T00", "h")
+    print(
+        f"{'batch':>9} {'sklearn ms':>12} {'native ms':>12} {'speedup':>8}"
+        f" {'max|diff|':>10} {'auto':>8}"
+    )
+    for n in BATCH_SIZES:
+        hours = start + np.arange(n).astype("timedelta64[h]")
+        features = predictor.create_features(hours)
+        matrix = np.asarray(features, dtype=np.float32)
+
+        sk_s, sk_out = _timeit(lambda: sk_model.predict(features))
+        nat_s, nat_out = _timeit(lambda: native.predict(matrix))
+        diff = np.abs(sk_out - nat_out).max()
+        auto = "native" if n <= predictor.NATIVE_MAX_ROWS else "sklearn"
+        print(
+            f"{n:>9} {sk_s * 1e3:>12.2f} {nat_s * 1e3:>12.2f} {sk_s / nat_s:>7.1f}x"
+            f" {diff:>10.2e} {auto:>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
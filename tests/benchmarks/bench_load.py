@@ -0,0 +1,360 @@
+"""
+Sıcak yollar için yük kıyaslaması: çekme (fetch_weather_bundle), önbellek
+(ForecastCache put/get) ve WeatherPredictor.predict, artan eşzamanlılıkta.
+
+Çekme senaryosu ayrı bir süreçte çalışan yerel Open-Meteo taklidine
+(fake_openmeteo.py) gider; gecikme, hata oranı ve yanıt boyutu
+ayarlanabilir. Her senaryo ve eşzamanlılık için p50/p95/p99 gecikme,
+işlem hacmi, hata sayısı ve RSS yazılır.
+
+Kullanım:
+    python tests/benchmarks/bench_load.py
+    python tests/benchmarks/bench_load.py --scenarios fetch --latency-ms 80 --error-rate 0.02
+    python tests/benchmarks/bench_load.py --scenarios fetch --response-format flatbuffers
+    python tests/benchmarks/bench_load.py --json out.json
+    python tests/benchmarks/bench_load.py --baseline out.json --tolerance 0.25
+
+--baseline ile verilen önceki koşuya göre p95'i `tolerance` oranından
+fazla kötüleşen satır varsa çıkış kodu 1 olur (yayın öncesi kontrol).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+HERE = Path(__file__).resolve().parent
+SRC = HERE.parents[1] / "src"
+sys.path.insert(0, str(SRC))
+
+from backend import weather_service  # noqa: E402
+from backend.forecast_cache import ForecastCache  # noqa: E402
+from backend.weather_service import WeatherService  # noqa: E402
+
+SCENARIOS = ("fetch", "cache_put", "cache_get", "predict")
+DEFAULT_CONCURRENCY = (1, 4, 16, 64)
+
+
+# ----- ölçüm yardımcıları -----
+def rss_mb() -> Optional[float]:
+    """Anlık yerleşik bellek (MB); ölçülemiyorsa None."""
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux KB, macOS bayt
+        return peak / (2**20 if sys.platform == "darwin" else 2**10)
+    except ImportError:
+        return None
+
+
+async def run_level(
+    op: Callable[[int], Awaitable[bool]], concurrency: int, total: int
+) -> Dict[str, Any]:
+    """`total` işlemi `concurrency` işçiyle koşturur; gecikme dağılımı ve hacim."""
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            t0 = time.perf_counter()
+            try:
+                ok = await op(i)
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - t0)
+            if not ok:
+                errors += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - t0
+    lat = np.array(latencies) * 1e3
+    p50, p95, p99 = np.percentile(lat, [50, 95, 99]) if len(lat) else (np.nan,) * 3
+    return {
+        "concurrency": concurrency,
+        "ops": total,
+        "errors": errors,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "throughput": total / wall if wall else float("nan"),
+        "rss_mb": rss_mb(),
+    }
+
+
+# ----- senaryolar -----
+class FakeServerProcess:
+    """fake_openmeteo.py'yi ayrı süreçte başlatır (sunucu CPU'su ölçüme karışmasın)."""
+
+    def __init__(self, port: int, args: List[str]):
+        self.port = port
+        self.args = args
+        self.proc: Optional[subprocess.Popen] = None
+
+    async def __aenter__(self) -> "FakeServerProcess":
+        self.proc = subprocess.Popen(
+            [sys.executable, str(HERE / "fake_openmeteo.py"), "serve", "--port", str(self.port)]
+            + self.args
+        )
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", self.port)
+                writer.close()
+                return self
+            except OSError:
+                await asyncio.sleep(0.05)
+        raise RuntimeError("sahte sunucu başlamadı")
+
+    async def __aexit__(self, *exc):
+        if self.proc is not None:
+            self.proc.terminate()
+            self.proc.wait(timeout=5)
+
+
+def make_fetch_op(args) -> Callable[[int], Awaitable[bool]]:
+    # tek uçuş/tazelik penceresi kapalı: her istek gerçekten ağa gider
+    service = WeatherService(
+        fresh_window=0.0,
+        limit=max(args.concurrency),
+        limit_per_host=0,
+        response_format=args.response_format,
+    )
+
+    async def op(i: int) -> bool:
+        # farklı koordinatlar: eşzamanlı istekler birleşmesin
+        lat, lon = 36.0 + (i % 500) * 0.01, 26.0 + (i // 500) * 0.01
+        bundle = await service.fetch_bundle(lat, lon, forecast_days=args.days, retries=0)
+        return bundle is not None
+
+    op.service = service  # type: ignore[attr-defined]
+    return op
+
+
+def _sample_bundle(days: int):
+    sys.path.insert(0, str(HERE))
+    from fake_openmeteo import synthetic_item
+
+    from backend.decoding import bundle_from_json
+
+    item = synthetic_item(
+        41.0,
+        29.0,
+        days,
+        weather_service.HOURLY_VARIABLES,
+        weather_service.DAILY_VARIABLES,
+        unixtime=True,
+    )
+    return bundle_from_json(item)
+
+
+def make_cache_ops(args, directory: Path):
+    cache = ForecastCache(directory)
+    bundle = _sample_bundle(args.days)
+    coords = [(36.0 + i * 0.01, 26.0) for i in range(256)]
+    for lat, lon in coords:
+        cache.put(lat, lon, args.days, bundle)
+
+    async def put(i: int) -> bool:
+        lat, lon = coords[i % len(coords)]
+        await asyncio.to_thread(cache.put, lat, lon, args.days, bundle)
+        return True
+
+    async def get(i: int) -> bool:
+        lat, lon = coords[i % len(coords)]
+        # bellek katmanını atla: diskten okuma + çözme ölçülsün
+        cache._mem.pop(cache._path(lat, lon, args.days), None)
+        return await asyncio.to_thread(cache.get, lat, lon, args.days) is not None
+
+    return put, get
+
+
+def make_predict_op(args) -> Optional[Callable[[int], Awaitable[bool]]]:
+    from frontend.views.weather_predictor import WeatherPredictor
+
+    predictor = WeatherPredictor(args.model)
+    if predictor.model is None and args.model is None:
+        from synthetic_model import synthetic_model_path
+
+        predictor = WeatherPredictor(synthetic_model_path())
+    if predictor.model is None:
+        print("[bench_load] model bulunamadı, predict senaryosu atlandı")
+        return None
+    start = np.datetime64("2025-01-01T00", "h")
+
+    async def op(i: int) -> bool:
+        # her istek farklı 24 saat (tahmin önbelleği devrede değil)
+        hours = start + np.arange(i * 24, (i + 1) * 24).astype("timedelta64[h]")
+        frame = await asyncio.to_thread(predictor.predict, hours)
+        return not frame.empty
+
+    return op
+
+
+# ----- rapor -----
+def print_header():
+    print(
+        f"{'scenario':>10} {'conc':>5} {'ops':>6} {'err':>5} {'p50 ms':>9}"
+        f" {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>9} {'RSS MB':>8}"
+    )
+
+
+def print_row(r: Dict[str, Any]):
+    rss = f"{r['rss_mb']:.1f}" if r["rss_mb"] is not None else "-"
+    print(
+        f"{r['scenario']:>10} {r['concurrency']:>5} {r['ops']:>6} {r['errors']:>5}"
+        f" {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f}"
+        f" {r['throughput']:>9.1f} {rss:>8}"
+    )
+
+
+def compare_baseline(
+    rows: List[Dict[str, Any]], path: str, tolerance: float, min_delta_ms: float
+) -> int:
+    base = {
+        (r["scenario"], r["concurrency"]): r
+        for r in json.loads(Path(path).read_text(encoding="utf-8"))["results"]
+    }
+    regressions = 0
+    for r in rows:
+        old = base.get((r["scenario"], r["concurrency"]))
+        if not old or not old["p95_ms"]:
+            continue
+        change = r["p95_ms"] / old["p95_ms"] - 1.0
+        # alt-milisaniye satırlarda gürültü oranı büyütür: mutlak eşik de gerekli
+        if change > tolerance and r["p95_ms"] - old["p95_ms"] > min_delta_ms:
+            regressions += 1
+            print(
+                f"[bench_load] GERİLEME {r['scenario']} x{r['concurrency']}: "
+                f"p95 {old['p95_ms']:.2f} -> {r['p95_ms']:.2f} ms ({change:+.0%})"
+            )
+    if not regressions:
+        print(f"[bench_load] {path} ile karşılaştırıldı: gerileme yok")
+    return 1 if regressions else 0
+
+
+async def run(args) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+
+    print_header()
+
+    async def bench(name: str, op, total: int):
+        for c in args.concurrency:
+            await op(0)  # ısınma (bağlantı, model, import)
+            res = await run_level(op, c, total)
+            res["scenario"] = name
+            rows.append(res)
+            print_row(res)
+
+    if "fetch" in args.scenarios:
+        server_args = [
+            "--latency-ms", str(args.latency_ms),
+            "--jitter-ms", str(args.jitter_ms),
+            "--error-rate", str(args.error_rate),
+            "--drop-rate", str(args.drop_rate),
+            "--extra-vars", str(args.extra_vars),
+        ]
+        if args.replay:
+            server_args += ["--replay", args.replay]
+        async with FakeServerProcess(args.port, server_args):
+            weather_service.BASE_URL = f"http://127.0.0.1:{args.port}/v1/forecast"
+            op = make_fetch_op(args)
+            await bench("fetch", op, args.requests)
+            await op.service.close()
+
+    if {"cache_put", "cache_get"} & set(args.scenarios):
+        with tempfile.TemporaryDirectory() as tmp:
+            put, get = make_cache_ops(args, Path(tmp))
+            if "cache_put" in args.scenarios:
+                await bench("cache_put", put, args.requests)
+            if "cache_get" in args.scenarios:
+                await bench("cache_get", get, args.requests)
+
+    if "predict" in args.scenarios:
+        op = make_predict_op(args)
+        if op is not None:
+            await bench("predict", op, args.requests)
+    return rows
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="WeatherWidget yük kıyaslaması")
+    ap.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=SCENARIOS)
+    ap.add_argument(
+        "--concurrency",
+        type=lambda s: [int(v) for v in s.split(",")],
+        default=list(DEFAULT_CONCURRENCY),
+        help="virgüllü liste, ör. 1,4,16,64",
+    )
+    ap.add_argument("--requests", type=int, default=200, help="seviye başına işlem")
+    ap.add_argument("--days", type=int, default=16)
+    ap.add_argument("--port", type=int, default=8790)
+    ap.add_argument("--latency-ms", type=float, default=50.0)
+    ap.add_argument("--jitter-ms", type=float, default=20.0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--drop-rate", type=float, default=0.0)
+    ap.add_argument("--extra-vars", type=int, default=0, help="yanıt boyutu için ek saatlik seri")
+    ap.add_argument("--replay", default=None, help="kayıtlı yanıt klasörü")
+    ap.add_argument(
+        "--response-format",
+        default="json",
+        choices=weather_service.RESPONSE_FORMATS,
+        help="fetch yanıt biçimi (flatbuffers: openmeteo_sdk gerekir)",
+    )
+    ap.add_argument(
+        "--model", default=None, help="model yolu (predict); yoksa sentetik orman"
+    )
+    ap.add_argument("--json", default=None, help="sonuçları bu dosyaya yaz")
+    ap.add_argument("--baseline", default=None, help="karşılaştırılacak önceki --json çıktısı")
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    ap.add_argument("--min-delta-ms", type=float, default=1.0)
+    args = ap.parse_args(argv)
+
+    print(
+        f"[bench_load] python {sys.version.split()[0]}, numpy {np.__version__}, "
+        f"RSS başlangıç {rss_mb() or 0:.1f} MB"
+    )
+    rows = asyncio.run(run(args))
+    peak = peak_rss_mb()
+    if peak is not None:
+        print(f"[bench_load] en yüksek RSS: {peak:.1f} MB")
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps(
+                {"args": {k: v for k, v in vars(args).items()}, "peak_rss_mb": peak, "results": rows},
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+    if args.baseline:
+        return compare_baseline(rows, args.baseline, args.tolerance, args.min_delta_ms)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
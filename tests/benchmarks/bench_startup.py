@@ -0,0 +1,173 @@
+"""
+Açılış (import) süresi raporu: `python -X importtime` ile her giriş
+modülünü temiz bir süreçte içe aktarır, toplam süreyi ve en ağır paketleri
+yazdırır.
+
+Widget ve servis ilk pencereyi / ilk yanıtı ML yığını olmadan açmalıdır:
+pandas, sklearn, joblib ve skops yalnızca tahmin modeli ilk kez
+çalıştığında yüklenir. ML_FREE hedeflerinden biri bunları içe aktarırsa
+satır "ML!" ile işaretlenir ve çıkış kodu 1 olur.
+
+Kullanım:
+    python tests/benchmarks/bench_startup.py
+    python tests/benchmarks/bench_startup.py --repeat 7 --top 15
+    python tests/benchmarks/bench_startup.py --json startup.json
+    python tests/benchmarks/bench_startup.py --baseline startup.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+SRC = Path(__file__).resolve().parents[2] / "src"
+
+TARGETS = (
+    "backend.weather_service",
+    "backend.cities",
+    "frontend.views.weather_predictor",
+    "frontend.views.main_widget",
+    "daemon",
+    "app",
+)
+# açılışta yüklenmemesi gereken paketler
+ML_MODULES = ("pandas", "sklearn", "joblib", "skops")
+ML_FREE = TARGETS
+
+
+def _parse_importtime(stderr: str) -> Tuple[int, Dict[str, int]]:
+    """(hedefin toplam süresi µs, kök paket -> kendi süreleri toplamı µs)."""
+    total = 0
+    by_package: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        root = name.strip().split(".", 1)[0]
+        by_package[root] = by_package.get(root, 0) + int(self_us)
+        if not name.startswith("  "):
+            # girintisiz satırlar doğrudan içe aktarılanlar; sonuncusu hedef
+            total = int(cumulative_us)
+    return total, by_package
+
+
+def measure(target: str) -> Dict[str, Any]:
+    """Hedefi temiz bir yorumlayıcıda bir kez içe aktarır."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    code = (
+        f"import {target}, sys, json; "
+        f"print(json.dumps([m for m in {ML_MODULES!r} if m in sys.modules]))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=str(SRC),
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{target} içe aktarılamadı:\n{proc.stderr[-2000:]}")
+    total_us, by_package = _parse_importtime(proc.stderr)
+    return {
+        "total_ms": total_us / 1000.0,
+        "packages": by_package,
+        "ml_loaded": json.loads(proc.stdout.strip().splitlines()[-1]),
+    }
+
+
+def run_target(target: str, repeat: int) -> Dict[str, Any]:
+    # ilk koşu .pyc/disk önbelleğini ısıtır, ölçüme katılmaz
+    measure(target)
+    runs = [measure(target) for _ in range(repeat)]
+    best = min(runs, key=lambda r: r["total_ms"])
+    return {
+        "target": target,
+        "median_ms": statistics.median(r["total_ms"] for r in runs),
+        "min_ms": best["total_ms"],
+        "packages_ms": {
+            k: v / 1000.0
+            for k, v in sorted(best["packages"].items(), key=lambda kv: -kv[1])
+        },
+        "ml_loaded": best["ml_loaded"],
+    }
+
+
+def print_row(r: Dict[str, Any], top: int):
+    flag = " ML!" if r["target"] in ML_FREE and r["ml_loaded"] else ""
+    heavy = ", ".join(
+        f"{name} {ms:.0f}" for name, ms in list(r["packages_ms"].items())[:top]
+    )
+    print(
+        f"{r['target']:>34} {r['median_ms']:>9.1f} {r['min_ms']:>9.1f}{flag}\n"
+        f"{'':>34} en ağır (ms): {heavy}"
+    )
+    if flag:
+        print(f"{'':>34} yüklenen ML paketleri: {', '.join(r['ml_loaded'])}")
+
+
+def compare_baseline(
+    rows: List[Dict[str, Any]], path: str, tolerance: float, min_delta_ms: float
+) -> int:
+    base = {
+        r["target"]: r
+        for r in json.loads(Path(path).read_text(encoding="utf-8"))["results"]
+    }
+    regressions = 0
+    for r in rows:
+        old = base.get(r["target"])
+        if not old or not old["median_ms"]:
+            continue
+        change = r["median_ms"] / old["median_ms"] - 1.0
+        if change > tolerance and r["median_ms"] - old["median_ms"] > min_delta_ms:
+            regressions += 1
+            print(
+                f"[bench_startup] GERİLEME {r['target']}: "
+                f"{old['median_ms']:.1f} -> {r['median_ms']:.1f} ms ({change:+.0%})"
+            )
+    if not regressions:
+        print(f"[bench_startup] {path} ile karşılaştırıldı: gerileme yok")
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="WeatherWidget açılış (import) süresi")
+    ap.add_argument("--targets", nargs="+", default=list(TARGETS))
+    ap.add_argument("--repeat", type=int, default=5, help="hedef başına ölçüm")
+    ap.add_argument("--top", type=int, default=8, help="gösterilecek en ağır paket sayısı")
+    ap.add_argument("--json", default=None, help="sonuçları bu dosyaya yaz")
+    ap.add_argument("--baseline", default=None, help="karşılaştırılacak önceki --json çıktısı")
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    ap.add_argument("--min-delta-ms", type=float, default=20.0)
+    args = ap.parse_args(argv)
+
+    print(f"[bench_startup] python {sys.version.split()[0]}, {args.repeat} tekrar")
+    print(f"{'hedef':>34} {'medyan ms':>9} {'en iyi ms':>9}")
+    rows = []
+    for target in args.targets:
+        r = run_target(target, args.repeat)
+        rows.append(r)
+        print_row(r, args.top)
+
+    status = 0
+    leaks = [r["target"] for r in rows if r["target"] in ML_FREE and r["ml_loaded"]]
+    if leaks:
+        print(f"[bench_startup] ML yığını açılışta yükleniyor: {', '.join(leaks)}")
+        status = 1
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps({"args": vars(args), "results": rows}, indent=2),
+            encoding="utf-8",
+        )
+    if args.baseline:
+        status = max(status, compare_baseline(rows, args.baseline, args.tolerance, args.min_delta_ms))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
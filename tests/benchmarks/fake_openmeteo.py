@@ -0,0 +1,341 @@
+"""
+Yük testleri için yerel Open-Meteo taklidi (aiohttp).
+
+/v1/forecast isteğini gerçek API gibi yanıtlar: virgüllü çoklu koordinat
+(liste yanıt), forecast_days, hourly/daily değişken listeleri,
+timeformat=unixtime|iso8601, current_weather ve `format=flatbuffers`
+(current=... ile; konum başına boyut önekli WeatherApiResponse, `flatbuffers`
+paketi gerekir). Yanıtlar `--replay`
+klasöründeki kayıtlı JSON'lardan (konum sırasıyla döngüsel) ya da
+sentetik olarak üretilir; aynı biçimdeki yanıt bir kez kodlanıp saklanır,
+sunucu maliyeti ölçümü kirletmesin.
+
+Ayarlar: gecikme (ortalama + sapma), hata oranı (HTTP 500), bağlantı
+koparma oranı, ek saatlik değişken sayısı (yanıt boyutu).
+
+Kullanım:
+    python tests/benchmarks/fake_openmeteo.py serve --port 8790 --latency-ms 80 --error-rate 0.02
+    python tests/benchmarks/fake_openmeteo.py record --out recorded/ --coords 41.2,32.6 39.9,32.8
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+
+DEFAULT_PORT = 8790
+UTC_OFFSET_S = 3 * 3600
+
+
+def _iso(ts: int, daily: bool) -> str:
+    fmt = "%Y-%m-%d" if daily else "%Y-%m-%dT%H:%M"
+    return time.strftime(fmt, time.gmtime(ts + UTC_OFFSET_S))
+
+
+def synthetic_item(
+    lat: float,
+    lon: float,
+    days: int,
+    hourly: Sequence[str],
+    daily: Sequence[str],
+    unixtime: bool,
+    extra_vars: int = 0,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Tek konumluk, gerçek yanıtla aynı yapıda sentetik tahmin."""
+    rng = random.Random(seed)
+    now = int(time.time())
+    day0 = (now + UTC_OFFSET_S) // 86400 * 86400 - UTC_OFFSET_S
+    h_times = [day0 + 3600 * k for k in range(days * 24)]
+    d_times = [day0 + 86400 * k for k in range(days)]
+
+    def series(name: str, n: int) -> List[Any]:
+        if "code" in name:
+            return [rng.choice((0, 1, 2, 3, 45, 61, 63, 80, 95)) for _ in range(n)]
+        if name == "is_day":
+            return [1 if 6 <= k % 24 < 19 else 0 for k in range(n)]
+        return [round(rng.gauss(12.0, 6.0), 1) for _ in range(n)]
+
+    h_block: Dict[str, Any] = {
+        "time": h_times if unixtime else [_iso(t, False) for t in h_times]
+    }
+    for name in list(hourly) + [f"extra_{i}" for i in range(extra_vars)]:
+        h_block[name] = series(name, len(h_times))
+    d_block: Dict[str, Any] = {
+        "time": d_times if unixtime else [_iso(t, True) for t in d_times]
+    }
+    for name in daily:
+        d_block[name] = series(name, len(d_times))
+    cur_t = now // 900 * 900
+    return {
+        "latitude": lat,
+        "longitude": lon,
+        "utc_offset_seconds": UTC_OFFSET_S,
+        "timezone": "Europe/Istanbul",
+        "current_weather": {
+            "time": cur_t if unixtime else _iso(cur_t, False),
+            "temperature": round(rng.gauss(12.0, 6.0), 1),
+            "weathercode": 2,
+            "is_day": 1,
+            "windspeed": 7.2,
+            "winddirection": 180,
+        },
+        "hourly": h_block,
+        "daily": d_block,
+    }
+
+
+def _unix_times(values: Sequence[Any], offset: int) -> List[int]:
+    """unixtime ya da yerel ISO metin zaman ekseni -> UTC epoch saniye."""
+    out = []
+    for v in values:
+        if isinstance(v, str):
+            local = datetime.fromisoformat(v).replace(tzinfo=timezone.utc)
+            v = int(local.timestamp()) - offset
+        out.append(int(v))
+    return out
+
+
+def encode_flatbuffers(
+    item: Dict[str, Any],
+    hourly: Sequence[str],
+    daily: Sequence[str],
+    current: Sequence[str],
+) -> bytes:
+    """
+    Tek konumluk yanıtı openmeteo_sdk şemasında (WeatherApiResponse) boyut
+    önekli FlatBuffers mesajına çevirir. Değişkenler istekteki sırayla
+    yazılır; None -> NaN.
+    """
+    import flatbuffers
+    import numpy as np
+
+    offset = int(item.get("utc_offset_seconds", 0))
+    b = flatbuffers.Builder(4096)
+
+    def variables_with_time(t0: int, t_end: int, interval: int, values: List[Any], scalar: bool) -> int:
+        var_offsets = []
+        for v in values:
+            if scalar:
+                b.StartObject(4)
+                b.PrependFloat32Slot(2, float("nan") if v is None else float(v), 0.0)
+            else:
+                arr = np.array(
+                    [np.nan if x is None else x for x in v], dtype=np.float32
+                )
+                vec = b.CreateNumpyVector(arr)
+                b.StartObject(4)
+                b.PrependUOffsetTRelativeSlot(3, vec, 0)
+            var_offsets.append(b.EndObject())
+        b.StartVector(4, len(var_offsets), 4)
+        for o in reversed(var_offsets):
+            b.PrependUOffsetTRelative(o)
+        vars_vec = b.EndVector()
+        b.StartObject(4)
+        b.PrependInt64Slot(0, t0, 0)
+        b.PrependInt64Slot(1, t_end, 0)
+        b.PrependInt32Slot(2, interval, 0)
+        b.PrependUOffsetTRelativeSlot(3, vars_vec, 0)
+        return b.EndObject()
+
+    def block(data: Optional[Dict[str, Any]], names: Sequence[str], interval: int) -> Optional[int]:
+        if not data or not names:
+            return None
+        times = _unix_times(data["time"], offset)
+        if not times:
+            return None
+        return variables_with_time(
+            times[0], times[-1] + interval, interval,
+            [data.get(n, [None] * len(times)) for n in names], scalar=False,
+        )
+
+    h_off = block(item.get("hourly"), hourly, 3600)
+    d_off = block(item.get("daily"), daily, 86400)
+    c_off = None
+    cw = item.get("current_weather") or {}
+    cur = item.get("current") or {}
+    if current and (cw or cur):
+        # current_weather anahtarları current=... değişken adlarına
+        aliases = {"temperature_2m": "temperature", "weather_code": "weathercode"}
+        values = [cur.get(n, cw.get(aliases.get(n, n))) for n in current]
+        t = _unix_times([cur.get("time", cw.get("time", 0))], offset)[0]
+        c_off = variables_with_time(t, t + 900, 900, values, scalar=True)
+
+    b.StartObject(12)
+    b.PrependFloat32Slot(0, float(item.get("latitude", 0.0)), 0.0)
+    b.PrependFloat32Slot(1, float(item.get("longitude", 0.0)), 0.0)
+    b.PrependInt32Slot(6, offset, 0)
+    if c_off is not None:
+        b.PrependUOffsetTRelativeSlot(9, c_off, 0)
+    if d_off is not None:
+        b.PrependUOffsetTRelativeSlot(10, d_off, 0)
+    if h_off is not None:
+        b.PrependUOffsetTRelativeSlot(11, h_off, 0)
+    b.FinishSizePrefixed(b.EndObject())
+    return bytes(b.Output())
+
+
+class FakeOpenMeteo:
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        extra_vars: int = 0,
+        replay_dir: Optional[str] = None,
+        seed: int = 1,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.extra_vars = extra_vars
+        self._rng = random.Random(seed)
+        self._replay = self._load_replay(replay_dir) if replay_dir else []
+        self._rendered: Dict[Tuple, bytes] = {}
+        self.stats = {"requests": 0, "errors": 0, "drops": 0, "bytes": 0}
+
+    @staticmethod
+    def _load_replay(directory: str) -> List[Dict[str, Any]]:
+        items: List[Dict[str, Any]] = []
+        for p in sorted(Path(directory).glob("*.json")):
+            data = json.loads(p.read_text(encoding="utf-8"))
+            items.extend(data if isinstance(data, list) else [data])
+        if not items:
+            raise SystemExit(f"{directory} içinde kayıtlı yanıt yok")
+        return items
+
+    def _body(self, query: Any) -> bytes:
+        lats = [float(v) for v in query["latitude"].split(",")]
+        lons = [float(v) for v in query["longitude"].split(",")]
+        days = int(query.get("forecast_days", 7))
+        hourly = tuple(filter(None, query.get("hourly", "").split(",")))
+        daily = tuple(filter(None, query.get("daily", "").split(",")))
+        current = tuple(filter(None, query.get("current", "").split(",")))
+        flat = query.get("format") == "flatbuffers"
+        unixtime = flat or query.get("timeformat") == "unixtime"
+        key = (len(lats), days, hourly, daily, current, unixtime, flat)
+        body = self._rendered.get(key)
+        if body is None:
+            if self._replay:
+                items = [self._replay[i % len(self._replay)] for i in range(len(lats))]
+            else:
+                items = [
+                    synthetic_item(
+                        lat, lon, days, hourly, daily, unixtime, self.extra_vars, seed=i
+                    )
+                    for i, (lat, lon) in enumerate(zip(lats, lons))
+                ]
+            if flat:
+                body = b"".join(
+                    encode_flatbuffers(it, hourly, daily, current) for it in items
+                )
+            else:
+                payload = items if len(items) > 1 else items[0]
+                body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+            self._rendered[key] = body
+        return body
+
+    async def handle_forecast(self, request: web.Request) -> web.StreamResponse:
+        self.stats["requests"] += 1
+        delay = max(0.0, self.latency_ms + self._rng.uniform(-1, 1) * self.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000.0)
+        roll = self._rng.random()
+        if roll < self.drop_rate:
+            self.stats["drops"] += 1
+            # yanıtsız bağlantı kopması (ServerDisconnectedError)
+            request.transport.close()
+            return web.Response(status=500)
+        if roll < self.drop_rate + self.error_rate:
+            self.stats["errors"] += 1
+            return web.json_response({"error": True, "reason": "fake"}, status=500)
+        body = self._body(request.query)
+        self.stats["bytes"] += len(body)
+        content_type = (
+            "application/octet-stream"
+            if request.query.get("format") == "flatbuffers"
+            else "application/json"
+        )
+        return web.Response(body=body, content_type=content_type)
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats)
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/v1/forecast", self.handle_forecast)
+        app.router.add_get("/stats", self.handle_stats)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> web.AppRunner:
+        runner = web.AppRunner(self.make_app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+
+async def _record(out: str, coords: Sequence[Tuple[float, float]], days: int):
+    """Gerçek API'den yanıt kaydı (tekrar oynatmak için)."""
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+    import aiohttp
+
+    from backend.weather_service import _build_url
+
+    out_dir = Path(out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    async with aiohttp.ClientSession() as sess:
+        for lat, lon in coords:
+            async with sess.get(_build_url(lat, lon, forecast_days=days)) as resp:
+                resp.raise_for_status()
+                data = await resp.json()
+            path = out_dir / f"{lat:.4f}_{lon:.4f}_{days}d.json"
+            path.write_text(json.dumps(data), encoding="utf-8")
+            print(f"[fake_openmeteo] kaydedildi: {path}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("serve")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=DEFAULT_PORT)
+    s.add_argument("--latency-ms", type=float, default=0.0)
+    s.add_argument("--jitter-ms", type=float, default=0.0)
+    s.add_argument("--error-rate", type=float, default=0.0)
+    s.add_argument("--drop-rate", type=float, default=0.0)
+    s.add_argument("--extra-vars", type=int, default=0)
+    s.add_argument("--replay", default=None, help="kayıtlı JSON yanıt klasörü")
+    r = sub.add_parser("record")
+    r.add_argument("--out", required=True)
+    r.add_argument("--coords", nargs="+", required=True, help="lat,lon ...")
+    r.add_argument("--days", type=int, default=16)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "record":
+        coords = [tuple(float(v) for v in c.split(",")) for c in args.coords]
+        asyncio.run(_record(args.out, coords, args.days))
+        return 0
+
+    server = FakeOpenMeteo(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        extra_vars=args.extra_vars,
+        replay_dir=args.replay,
+    )
+    web.run_app(server.make_app(), host=args.host, port=args.port, access_log=None, print=None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
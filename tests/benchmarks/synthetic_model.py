@@ -0,0 +1,62 @@
+"""
+Depoda eğitilmiş model olmadığında kıyaslamalar için sentetik orman.
+
+Eğitimdeki yapı (backend.training.build_model: MultiOutputRegressor +
+RandomForestRegressor, FEATURE_COLUMNS sırasında DataFrame) ile, mevsimsel
+ve günlük döngülü yapay saatlik veri üzerinde eğitilir. Sonuç geçici
+dizinde parametrelere göre saklanır; sonraki koşular yeniden eğitmez.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+SRC = Path(__file__).resolve().parents[2] / "src"
+sys.path.insert(0, str(SRC))
+
+from backend.features import FEATURE_COLUMNS  # noqa: E402
+from frontend.views.weather_predictor import WeatherPredictor  # noqa: E402
+
+CACHE_DIR = Path(tempfile.gettempdir()) / "weatherwidget-bench"
+
+
+def synthetic_model_path(
+    n_estimators: int = 100, years: int = 2, random_state: int = 0
+) -> str:
+    """Sentetik .joblib modelinin yolu; yoksa eğitip yazar."""
+    path = CACHE_DIR / f"synthetic_{n_estimators}t_{years}y_{random_state}.joblib"
+    if path.is_file():
+        return str(path)
+
+    import joblib
+    import pandas as pd
+
+    from backend.training import build_model
+
+    print(f"[bench] sentetik model eğitiliyor ({n_estimators} ağaç, {years} yıl)...")
+    hours = np.arange(
+        np.datetime64("2023-01-01T00", "h"),
+        np.datetime64("2023-01-01T00", "h") + np.timedelta64(years * 8760, "h"),
+    )
+    X = pd.DataFrame(WeatherPredictor.feature_matrix(hours), columns=FEATURE_COLUMNS)
+    rng = np.random.default_rng(random_state)
+    doy = X["day_of_year"].to_numpy()
+    hour = X["hour"].to_numpy()
+    temp = (
+        12
+        - 10 * np.cos(2 * np.pi * (doy - 15) / 365)
+        - 4 * np.cos(2 * np.pi * (hour - 3) / 24)
+        + rng.normal(0, 2, len(X))
+    )
+    precip = np.clip(rng.gamma(0.3, 1.5, len(X)) * (1.2 + np.cos(2 * np.pi * doy / 365)), 0, None)
+    model = build_model(n_estimators=n_estimators, random_state=random_state)
+    model.fit(X, np.column_stack([temp, precip]))
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    joblib.dump(model, tmp)
+    tmp.replace(path)
+    print(f"[bench] yazıldı: {path}")
+    return str(path)
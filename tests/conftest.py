@@ -0,0 +1,47 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+HERE = Path(__file__).resolve().parent
+# src/ paketleri ve benchmarks/fake_openmeteo.py (yerel Open-Meteo taklidi)
+sys.path.insert(0, str(HERE.parent / "src"))
+sys.path.insert(0, str(HERE / "benchmarks"))
+
+
+@pytest.fixture
+def fake_server():
+    """
+    `run(coro_fn, **server_kw)`: yerel Open-Meteo taklidini boş bir portta
+    başlatır, BASE_URL'i ona yönlendirir ve `coro_fn(server, make_service)`
+    sonucunu döndürür. Açılan servisler ve sunucu sonunda kapatılır.
+    """
+    from backend import weather_service
+    from backend.weather_service import WeatherService
+    from fake_openmeteo import FakeOpenMeteo
+
+    def run(coro_fn, **server_kw):
+        async def main():
+            server = FakeOpenMeteo(**server_kw)
+            runner = await server.start(port=0)
+            port = runner.addresses[0][1]
+            old_url = weather_service.BASE_URL
+            weather_service.BASE_URL = f"http://127.0.0.1:{port}/v1/forecast"
+            services = []
+
+            def make(**kw) -> WeatherService:
+                services.append(WeatherService(**kw))
+                return services[-1]
+
+            try:
+                return await coro_fn(server, make)
+            finally:
+                weather_service.BASE_URL = old_url
+                for s in services:
+                    await s.close()
+                await runner.cleanup()
+
+        return asyncio.run(main())
+
+    return run
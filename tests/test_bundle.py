@@ -0,0 +1,81 @@
+import numpy as np
+
+from backend.bundle import INT_NULL, WeatherBundle
+
+HOURS = [f"2025-01-0{1 + i // 24}T{i % 24:02d}:00" for i in range(48)]
+
+
+def _bundle(overlay=None) -> WeatherBundle:
+    temps = [float(i) / 2 for i in range(48)]
+    temps[5] = None
+    codes = [i % 4 for i in range(48)]
+    codes[7] = None
+    return WeatherBundle.from_dict(
+        {
+            "current": {"temperature": 5.3, "weathercode": 2, "is_day": 1},
+            "hourly": {"time": HOURS, "temperature_2m": temps, "weathercode": codes},
+            "daily": {
+                "time": ["2025-01-01", "2025-01-02"],
+                "temperature_2m_max": [9.5, None],
+                "weathercode": [61, 3],
+            },
+            "overlay": overlay,
+        }
+    )
+
+
+def test_bytes_round_trip_keeps_columns_and_meta():
+    src = _bundle()
+    meta = {"fetched_at": 1.5, "expires_at": 2.5}
+    out, got_meta = WeatherBundle.from_bytes(src.to_bytes(meta))
+
+    assert got_meta == meta
+    assert out.current == src.current
+    for block in ("hourly", "daily"):
+        a, b = getattr(src, block), getattr(out, block)
+        assert a.keys() == b.keys()
+        np.testing.assert_array_equal(a.time, b.time)
+        for name in a.columns:
+            np.testing.assert_array_equal(a[name], b[name])
+            assert a[name].dtype == b[name].dtype
+    assert out.to_dict() == src.to_dict()
+
+
+def test_round_trip_preserves_missing_values():
+    out, _ = WeatherBundle.from_bytes(_bundle().to_bytes())
+    assert np.isnan(out.hourly["temperature_2m"][5])
+    assert out.hourly["weathercode"][7] == INT_NULL
+    d = out.to_dict()
+    assert d["hourly"]["temperature_2m"][5] is None
+    assert d["hourly"]["weathercode"][7] is None
+    assert d["daily"]["temperature_2m_max"][1] is None
+
+
+def test_from_bytes_rejects_foreign_data():
+    try:
+        WeatherBundle.from_bytes(b"not a bundle at all")
+    except Exception:
+        return
+    raise AssertionError("tanınmayan veri kabul edildi")
+
+
+def test_window_slices_overlay_with_blocks():
+    overlay = {
+        "model": "m",
+        "hourly": {"temperature_2m": list(range(48)), "agreement": list(range(100, 148))},
+        "daily": {"temperature_2m_max": [10.0, 20.0]},
+    }
+    src = _bundle(overlay)
+    w = src.window("2025-01-01T20", "2025-01-02T02")
+
+    assert w.hourly.size == 6
+    assert w.overlay["model"] == "m"
+    assert w.overlay["hourly"]["temperature_2m"] == list(range(20, 26))
+    assert w.overlay["hourly"]["agreement"] == list(range(120, 126))
+    assert w.overlay["daily"]["temperature_2m_max"] == [10.0]
+    # kaynak değişmez
+    assert len(src.overlay["hourly"]["temperature_2m"]) == 48
+
+
+def test_window_without_overlay():
+    assert _bundle().window("2025-01-01T20").overlay is None
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from backend.decoding import flatbuffers_available
+
+
+@pytest.mark.skipif(not flatbuffers_available(), reason="openmeteo_sdk kurulu değil")
+def test_flatbuffers_matches_json(fake_server):
+    coords = [(36.0, 30.0), (37.0, 31.0), (38.0, 32.0)]
+
+    async def body(server, make):
+        js = await make(response_format="json", fresh_window=0.0).fetch_bundles(coords, 3)
+        fb = await make(response_format="flatbuffers", fresh_window=0.0).fetch_bundles(
+            coords, 3
+        )
+        for a, b in zip(js, fb):
+            assert a is not None and b is not None
+            for block in ("hourly", "daily"):
+                x, y = getattr(a, block), getattr(b, block)
+                np.testing.assert_array_equal(x.time, y.time)
+                assert set(x.columns) == set(y.columns)
+                for name in x.columns:
+                    np.testing.assert_array_equal(x[name], y[name])
+            assert b.current["temperature"] == pytest.approx(a.current["temperature"], abs=1e-4)
+            assert b.current["weathercode"] == a.current["weathercode"]
+            assert b.current["time"] == a.current["time"]
+
+    fake_server(body)
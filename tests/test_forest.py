@@ -0,0 +1,159 @@
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+from sklearn.ensemble import RandomForestRegressor  # noqa: E402
+from sklearn.multioutput import MultiOutputRegressor  # noqa: E402
+
+from backend.features import FEATURE_COLUMNS  # noqa: E402
+from frontend.views.weather_predictor import (  # noqa: E402
+    ForestModel,
+    WeatherPredictor,
+    export_forest,
+)
+
+HOURS = np.arange("2024-01-01T00", "2024-03-01T00", dtype="datetime64[h]")
+
+
+def _training_data(n_outputs: int):
+    X = WeatherPredictor.feature_matrix(HOURS)
+    rng = np.random.default_rng(0)
+    y = np.column_stack(
+        [X[:, 2] * 0.3 + X[:, 0] + rng.normal(0, 1, len(X)) for _ in range(n_outputs)]
+    )
+    return X, (y[:, 0] if n_outputs == 1 else y)
+
+
+@pytest.fixture(scope="module")
+def single():
+    X, y = _training_data(1)
+    return RandomForestRegressor(n_estimators=8, max_depth=6, random_state=0).fit(X, y), X
+
+
+@pytest.fixture(scope="module")
+def multi():
+    X, y = _training_data(2)
+    model = MultiOutputRegressor(
+        RandomForestRegressor(n_estimators=6, max_depth=5, random_state=0)
+    ).fit(X, y)
+    return model, X
+
+
+def test_native_matches_sklearn_single_output(single):
+    model, X = single
+    np.testing.assert_allclose(
+        ForestModel.from_sklearn(model).predict(X), model.predict(X), rtol=0, atol=1e-9
+    )
+
+
+def test_native_matches_sklearn_multi_output(multi):
+    model, X = multi
+    native = ForestModel.from_sklearn(model).predict(X)
+    assert native.shape == (len(X), 2)
+    np.testing.assert_allclose(native, model.predict(X), rtol=0, atol=1e-9)
+
+
+def test_single_row(multi):
+    model, X = multi
+    np.testing.assert_allclose(
+        ForestModel.from_sklearn(model).predict(X[7]), model.predict(X[7:8]), atol=1e-9
+    )
+
+
+def test_forest_file_round_trip(multi, tmp_path):
+    model, X = multi
+    path = export_forest(model, tmp_path / "m.forest")
+    loaded = ForestModel.load(path)
+    np.testing.assert_allclose(loaded.predict(X), model.predict(X), rtol=0, atol=1e-9)
+    assert loaded.fingerprint == ForestModel.from_sklearn(model).fingerprint
+
+
+def test_load_rejects_other_files(tmp_path):
+    p = tmp_path / "x.forest"
+    p.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        ForestModel.load(p)
+
+
+def _frame_model(columns):
+    pd = pytest.importorskip("pandas")
+    X, y = _training_data(1)
+    frame = pd.DataFrame(X, columns=FEATURE_COLUMNS)[columns]
+    return RandomForestRegressor(n_estimators=4, max_depth=4, random_state=0).fit(frame, y)
+
+
+@pytest.mark.parametrize("suffix", [".forest", ".joblib"])
+def test_predictor_rejects_other_feature_order(tmp_path, suffix):
+    joblib = pytest.importorskip("joblib")
+    model = _frame_model(FEATURE_COLUMNS[::-1])
+    path = tmp_path / f"m{suffix}"
+    if suffix == ".forest":
+        export_forest(model, path)
+        assert ForestModel.load(path).feature_names == FEATURE_COLUMNS[::-1]
+    else:
+        joblib.dump(model, path)
+    assert WeatherPredictor(str(path)).model is None
+
+
+def test_predictor_accepts_training_feature_order(tmp_path):
+    pd = pytest.importorskip("pandas")
+    model = _frame_model(FEATURE_COLUMNS)
+    path = export_forest(model, tmp_path / "m.forest")
+    predictor = WeatherPredictor(str(path))
+    assert predictor.model is not None
+    hours = HOURS[:5]
+    frame = pd.DataFrame(WeatherPredictor.feature_matrix(hours), columns=FEATURE_COLUMNS)
+    np.testing.assert_allclose(
+        predictor.predict_array(hours, prefetch=False)["temperature_2m"],
+        model.predict(frame).astype(np.float32),
+    )
+
+
+def test_predictor_rejects_wrong_feature_count(tmp_path):
+    X, y = _training_data(1)
+    model = RandomForestRegressor(n_estimators=2, max_depth=3, random_state=0)
+    model.fit(X[:, :5], y)
+    path = export_forest(model, tmp_path / "m.forest")
+    assert WeatherPredictor(str(path)).model is None
+
+
+def test_predictor_uses_wall_clock_for_tz_aware_times(multi, tmp_path):
+    pd = pytest.importorskip("pandas")
+    model, _ = multi
+    predictor = WeatherPredictor(str(export_forest(model, tmp_path / "m.forest")))
+    naive = pd.date_range("2024-01-10T10:00", periods=6, freq="h")
+    aware = naive.tz_localize("Europe/Istanbul")
+    expected = predictor.predict_array(naive.to_numpy(), prefetch=False)
+    for given in (aware, list(aware)):
+        np.testing.assert_array_equal(predictor.predict_array(given, prefetch=False), expected)
+    assert predictor.predict(aware)["date"].tolist() == predictor.predict(naive)["date"].tolist()
+    np.testing.assert_array_equal(
+        predictor.predict(aware).iloc[:, 1:].to_numpy(),
+        predictor.predict(naive).iloc[:, 1:].to_numpy(),
+    )
+
+
+def test_stale_forest_does_not_shadow_newer_joblib(tmp_path, monkeypatch):
+    from frontend.views import weather_predictor
+
+    monkeypatch.delenv("WEATHER_MODEL_PATH", raising=False)
+    monkeypatch.chdir(tmp_path)
+    forest = tmp_path / "weather_prediction_model.forest"
+    joblib_path = tmp_path / "weather_prediction_model.joblib"
+    forest.write_bytes(b"f")
+    joblib_path.write_bytes(b"j")
+    if weather_predictor._find_model_path(None) not in (str(forest), str(joblib_path)):
+        pytest.skip("depoda model dosyası var; cwd adayları denenmiyor")
+
+    os.utime(joblib_path, ns=(1_000_000_000, 1_000_000_000))
+    os.utime(forest, ns=(2_000_000_000, 2_000_000_000))
+    assert weather_predictor._find_model_path(None) == str(forest)
+
+    # yeniden eğitildi, repack_model.py çalıştırılmadı
+    os.utime(joblib_path, ns=(3_000_000_000, 3_000_000_000))
+    assert weather_predictor._find_model_path(None) == str(joblib_path)
+    # açıkça verilen yola dokunulmaz
+    assert weather_predictor._find_model_path(str(forest)) == str(forest)
@@ -0,0 +1,96 @@
+"""
+Paketlenmiş uygulama pandas'sız gelir (WeatherWidget.spec `excludes`);
+uygulama yolları yalnızca NumPy API'sini kullanmalı.
+"""
+import ast
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+# paketlenen uygulamanın giriş noktaları ve tahminciyi çağıran modüller
+FROZEN_MODULES = [
+    SRC / "app.py",
+    SRC / "daemon.py",
+    SRC / "frontend" / "views" / "main_widget.py",
+]
+LEGACY_API = {"create_features", "predict", "apredict"}
+
+
+def test_spec_excludes_pandas():
+    assert "'pandas'" in (ROOT / "WeatherWidget.spec").read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("path", FROZEN_MODULES, ids=lambda p: p.name)
+def test_frozen_modules_avoid_pandas_api(path):
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            names = [a.name for a in node.names] + [getattr(node, "module", None) or ""]
+            assert not any(n.split(".")[0] == "pandas" for n in names), node.lineno
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            assert node.func.attr not in LEGACY_API, (
+                f"{path.name}:{node.lineno} eski DataFrame API'si ({node.func.attr})"
+            )
+
+
+def test_numpy_paths_work_without_pandas(tmp_path):
+    pytest.importorskip("sklearn")
+    pytest.importorskip("aiohttp")
+    from sklearn.ensemble import RandomForestRegressor
+
+    from frontend.views.weather_predictor import WeatherPredictor, export_forest
+
+    hours = np.arange("2024-01-01T00", "2024-02-01T00", dtype="datetime64[h]")
+    X = WeatherPredictor.feature_matrix(hours)
+    y = np.column_stack([X[:, 2] * 0.3, X[:, 0] * 0.1])
+    model = RandomForestRegressor(n_estimators=4, max_depth=4, random_state=0).fit(X, y)
+    path = export_forest(model, tmp_path / "m.forest")
+
+    script = textwrap.dedent(
+        f"""
+        import asyncio, sys
+        sys.modules["pandas"] = None  # paketlenmiş uygulamadaki gibi
+        sys.path.insert(0, {str(SRC)!r})
+        import numpy as np
+        import daemon  # noqa: F401
+        from backend.bundle import WeatherBundle
+        from frontend.views.weather_predictor import WeatherPredictor
+
+        p = WeatherPredictor({str(path)!r})
+        t = np.array(["2024-01-05T12"], dtype="datetime64[h]")
+        rec = p.predict_array(t)
+        assert rec is not None and np.isfinite(rec["temperature_2m"][0])
+        arec = asyncio.run(p.apredict_array(t, key="consistency"))
+        assert arec["temperature_2m"][0] == rec["temperature_2m"][0]
+
+        hours = [f"2024-01-05T{{h:02d}}:00" for h in range(24)]
+        bundle = WeatherBundle.from_dict({{
+            "current": {{"temperature": 1.0}},
+            "hourly": {{"time": hours, "temperature_2m": [1.0] * 24}},
+            "daily": {{"time": ["2024-01-05"], "temperature_2m_max": [2.0],
+                       "temperature_2m_min": [0.0]}},
+        }})
+        overlay = p.overlay(bundle)
+        assert overlay is not None and len(overlay["hourly"]["temperature_2m"]) == 24
+
+        for api in ("predict", "create_features"):
+            try:
+                getattr(p, api)(t)
+            except ImportError as e:
+                assert "predict_array" in str(e), e
+            else:
+                raise AssertionError(api + " pandas olmadan çalışmamalı")
+        print("ok")
+        """
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, timeout=120
+    )
+    assert out.returncode == 0, out.stdout + out.stderr
+    assert out.stdout.strip().endswith("ok")
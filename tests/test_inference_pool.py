@@ -0,0 +1,53 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+from sklearn.ensemble import RandomForestRegressor  # noqa: E402
+
+from frontend.views import weather_predictor  # noqa: E402
+from frontend.views.weather_predictor import WeatherPredictor, export_forest  # noqa: E402
+
+HOURS = np.arange("2024-01-01T00", "2024-01-08T00", dtype="datetime64[h]")
+
+
+@pytest.fixture
+def predictor(tmp_path):
+    X = WeatherPredictor.feature_matrix(HOURS)
+    y = np.column_stack([X[:, 2] * 0.3, X[:, 0] * 0.1])
+    model = RandomForestRegressor(n_estimators=3, max_depth=3, random_state=0).fit(X, y)
+    return WeatherPredictor(str(export_forest(model, tmp_path / "m.forest")), max_inflight=1)
+
+
+class _ClosedPool:
+    def submit(self, *args, **kwargs):
+        raise RuntimeError("cannot schedule new futures after shutdown")
+
+
+def test_failed_submit_releases_slot(predictor, monkeypatch):
+    async def main():
+        with monkeypatch.context() as m:
+            m.setattr(weather_predictor, "get_inference_executor", lambda kind: _ClosedPool())
+            for _ in range(3):
+                # yer sızsaydı max_inflight=1 ile ikinci çağrı sonsuza dek beklerdi
+                failed = predictor.apredict_hours(HOURS[:2], prefetch=False)
+                assert await asyncio.wait_for(failed, timeout=5.0) is None
+        return await asyncio.wait_for(
+            predictor.apredict_array(HOURS[:2], prefetch=False), timeout=5.0
+        )
+
+    rec = asyncio.run(main())
+    assert rec is not None and np.isfinite(rec["temperature_2m"]).all()
+
+
+def test_superseded_request_returns_none(predictor):
+    async def main():
+        first = asyncio.ensure_future(predictor.apredict_hours(HOURS[:3], key="k"))
+        second = asyncio.ensure_future(predictor.apredict_hours(HOURS[3:6], key="k"))
+        return await asyncio.gather(first, second)
+
+    first, second = asyncio.run(main())
+    assert first is None
+    assert second is not None and second.shape[0] == 3
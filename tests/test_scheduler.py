@@ -0,0 +1,93 @@
+import asyncio
+import random
+
+import pytest
+
+from backend import scheduler
+from backend.scheduler import RefreshScheduler
+
+
+@pytest.fixture(autouse=True)
+def not_idle(monkeypatch):
+    monkeypatch.setattr(scheduler, "system_idle_seconds", lambda: None)
+
+
+def make(**kw) -> RefreshScheduler:
+    return RefreshScheduler(rng=random.Random(1234), **kw)
+
+
+def test_backoff_bounds_and_cap():
+    s = make(retry_base_s=60.0, retry_max_s=600.0, min_delay_s=0.0)
+    for failures in range(1, 12):
+        s.failures = failures
+        full = min(600.0, 60.0 * 2 ** (failures - 1))
+        for _ in range(200):
+            assert full * 0.5 <= s.next_delay(now=0.0) <= full
+
+
+def test_backoff_respects_min_delay():
+    s = make(retry_base_s=1.0, min_delay_s=30.0)
+    s.record(False)
+    assert all(s.next_delay(now=0.0) == 30.0 for _ in range(50))
+
+
+def test_record_success_resets_backoff():
+    s = make()
+    s.record(False)
+    s.record(False)
+    s.record(True)
+    assert s.failures == 0
+
+
+def test_fresh_delay_jitter_bounds():
+    s = make(jitter_s=90.0, min_delay_s=30.0)
+    delays = [s.next_delay(expires_at=1000.0, now=400.0) for _ in range(500)]
+    assert all(600.0 <= d <= 690.0 for d in delays)
+    # sapma gerçekten dağılmalı, hepsi aynı saniyeye düşmemeli
+    assert max(delays) - min(delays) > 45.0
+
+
+def test_expired_entry_waits_min_delay():
+    s = make(jitter_s=10.0, min_delay_s=30.0)
+    for _ in range(100):
+        assert 30.0 <= s.next_delay(expires_at=100.0, now=500.0) <= 40.0
+
+
+def test_hidden_stretches_delay_up_to_cap():
+    s = make(jitter_s=0.0)
+    s.set_hidden(True)
+    assert s.next_delay(expires_at=100.0, now=0.0) == pytest.approx(
+        100.0 * scheduler.HIDDEN_FACTOR
+    )
+    long_wait = s.next_delay(expires_at=scheduler.SLOW_MAX_S, now=0.0)
+    assert long_wait == pytest.approx(scheduler.SLOW_MAX_S)
+
+
+def test_wake_interrupts_sleep():
+    async def main():
+        s = make()
+        task = asyncio.ensure_future(s.sleep(60.0))
+        await asyncio.sleep(0.01)
+        s.wake()
+        return await asyncio.wait_for(task, 1.0)
+
+    assert asyncio.run(main()) is True
+
+
+def test_sleep_times_out():
+    async def main():
+        return await make().sleep(0.02)
+
+    assert asyncio.run(main()) is False
+
+
+def test_unhide_wakes_sleeper():
+    async def main():
+        s = make()
+        s.set_hidden(True)
+        task = asyncio.ensure_future(s.sleep(60.0))
+        await asyncio.sleep(0.01)
+        s.set_hidden(False)
+        return await asyncio.wait_for(task, 1.0)
+
+    assert asyncio.run(main()) is True
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from backend.features import FEATURE_COLUMNS, TARGET_COLUMNS, date_features  # noqa: E402
+from backend.training import load_training_frame  # noqa: E402
+
+ISTANBUL = "Europe/Istanbul"
+
+
+def test_tz_aware_inputs_use_wall_clock():
+    naive = pd.date_range("2024-06-30T22:00", periods=4, freq="h")
+    aware = naive.tz_localize(ISTANBUL)
+    expected = date_features(naive.to_numpy())
+    assert list(expected["hour"]) == [22, 23, 0, 1]
+
+    py_aware = [
+        datetime(2024, 6, 30, 22, tzinfo=timezone(timedelta(hours=3))) + timedelta(hours=i)
+        for i in range(4)
+    ]
+    for given in (aware, pd.Series(aware), list(aware), py_aware):
+        got = date_features(given)
+        for name in FEATURE_COLUMNS:
+            np.testing.assert_array_equal(got[name], expected[name], err_msg=name)
+
+
+def _write_csv(path, n: int = 300):
+    rng = np.random.default_rng(0)
+    times = pd.date_range("2023-01-01", periods=n, freq="h", tz=ISTANBUL)
+    temp = rng.normal(10, 3, n).astype(np.float32)
+    precip = rng.random(n).astype(np.float32)
+    # seri başı, parça sınırları ve uzun boşluklar; iki sütun farklı yerlerde
+    temp[[0, 1, 49, 50, 51, 99, 100, 150, 299]] = np.nan
+    temp[180:230] = np.nan
+    precip[[2, 48, 49, 101, 102, 103, 200, 298, 299]] = np.nan
+    pd.DataFrame(
+        {
+            "time": times.strftime("%Y-%m-%dT%H:%M%z"),
+            TARGET_COLUMNS[0]: temp,
+            TARGET_COLUMNS[1]: precip,
+        }
+    ).to_csv(path, index=False)
+
+
+@pytest.mark.parametrize("chunksize", [7, 50, 64, 101])
+def test_chunked_training_frame_matches_unchunked(tmp_path, chunksize):
+    path = tmp_path / "hourly.csv"
+    _write_csv(path)
+    whole = load_training_frame(str(path), chunksize=10_000)
+    chunked = load_training_frame(str(path), chunksize=chunksize)
+    # seri başı (ilk 2 satır) ve sonu (son 2 satır) doldurulamaz
+    assert len(whole) == 300 - 2 - 2
+    pd.testing.assert_frame_equal(chunked, whole)
+    assert not whole[TARGET_COLUMNS].isna().any().any()
+    # zaman damgaları yerel (İstanbul) duvar saatine göre
+    assert whole["hour"].iloc[0] == 2
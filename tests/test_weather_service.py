@@ -0,0 +1,70 @@
+import asyncio
+
+
+def test_concurrent_same_location_is_one_request(fake_server):
+    async def body(server, make):
+        service = make(response_format="json")
+        results = await asyncio.gather(
+            *(service.fetch_bundle(41.2, 32.6, forecast_days=3) for _ in range(10))
+        )
+        assert server.stats["requests"] == 1
+        assert all(r is results[0] for r in results)
+        assert service.stats["coalesced"] == 9
+
+    fake_server(body, latency_ms=50)
+
+
+def test_fresh_window_reuses_result(fake_server):
+    async def body(server, make):
+        service = make(response_format="json", fresh_window=30.0)
+        first = await service.fetch_bundle(41.2, 32.6, forecast_days=3)
+        again = await service.fetch_bundle(41.2, 32.6, forecast_days=3)
+        assert again is first
+        assert server.stats["requests"] == 1
+        assert service.stats["fresh_hits"] == 1
+
+    fake_server(body)
+
+
+def test_fresh_window_disabled_refetches(fake_server):
+    async def body(server, make):
+        service = make(response_format="json", fresh_window=0.0)
+        await service.fetch_bundle(41.2, 32.6, forecast_days=3)
+        await service.fetch_bundle(41.2, 32.6, forecast_days=3)
+        assert server.stats["requests"] == 2
+
+    fake_server(body)
+
+
+def test_chunking_and_order(fake_server):
+    coords = [(36.0 + i, 30.0 + i) for i in range(5)]
+
+    async def body(server, make):
+        service = make(response_format="json", fresh_window=0.0)
+        bundles = await service.fetch_bundles(coords, forecast_days=2, chunk_size=2)
+        assert server.stats["requests"] == 3  # 2 + 2 + 1
+        assert len(bundles) == len(coords)
+        assert all(b is not None and b.hourly.size == 48 for b in bundles)
+        # sentetik yanıt konum sırasına göre tohumlanır: parça içi sıra korunur
+        assert bundles[0].current == bundles[2].current == bundles[4].current
+        assert bundles[0].current != bundles[1].current
+
+    fake_server(body)
+
+
+def test_duplicate_coords_in_one_call_share_a_flight(fake_server):
+    async def body(server, make):
+        service = make(response_format="json", fresh_window=0.0)
+        bundles = await service.fetch_bundles([(1.0, 2.0), (1.0, 2.0), (3.0, 4.0)], 2)
+        assert bundles[0] is bundles[1]
+        assert server.stats["requests"] == 1
+
+    fake_server(body)
+
+
+def test_http_error_yields_none(fake_server):
+    async def body(server, make):
+        service = make(response_format="json")
+        assert await service.fetch_bundle(1.0, 2.0, forecast_days=2, retries=0) is None
+
+    fake_server(body, error_rate=1.0)